@@ -1,9 +1,63 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
 
 from books.models import Book
 
 
+class BookAdminForm(forms.ModelForm):
+
+    class Meta:
+        model = Book
+        fields = ("title", "author", "cover", "copies", "daily_fee")
+
+    def clean_copies(self) -> int:
+        copies = self.cleaned_data["copies"]
+
+        if self.instance.pk:
+            borrowed = self.instance.borrowings.filter(
+                actual_return_date__isnull=True
+            ).count()
+
+            if copies < borrowed:
+                raise forms.ValidationError(
+                    f"{borrowed} copies are borrowed now"
+                )
+
+        return copies
+
+
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
+    form = BookAdminForm
+    readonly_fields = ("inventory",)
     search_fields = ("title", "author")
     list_filter = ("title", "author", "inventory", "daily_fee", "cover")
+
+    def save_model(self, request, obj: Book, form, change: bool) -> None:
+        """
+        Stock is edited through the total copies only. A change of copies
+        is applied to the inventory with one F() update and other edits
+        write only their columns, so inventory changed by borrowings
+        while the form was open is kept.
+        """
+        if not change:
+            obj.inventory = obj.copies
+            super().save_model(request, obj, form, change)
+            return
+
+        changed = [name for name in form.changed_data if name != "copies"]
+        obj.save(update_fields=[*changed, "updated_at"])
+
+        if "copies" not in form.changed_data:
+            return
+
+        if Book.objects.change_copies(
+            obj.pk, obj.copies - form.initial["copies"]
+        ):
+            obj.refresh_from_db(fields=("copies", "inventory"))
+        else:
+            self.message_user(
+                request,
+                "Copies were not changed, they are borrowed now",
+                messages.ERROR,
+            )
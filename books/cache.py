@@ -0,0 +1,8 @@
+from library_app.response_cache import invalidate
+
+BOOKS_CACHE_NAMESPACE = "books"
+
+
+def invalidate_books() -> None:
+    """Drops every cached book list and detail response"""
+    invalidate(BOOKS_CACHE_NAMESPACE)
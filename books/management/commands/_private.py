@@ -0,0 +1,8 @@
+WORDS = (
+    "harry potter chamber secrets lord rings shadow wind garden night "
+    "river stone silent empire winter fire glass city ocean memory"
+).split()
+AUTHORS = (
+    "J. K. Rowling", "J. R. R. Tolkien", "Carlos Ruiz Zafon",
+    "Gregory David Roberts", "Haruki Murakami", "Ursula K. Le Guin",
+)
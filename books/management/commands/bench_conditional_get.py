@@ -0,0 +1,67 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpRequest, HttpResponse
+from django.urls import reverse
+
+from books.cache import BOOKS_CACHE_NAMESPACE
+from books.views import BookViewSet
+from library_app.versions import bump_version
+
+
+class Command(BaseCommand):
+    """
+    Compares the throughput of full book list responses, each one built
+    after a catalog change, with 304 Not Modified answers to conditional
+    requests. The view is called directly without throttling, so that
+    only the view itself is measured.
+    """
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=500)
+
+    def get(self, **headers) -> HttpResponse:
+        request = HttpRequest()
+        request.method = "GET"
+        request.path = request.path_info = self.url
+        request.META.update(
+            HTTP_HOST=(settings.ALLOWED_HOSTS or ["localhost"])[0],
+            SERVER_PORT="80",
+            **headers,
+        )
+        response = self.view(request)
+
+        if hasattr(response, "render"):
+            response.render()
+
+        return response
+
+    def measure(self, changed: bool, **headers) -> tuple[float, str]:
+        started = time.perf_counter()
+
+        for _ in range(self.requests):
+            if changed:
+                bump_version(BOOKS_CACHE_NAMESPACE)
+
+            response = self.get(**headers)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{response.status_code}: {self.requests / elapsed:.0f} req/s "
+            f"({elapsed / self.requests * 1000:.2f}ms per request)"
+        )
+
+        return elapsed, response["ETag"]
+
+    def handle(self, *args, **options) -> None:
+        self.requests = options["requests"]
+        self.url = reverse("books:book-list")
+        self.view = BookViewSet.as_view({"get": "list"}, throttle_classes=())
+
+        full, etag = self.measure(changed=True)
+        not_modified, _ = self.measure(
+            changed=False, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.stdout.write(f"304 speedup: {full / not_modified:.1f}x")
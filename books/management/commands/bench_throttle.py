@@ -0,0 +1,86 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+from library_app.throttling import AnonGCRAThrottle
+
+RATE = "1000000/minute"
+
+
+class HistoryThrottle(AnonRateThrottle):
+    rate = RATE
+
+
+class GCRAThrottle(AnonGCRAThrottle):
+    rate = RATE
+
+
+class Command(BaseCommand):
+    """
+    Measures the overhead a throttle check adds to every request:
+    the request history of DRF against GCRA in the Django cache and,
+    when THROTTLE_REDIS_URL is set, GCRA in one Redis script call.
+    The rate is high enough for every request to pass.
+    """
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--iterations", type=int, default=10000)
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=10,
+            help="Number of client addresses the requests are spread over",
+        )
+
+    def measure(self, throttle_class: type, options: dict) -> list[float]:
+        factory = APIRequestFactory()
+        requests = []
+
+        for number in range(options["clients"]):
+            request = factory.get(
+                "/", REMOTE_ADDR=f"10.0.{number // 256}.{number % 256}"
+            )
+            request.user = AnonymousUser()
+            requests.append(request)
+
+        cache.clear()
+        timings = []
+
+        for iteration in range(options["iterations"]):
+            request = requests[iteration % len(requests)]
+            started = time.perf_counter()
+            throttle_class().allow_request(request, None)
+            timings.append((time.perf_counter() - started) * 1000000)
+
+        return sorted(timings)
+
+    def report(self, name: str, timings: list[float]) -> None:
+        self.stdout.write(
+            f"{name}: median {statistics.median(timings):.1f}us, "
+            f"p95 {timings[int(len(timings) * 0.95) - 1]:.1f}us, "
+            f"p99 {timings[int(len(timings) * 0.99) - 1]:.1f}us"
+        )
+
+    def handle(self, *args, **options) -> None:
+        backend = settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1]
+
+        self.report(
+            f"history in {backend}", self.measure(HistoryThrottle, options)
+        )
+
+        with override_settings(THROTTLE_REDIS_URL=None):
+            self.report(
+                f"GCRA in {backend}", self.measure(GCRAThrottle, options)
+            )
+
+        if settings.THROTTLE_REDIS_URL:
+            self.report(
+                "GCRA in Redis script", self.measure(GCRAThrottle, options)
+            )
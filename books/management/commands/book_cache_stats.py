@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from books.cache import BOOKS_CACHE_NAMESPACE
+from library_app.response_cache import get_metrics, reset_metrics
+
+
+class Command(BaseCommand):
+    """Prints hit and miss counters of the book response cache"""
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them",
+        )
+
+    def handle(self, *args, **options) -> None:
+        metrics = get_metrics(BOOKS_CACHE_NAMESPACE)
+        self.stdout.write(
+            f"hits: {metrics['hits']}, misses: {metrics['misses']}, "
+            f"hit ratio: {metrics['hit_ratio']:.2%}"
+        )
+
+        if options["reset"]:
+            reset_metrics(BOOKS_CACHE_NAMESPACE)
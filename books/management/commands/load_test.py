@@ -0,0 +1,342 @@
+import datetime
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+
+from books.models import Book
+
+PASSWORD = "LoadTest1"
+ADMIN_EMAIL = "loadtest-admin@library.com"
+READER_EMAIL = "loadtest{}@library.com"
+BOOK_SAMPLE_SIZE = 1000
+
+SCENARIO_WEIGHTS = {
+    "token_obtain": 5,
+    "book_list": 45,
+    "book_detail": 15,
+    "borrow": 10,
+    "return": 10,
+    "payment_list": 15,
+}
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return 0.0
+
+    rank = max(int(round(percent / 100 * len(values))) - 1, 0)
+
+    return values[min(rank, len(values) - 1)]
+
+
+class Stats:
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(
+            self, endpoint: str, response: requests.Response, elapsed: float
+    ) -> None:
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+
+            if response.status_code >= 400:
+                self.errors[endpoint] += 1
+
+            if "X-Query-Count" in response.headers:
+                self.queries[endpoint].append(
+                    int(response.headers["X-Query-Count"])
+                )
+
+    def report(self, duration: float) -> dict:
+        endpoints = {}
+
+        for endpoint, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            queries = self.queries[endpoint]
+            endpoints[endpoint] = {
+                "requests": len(latencies),
+                "errors": self.errors[endpoint],
+                "rps": round(len(latencies) / duration, 2),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "queries_per_request": (
+                    round(sum(queries) / len(queries), 2) if queries else None
+                ),
+            }
+
+        total = sum(item["requests"] for item in endpoints.values())
+
+        return {
+            "requests": total,
+            "errors": sum(item["errors"] for item in endpoints.values()),
+            "rps": round(total / duration, 2),
+            "endpoints": endpoints,
+        }
+
+
+class Worker(threading.Thread):
+    """Replays the weighted scenario mix over one keep-alive session"""
+
+    def __init__(
+            self,
+            command: "Command",
+            index: int,
+            deadline: float,
+    ) -> None:
+        super().__init__(daemon=True)
+        self.command = command
+        self.random = random.Random(command.seed + index)
+        self.deadline = deadline
+        self.session = requests.Session()
+        self.email = READER_EMAIL.format(index % command.users)
+        self.token = None
+        self.borrowings = []
+
+    def call(
+            self, endpoint: str, method: str, path: str, token=None, **kwargs
+    ) -> requests.Response:
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        started = time.perf_counter()
+        response = self.session.request(
+            method,
+            f"{self.command.base_url}{path}",
+            headers=headers,
+            timeout=30,
+            **kwargs,
+        )
+        self.command.stats.record(
+            endpoint, response, time.perf_counter() - started
+        )
+
+        return response
+
+    def token_obtain(self) -> None:
+        response = self.call(
+            "token_obtain",
+            "POST",
+            "/api/users/token/",
+            json={"email": self.email, "password": PASSWORD},
+        )
+
+        if response.ok:
+            self.token = response.json()["access"]
+
+    def book_list(self) -> None:
+        params = {"page": self.random.randint(1, 20)}
+
+        if self.random.random() < 0.3:
+            params["available"] = "true"
+            params["cover"] = self.random.choice(Book.CoverChoices.values)
+
+        self.call("book_list", "GET", "/api/books/", params=params)
+
+    def book_detail(self) -> None:
+        book_id = self.random.choice(self.command.book_ids)
+        self.call("book_detail", "GET", f"/api/books/{book_id}/")
+
+    def borrow(self) -> None:
+        expected_return_date = datetime.date.today() + datetime.timedelta(
+            days=self.random.randint(1, 30)
+        )
+        response = self.call(
+            "borrow",
+            "POST",
+            "/api/borrowings/",
+            token=self.token,
+            json={
+                "book": self.random.choice(self.command.book_ids),
+                "expected_return_date": expected_return_date.isoformat(),
+            },
+        )
+
+        if response.status_code == 201:
+            self.borrowings.append(response.json()["id"])
+
+    def return_book(self) -> None:
+        if not self.borrowings:
+            return self.borrow()
+
+        self.call(
+            "return",
+            "POST",
+            f"/api/borrowings/{self.borrowings.pop()}/return/",
+            token=self.command.admin_token,
+            json={"actual_return_date": datetime.date.today().isoformat()},
+        )
+
+    def payment_list(self) -> None:
+        self.call("payment_list", "GET", "/api/payments/", token=self.token)
+
+    def run(self) -> None:
+        scenarios = {
+            "token_obtain": self.token_obtain,
+            "book_list": self.book_list,
+            "book_detail": self.book_detail,
+            "borrow": self.borrow,
+            "return": self.return_book,
+            "payment_list": self.payment_list,
+        }
+        names = list(SCENARIO_WEIGHTS)
+        weights = list(SCENARIO_WEIGHTS.values())
+        self.token_obtain()
+
+        while time.monotonic() < self.deadline:
+            try:
+                scenarios[self.random.choices(names, weights)[0]]()
+            except requests.RequestException as error:
+                self.command.stderr.write(f"Request failed: {error}")
+
+
+class Command(BaseCommand):
+    """
+    Replays a realistic mix of library traffic against a running server
+    and reports latency percentiles, throughput and queries per request
+    of every endpoint as JSON.
+    Start the server with QUERY_COUNT_HEADER=1 to get query counts and
+    with raised THROTTLE_RATE_ANON/THROTTLE_RATE_USER/THROTTLE_RATE_TOKEN,
+    otherwise most requests are throttled.
+    """
+
+    help = "Load test the API of a running server"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--duration", type=float, default=30)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            help="File to write the JSON report to instead of stdout",
+        )
+        parser.add_argument(
+            "--seed-books",
+            type=int,
+            default=0,
+            help="Synthetic books to add to fixture_data.json",
+        )
+        parser.add_argument("--seed-users", type=int, default=1000)
+        parser.add_argument("--seed-borrowings", type=int, default=0)
+
+    def create_users(self, count: int) -> None:
+        password = make_password(PASSWORD)
+        get_user_model().objects.bulk_create(
+            [
+                get_user_model()(
+                    email=READER_EMAIL.format(number),
+                    password=password,
+                    first_name="Load",
+                    last_name=f"Tester {number}",
+                )
+                for number in range(count)
+            ] + [
+                get_user_model()(
+                    email=ADMIN_EMAIL, password=password, is_staff=True
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+    def sample_book_ids(self, size: int) -> list[int]:
+        """
+        Ids of available books in a window starting at a random id,
+        so the sample stays bounded on catalogs of millions of books
+        """
+        bounds = Book.objects.aggregate(low=Min("id"), high=Max("id"))
+
+        if bounds["low"] is None:
+            return []
+
+        start = random.Random(self.seed).randint(
+            bounds["low"], bounds["high"]
+        )
+        available = (
+            Book.objects.filter(inventory__gt=0)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        book_ids = list(available.filter(id__gte=start)[:size])
+        book_ids += available.filter(id__lt=start)[:size - len(book_ids)]
+
+        return book_ids
+
+    def obtain_admin_token(self) -> str:
+        response = requests.post(
+            f"{self.base_url}/api/users/token/",
+            json={"email": ADMIN_EMAIL, "password": PASSWORD},
+            timeout=30,
+        )
+        response.raise_for_status()
+
+        return response.json()["access"]
+
+    def handle(self, *args, **options) -> None:
+        self.base_url = options["base_url"].rstrip("/")
+        self.seed = options["seed"]
+        self.users = options["users"]
+        self.stats = Stats()
+
+        if options["seed_books"] or options["seed_borrowings"]:
+            call_command("loaddata", "fixture_data.json", verbosity=0)
+            call_command(
+                "seed_library",
+                books=options["seed_books"],
+                users=options["seed_users"],
+                borrowings=options["seed_borrowings"],
+                seed=self.seed,
+                stdout=self.stderr,
+            )
+
+        self.create_users(self.users)
+
+        self.book_ids = self.sample_book_ids(BOOK_SAMPLE_SIZE)
+
+        if not self.book_ids:
+            raise CommandError("No available books, seed some first")
+
+        self.admin_token = self.obtain_admin_token()
+
+        started_at = datetime.datetime.now(datetime.timezone.utc)
+        started = time.monotonic()
+        workers = [
+            Worker(self, index, started + options["duration"])
+            for index in range(options["concurrency"])
+        ]
+
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join()
+
+        duration = time.monotonic() - started
+        report = {
+            "started_at": started_at.isoformat(),
+            "base_url": self.base_url,
+            "concurrency": options["concurrency"],
+            "duration_s": round(duration, 2),
+            "seed": self.seed,
+            **self.stats.report(duration),
+        }
+        output = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,91 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from books.cache import invalidate_books
+from books.models import Book
+from borrowings.models import Borrowing
+
+
+def drift_sql() -> str:
+    """
+    Selects every book with the inventory it has and the one it should
+    have, its total copies minus its open borrowings
+    """
+    quote = connection.ops.quote_name
+    book = Borrowing._meta.get_field("book").column
+    actual_return_date = Borrowing._meta.get_field(
+        "actual_return_date"
+    ).column
+
+    return (
+        f"SELECT b.id AS id, b.inventory AS seen, "
+        f"b.copies - COUNT(o.id) AS available "
+        f"FROM {quote(Book._meta.db_table)} b "
+        f"LEFT JOIN {quote(Borrowing._meta.db_table)} o "
+        f"ON o.{quote(book)} = b.id AND o.{quote(actual_return_date)} IS NULL "
+        f"GROUP BY b.id, b.inventory, b.copies"
+    )
+
+
+class Command(BaseCommand):
+    """
+    Recomputes available inventory of every book as its total copies
+    minus open borrowings with a single UPDATE ... FROM a grouped
+    subquery, so the counts and the inventories come from one snapshot.
+    A book is only updated while its inventory is still the one
+    the counts were taken with: a borrowing or return committed
+    meanwhile makes PostgreSQL recheck the row and skip it, so
+    concurrent changes are never overwritten.
+    """
+
+    help = "Recompute book inventory from open borrowings"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report books with drifted inventory",
+        )
+
+    def handle(self, *args, **options) -> None:
+        table = connection.ops.quote_name(Book._meta.db_table)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM ({drift_sql()}) drift "
+                f"WHERE available < 0 ORDER BY id"
+            )
+            overdrawn = [book_id for book_id, in cursor.fetchall()]
+
+            if options["dry_run"]:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM ({drift_sql()}) drift "
+                    f"WHERE available >= 0 AND available <> seen"
+                )
+                drifted = cursor.fetchone()[0]
+            else:
+                cursor.execute(
+                    f"UPDATE {table} SET inventory = drift.available, "
+                    f"updated_at = %s "
+                    f"FROM ({drift_sql()}) drift "
+                    f"WHERE {table}.id = drift.id "
+                    f"AND {table}.inventory = drift.seen "
+                    f"AND drift.available >= 0 "
+                    f"AND drift.available <> drift.seen",
+                    [timezone.now()],
+                )
+                drifted = cursor.rowcount
+
+        for book_id in overdrawn:
+            self.stderr.write(
+                f"Book {book_id} has more open borrowings than copies"
+            )
+
+        if drifted and not options["dry_run"]:
+            invalidate_books()
+
+        self.stdout.write(
+            f"{drifted} book(s) with drifted inventory "
+            f"{'found' if options['dry_run'] else 'reconciled'}"
+        )
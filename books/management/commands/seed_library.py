@@ -0,0 +1,348 @@
+import datetime
+import io
+import random
+import time
+from array import array
+from decimal import Decimal
+from itertools import count
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, models
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from books.management.commands._private import AUTHORS, WORDS
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.models import MAX_TO_PAY, Payment
+
+DEFAULT_PASSWORD = "SeedPassword1"
+
+
+class RowStream(io.TextIOBase):
+    """File-like view of rows in the COPY text format"""
+
+    def __init__(self, rows: Iterable[tuple]) -> None:
+        self.lines = (self.format(row) for row in rows)
+        self.buffer = ""
+
+    @staticmethod
+    def format(row: tuple) -> str:
+        return "\t".join(
+            r"\N" if value is None else str(value) for value in row
+        ) + "\n"
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        lines = [self.buffer]
+        length = len(self.buffer)
+
+        for line in self.lines:
+            lines.append(line)
+            length += len(line)
+
+            if 0 <= size <= length:
+                break
+
+        data = "".join(lines)
+        self.buffer = data[size:] if size >= 0 else ""
+
+        return data[:size] if size >= 0 else data
+
+
+class Command(BaseCommand):
+    """
+    Generates a large synthetic library: books, readers, borrowings and
+    payments. Rows come from random generators seeded with --seed, so
+    a run is reproducible for a given day and starting primary keys.
+    PostgreSQL gets the rows through COPY, other databases through
+    bulk_create in batches. Primary keys are assigned here and the
+    borrowings are generated twice instead of being read back for their
+    payments. Every user shares one precomputed password hash.
+    Do not run it against a database taking writes at the same time.
+    """
+
+    help = "Seed the database with a large synthetic dataset"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--books", type=int, default=100000)
+        parser.add_argument("--users", type=int, default=100000)
+        parser.add_argument("--borrowings", type=int, default=1000000)
+        parser.add_argument(
+            "--open-share",
+            type=float,
+            default=0.1,
+            help="Share of borrowings which are not returned yet",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--password", default=DEFAULT_PASSWORD)
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def new_ids(self, model: type[models.Model], number: int) -> range:
+        first_id = (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+        return range(first_id, first_id + number)
+
+    def insert(
+            self,
+            model: type[models.Model],
+            fields: tuple[str, ...],
+            rows: Iterable[tuple],
+    ) -> None:
+        started = time.perf_counter()
+
+        if connection.vendor == "postgresql":
+            columns = ", ".join(
+                connection.ops.quote_name(model._meta.get_field(name).column)
+                for name in fields
+            )
+
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {connection.ops.quote_name(model._meta.db_table)} "
+                    f"({columns}) FROM STDIN",
+                    RowStream(rows),
+                    1 << 20,
+                )
+        else:
+            rows = iter(rows)
+
+            while batch := [
+                model(**dict(zip(fields, row)))
+                for row, _ in zip(rows, range(self.batch_size))
+            ]:
+                model.objects.bulk_create(batch)
+
+        self.stdout.write(
+            f"{model._meta.verbose_name_plural}: "
+            f"{time.perf_counter() - started:.1f}s"
+        )
+
+    def generate_books(self, book_ids: range) -> Iterator[tuple]:
+        generator = random.Random(f"{self.seed}:books")
+        now = timezone.now()
+
+        for book_id in book_ids:
+            copies = generator.randint(1, 10)
+            fee_cents = generator.randint(5, 200)
+            self.copies.append(copies)
+            self.fees.append(fee_cents)
+
+            yield (
+                book_id,
+                " ".join(generator.choices(WORDS, k=4)).title(),
+                generator.choice(AUTHORS),
+                generator.choice(Book.CoverChoices.values),
+                copies,
+                copies,
+                Decimal(fee_cents) / 100,
+                now,
+            )
+
+    def generate_users(
+            self, user_ids: range, password: str
+    ) -> Iterator[tuple]:
+        now = timezone.now()
+
+        for user_id in user_ids:
+            yield (
+                user_id,
+                password,
+                False,
+                False,
+                True,
+                now,
+                f"reader{user_id}@seed.library.com",
+                "Reader",
+                str(user_id),
+            )
+
+    def generate_borrowings(
+            self,
+            borrowing_ids: range,
+            book_ids: range,
+            user_ids: range,
+            open_share: float,
+    ) -> Iterator[tuple]:
+        """
+        Keeps open borrowings of every book within its copies,
+        yields the same rows on every call
+        """
+        generator = random.Random(f"{self.seed}:borrowings")
+        today = datetime.date.today()
+        open_counts = array("H", bytes(2 * len(book_ids)))
+
+        for borrowing_id in borrowing_ids:
+            book_index = generator.randrange(len(book_ids))
+            borrow_date = today - datetime.timedelta(
+                days=generator.randint(0, 365)
+            )
+            loan_days = generator.randint(1, 30)
+            expected_return_date = borrow_date + datetime.timedelta(
+                days=loan_days
+            )
+            return_delay = generator.randint(0, loan_days + 5)
+            actual_return_date = None
+
+            if (
+                    generator.random() >= open_share
+                    or open_counts[book_index] >= self.copies[book_index]
+            ):
+                actual_return_date = min(
+                    borrow_date + datetime.timedelta(days=return_delay),
+                    today,
+                )
+            else:
+                open_counts[book_index] += 1
+
+            yield (
+                borrowing_id,
+                borrow_date,
+                expected_return_date,
+                actual_return_date,
+                book_ids[book_index],
+                user_ids[generator.randrange(len(user_ids))],
+            )
+
+    def generate_payments(
+            self, first_id: int, borrowings: Iterable[tuple], book_ids: range
+    ) -> Iterator[tuple]:
+        """
+        Every returned borrowing is paid on its return date, a late return
+        also has a pending fine
+        """
+        payment_ids = count(first_id)
+
+        for (
+                borrowing_id,
+                borrow_date,
+                expected_return_date,
+                actual_return_date,
+                book_id,
+                _,
+        ) in borrowings:
+            if actual_return_date is None:
+                continue
+
+            fee = Decimal(self.fees[book_id - book_ids.start]) / 100
+            days = max((actual_return_date - borrow_date).days, 1)
+            overdue_days = (actual_return_date - expected_return_date).days
+
+            yield (
+                next(payment_ids),
+                Payment.StatusChoices.PAID,
+                Payment.TypeChoices.PAYMENT,
+                borrowing_id,
+                min(days * fee, MAX_TO_PAY),
+                timezone.make_aware(
+                    datetime.datetime.combine(
+                        actual_return_date, datetime.time()
+                    )
+                ),
+            )
+
+            if overdue_days > 0:
+                yield (
+                    next(payment_ids),
+                    Payment.StatusChoices.PENDING,
+                    Payment.TypeChoices.FINE,
+                    borrowing_id,
+                    min(
+                        overdue_days * fee * settings.FINE_MULTIPLIER,
+                        MAX_TO_PAY,
+                    ),
+                    None,
+                )
+
+    def handle(self, *args, **options) -> None:
+        self.seed = options["seed"]
+        self.batch_size = options["batch_size"]
+        self.copies = array("H")
+        self.fees = array("H")
+        user_model = get_user_model()
+        started = time.perf_counter()
+
+        book_ids = self.new_ids(Book, options["books"])
+        user_ids = self.new_ids(user_model, options["users"])
+        borrowing_ids = self.new_ids(
+            Borrowing,
+            options["borrowings"] if book_ids and user_ids else 0,
+        )
+
+        self.insert(
+            Book,
+            (
+                "id", "title", "author", "cover", "inventory", "copies",
+                "daily_fee", "updated_at",
+            ),
+            self.generate_books(book_ids),
+        )
+        self.insert(
+            user_model,
+            (
+                "id", "password", "is_superuser", "is_staff", "is_active",
+                "date_joined", "email", "first_name", "last_name",
+            ),
+            self.generate_users(user_ids, make_password(options["password"])),
+        )
+        self.insert(
+            Borrowing,
+            (
+                "id", "borrow_date", "expected_return_date",
+                "actual_return_date", "book_id", "user_id",
+            ),
+            self.generate_borrowings(
+                borrowing_ids, book_ids, user_ids, options["open_share"]
+            ),
+        )
+        self.insert(
+            Payment,
+            (
+                "id", "status", "type", "borrowing_id_id", "to_pay",
+                "paid_at",
+            ),
+            self.generate_payments(
+                self.new_ids(Payment, 0).start,
+                self.generate_borrowings(
+                    borrowing_ids, book_ids, user_ids, options["open_share"]
+                ),
+                book_ids,
+            ),
+        )
+
+        open_borrowings = (
+            Borrowing.objects.filter(
+                book=OuterRef("pk"), actual_return_date__isnull=True
+            )
+            .order_by()
+            .values("book")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        Book.objects.filter(pk__gte=book_ids.start).update(
+            inventory=F("copies") - Coalesce(Subquery(open_borrowings), 0)
+        )
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                    no_style(), [Book, user_model, Borrowing, Payment]
+            ):
+                cursor.execute(sql)
+
+        # Rows copied directly bypass the incremental stats updates
+        call_command("rebuild_stats", stdout=self.stdout)
+
+        self.stdout.write(
+            f"Seeded {len(book_ids)} books, {len(user_ids)} users and "
+            f"{len(borrowing_ids)} borrowings with their payments in "
+            f"{time.perf_counter() - started:.1f}s"
+        )
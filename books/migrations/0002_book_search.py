@@ -0,0 +1,96 @@
+# Generated by Django 4.2.3 on 2026-10-18 06:50
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce({table}.title, '')), 'A')
+    || setweight(to_tsvector('english', coalesce({table}.author, '')), 'B')
+"""
+
+
+def create_search_objects(apps, schema_editor) -> None:
+    """
+    Keeps the search vector up to date with a trigger and indexes it,
+    trigram indexes are created only where pg_trgm can be installed
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        has_trigram = cursor.fetchone() is not None
+
+    if has_trigram:
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX book_title_trgm_idx ON books_book "
+            "USING gin (title gin_trgm_ops)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX book_author_trgm_idx ON books_book "
+            "USING gin (author gin_trgm_ops)"
+        )
+
+    schema_editor.execute(
+        f"""
+        CREATE FUNCTION books_book_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_SQL.format(table="NEW")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    schema_editor.execute(
+        "CREATE TRIGGER books_book_search_vector_trigger "
+        "BEFORE INSERT OR UPDATE OF title, author ON books_book "
+        "FOR EACH ROW EXECUTE FUNCTION books_book_search_vector_update()"
+    )
+    schema_editor.execute(
+        "UPDATE books_book SET search_vector = "
+        + SEARCH_VECTOR_SQL.format(table="books_book")
+    )
+    schema_editor.execute(
+        "CREATE INDEX book_search_vector_idx ON books_book "
+        "USING gin (search_vector)"
+    )
+
+
+def drop_search_objects(apps, schema_editor) -> None:
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "DROP TRIGGER IF EXISTS books_book_search_vector_trigger "
+        "ON books_book"
+    )
+    schema_editor.execute(
+        "DROP FUNCTION IF EXISTS books_book_search_vector_update()"
+    )
+
+    for index in (
+        "book_search_vector_idx",
+        "book_title_trgm_idx",
+        "book_author_trgm_idx",
+    ):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_objects, drop_search_objects),
+    ]
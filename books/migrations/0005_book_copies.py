@@ -0,0 +1,39 @@
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_copies(apps, schema_editor) -> None:
+    Book = apps.get_model("books", "Book")
+    Borrowing = apps.get_model("borrowings", "Borrowing")
+    open_borrowings = (
+        Borrowing.objects.filter(
+            book=OuterRef("pk"), actual_return_date__isnull=True
+        )
+        .order_by()
+        .values("book")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Book.objects.update(
+        copies=F("inventory") + Coalesce(Subquery(open_borrowings), 0)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0004_book_updated_at"),
+        ("borrowings", "0004_alter_borrowing_actual_return_date_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="copies",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text="Total copies owned, including borrowed ones",
+            ),
+        ),
+        migrations.RunPython(backfill_copies, migrations.RunPython.noop),
+    ]
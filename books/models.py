@@ -1,4 +1,64 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Case, F, PositiveSmallIntegerField, When
+from django.db.models.functions import Now
+
+from books.cache import invalidate_books
+
+
+class BookQuerySet(models.QuerySet):
+
+    def decrement_inventory(self, book_id: int) -> bool:
+        """
+        Atomically takes one copy of the book if any is available,
+        returns whether the copy was taken
+        """
+        taken = self.filter(pk=book_id, inventory__gt=0).update(
+            inventory=F("inventory") - 1,
+            updated_at=Now(),
+        )
+
+        if taken:
+            invalidate_books()
+
+        return bool(taken)
+
+    def change_inventory(self, deltas: dict[int, int]) -> int:
+        """Applies per-book inventory deltas with a single UPDATE"""
+        if not deltas:
+            return 0
+
+        updated = self.filter(pk__in=deltas).update(
+            inventory=Case(
+                *(
+                    When(pk=book_id, then=F("inventory") + delta)
+                    for book_id, delta in deltas.items()
+                ),
+                default=F("inventory"),
+                output_field=PositiveSmallIntegerField(),
+            ),
+            updated_at=Now(),
+        )
+        invalidate_books()
+
+        return updated
+
+    def change_copies(self, book_id: int, delta: int) -> bool:
+        """
+        Adds copies to the book, or removes available ones, keeping
+        inventory changes made by borrowings meanwhile; returns whether
+        enough copies were available
+        """
+        changed = self.filter(pk=book_id, inventory__gte=-delta).update(
+            copies=F("copies") + delta,
+            inventory=F("inventory") + delta,
+            updated_at=Now(),
+        )
+
+        if changed:
+            invalidate_books()
+
+        return bool(changed)
 
 
 class Book(models.Model):
@@ -11,10 +71,37 @@ class Book(models.Model):
     author = models.CharField(max_length=255)
     cover = models.CharField(max_length=4, choices=CoverChoices.choices)
     inventory = models.PositiveSmallIntegerField()
+    copies = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Total copies owned, including borrowed ones",
+    )
     daily_fee = models.DecimalField(max_digits=6, decimal_places=2)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = BookQuerySet.as_manager()
 
     class Meta:
         ordering = ["author"]
+        indexes = [
+            models.Index(fields=["author", "id"], name="book_author_id_idx"),
+            models.Index(
+                fields=["cover", "daily_fee"],
+                condition=models.Q(inventory__gt=0),
+                name="book_available_cover_fee_idx",
+            ),
+            models.Index(
+                fields=["daily_fee"],
+                condition=models.Q(inventory__gt=0),
+                name="book_available_fee_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.author})"
+
+    def save(self, *args, **kwargs) -> None:
+        if self._state.adding and not self.copies:
+            self.copies = self.inventory
+
+        super().save(*args, **kwargs)
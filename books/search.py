@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import F, FloatField, Q, QuerySet
+from django.db.models.functions import Cast, Greatest
+
+SEARCH_CONFIG = "english"
+
+_trigram_available = {}
+
+
+def is_postgresql(queryset: QuerySet) -> bool:
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def has_trigram(queryset: QuerySet) -> bool:
+    """Checks once per database whether pg_trgm is installed"""
+    if not is_postgresql(queryset):
+        return False
+
+    if queryset.db not in _trigram_available:
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+            )
+            _trigram_available[queryset.db] = cursor.fetchone() is not None
+
+    return _trigram_available[queryset.db]
+
+
+def search_books(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filters books by title or author and orders them by relevance:
+    PostgreSQL full-text search over the stored search vector, extended
+    with trigram word similarity for typos when pg_trgm is installed,
+    and a case-insensitive match of every word on other databases
+    """
+    if not is_postgresql(queryset):
+        condition = Q()
+
+        for term in query.split():
+            condition &= Q(title__icontains=term) | Q(author__icontains=term)
+
+        return queryset.filter(condition)
+
+    search_query = SearchQuery(
+        query, config=SEARCH_CONFIG, search_type="websearch"
+    )
+    rank = SearchRank(F("search_vector"), search_query)
+    condition = Q(search_vector=search_query)
+
+    if settings.BOOK_SEARCH_TRIGRAM and has_trigram(queryset):
+        rank = rank + Greatest(
+            TrigramWordSimilarity(query, "title"),
+            TrigramWordSimilarity(query, "author"),
+        )
+        condition |= (
+            Q(title__trigram_word_similar=query)
+            | Q(author__trigram_word_similar=query)
+        )
+
+    return (
+        queryset
+        .filter(condition)
+        .annotate(rank=Cast(rank, FloatField()))
+        .order_by("-rank", "id")
+    )
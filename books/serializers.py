@@ -8,3 +8,42 @@ class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ("id", "title", "author", "cover", "inventory", "daily_fee")
+
+    def update(self, instance: Book, validated_data: dict) -> Book:
+        """
+        Writes only the submitted columns, so an edit of the title or fee
+        does not overwrite inventory changed by borrowings in the meantime.
+        Setting the inventory keeps borrowed copies in the total.
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+
+        update_fields = [*validated_data, "updated_at"]
+
+        if "inventory" in validated_data:
+            instance.copies = validated_data["inventory"] + (
+                instance.borrowings.filter(
+                    actual_return_date__isnull=True
+                ).count()
+            )
+            update_fields.append("copies")
+
+        instance.save(update_fields=update_fields)
+
+        return instance
+
+
+class BookFilterSerializer(serializers.Serializer):
+    available = serializers.BooleanField(
+        required=False, allow_null=True, default=None
+    )
+    cover = serializers.ChoiceField(
+        choices=Book.CoverChoices.choices, required=False
+    )
+    min_fee = serializers.DecimalField(
+        max_digits=6, decimal_places=2, required=False
+    )
+    max_fee = serializers.DecimalField(
+        max_digits=6, decimal_places=2, required=False
+    )
+    author = serializers.CharField(max_length=255, required=False)
@@ -0,0 +1,90 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+BOOK_ADD_URL = reverse("admin:books_book_add")
+
+
+def change_url(book_id: int) -> str:
+    return reverse("admin:books_book_change", args=[book_id])
+
+
+def form_data(**params) -> dict:
+    data = {
+        "title": "Shantaram",
+        "author": "Gregory David Roberts",
+        "cover": "Soft",
+        "copies": 5,
+        "daily_fee": "0.12",
+    }
+    data.update(params)
+
+    return data
+
+
+class BookAdminTests(TestCase):
+    def setUp(self) -> None:
+        self.admin = get_user_model().objects.create_superuser(
+            "test@admin.com", "PassWoorD1"
+        )
+        self.client.force_login(self.admin)
+        self.book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover="Soft",
+            inventory=5,
+            daily_fee="0.12",
+        )
+
+    def borrow(self) -> None:
+        Book.objects.decrement_inventory(self.book.id)
+        Borrowing.objects.create(
+            book=self.book,
+            user=self.admin,
+            expected_return_date=(
+                datetime.date.today() + datetime.timedelta(days=5)
+            ),
+        )
+
+    def test_added_book_available_in_full(self):
+        self.client.post(BOOK_ADD_URL, form_data(title="Maya", copies=3))
+
+        book = Book.objects.get(title="Maya")
+        self.assertEqual((book.copies, book.inventory), (3, 3))
+
+    def test_edit_keeps_borrowing_made_while_form_open(self):
+        self.borrow()
+
+        self.client.post(change_url(self.book.id), form_data(title="Maya"))
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, "Maya")
+        self.assertEqual((self.book.copies, self.book.inventory), (5, 4))
+
+    def test_added_copies_survive_reconciliation(self):
+        self.borrow()
+
+        self.client.post(change_url(self.book.id), form_data(copies=10))
+        call_command("reconcile_inventory", stdout=StringIO())
+
+        self.book.refresh_from_db()
+        self.assertEqual((self.book.copies, self.book.inventory), (10, 9))
+
+    def test_borrowed_copies_cannot_be_removed(self):
+        self.borrow()
+        self.borrow()
+
+        response = self.client.post(
+            change_url(self.book.id), form_data(copies=1)
+        )
+
+        self.assertContains(response, "2 copies are borrowed now")
+        self.book.refresh_from_db()
+        self.assertEqual((self.book.copies, self.book.inventory), (5, 3))
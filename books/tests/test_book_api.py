@@ -1,13 +1,22 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from books.cache import BOOKS_CACHE_NAMESPACE
 from books.models import Book
+from books.search import has_trigram, search_books
 from books.serializers import BookSerializer
+from borrowings.models import Borrowing
+from library_app.response_cache import get_metrics, get_or_compute
 
 BOOK_LIST_URL = reverse("books:book-list")
 
@@ -93,6 +102,336 @@ class AuthenticatedBookApiTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class BookSearchApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.book_1 = sample_book(
+            title="Harry Potter and the Goblet of Fire", author="J. K. Rowling"
+        )
+        self.book_2 = sample_book(
+            title="The Lord of the Rings", author="J. R. R. Tolkien"
+        )
+        self.book_3 = sample_book(
+            title="Harry Potter and the Chamber of Secrets",
+            author="J. K. Rowling",
+        )
+
+    def search(self, query: str) -> list:
+        response = self.client.get(BOOK_LIST_URL, {"search": query})
+
+        return [book["id"] for book in response.data["results"]]
+
+    def test_search_by_title(self):
+        self.assertEqual(
+            self.search("goblet fire"), [self.book_1.id]
+        )
+
+    def test_search_by_author(self):
+        self.assertEqual(self.search("Tolkien"), [self.book_2.id])
+
+    def test_search_ranks_better_matches_first(self):
+        self.assertEqual(
+            self.search("Chamber of Secrets"), [self.book_3.id]
+        )
+        self.assertEqual(
+            set(self.search("harry potter")), {self.book_1.id, self.book_3.id}
+        )
+
+    def test_search_tolerates_typos(self):
+        if not has_trigram(Book.objects.all()):
+            self.skipTest("pg_trgm extension is not installed")
+
+        self.assertIn(self.book_2.id, self.search("Tolkein"))
+
+    def test_search_results_with_cursor_pagination(self):
+        for number in range(12):
+            sample_book(title=f"Harry Potter part {number}")
+
+        expected_ids = list(
+            search_books(Book.objects.all(), "harry potter").values_list(
+                "id", flat=True
+            )
+        )
+        ids = []
+        url = f"{BOOK_LIST_URL}?search=harry+potter&pagination=cursor"
+
+        while url:
+            response = self.client.get(url)
+            ids.extend(book["id"] for book in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(ids, expected_ids)
+
+    def test_search_fallback_for_other_databases(self):
+        with patch("books.search.is_postgresql", return_value=False):
+            self.assertEqual(self.search("lord of"), [self.book_2.id])
+            self.assertEqual(self.search("goblet fire"), [self.book_1.id])
+            self.assertEqual(
+                self.search("rowling secrets"), [self.book_3.id]
+            )
+
+
+class BookFilterApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.hard_cheap = sample_book(
+            cover="Hard", daily_fee=Decimal("0.10"), author="Author One"
+        )
+        self.hard_expensive = sample_book(
+            cover="Hard", daily_fee=Decimal("0.90"), author="Author Two"
+        )
+        self.hard_unavailable = sample_book(
+            cover="Hard", daily_fee=Decimal("0.10"), inventory=0
+        )
+        self.soft_cheap = sample_book(cover="Soft", daily_fee=Decimal("0.10"))
+
+    def filter_books(self, params: dict) -> list:
+        with self.assertNumQueries(2):
+            response = self.client.get(BOOK_LIST_URL, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return sorted(book["id"] for book in response.data["results"])
+
+    def test_filter_available_hard_covers_under_fee(self):
+        self.assertEqual(
+            self.filter_books(
+                {"available": "true", "cover": "Hard", "max_fee": "0.50"}
+            ),
+            [self.hard_cheap.id],
+        )
+
+    def test_filter_unavailable_books(self):
+        self.assertEqual(
+            self.filter_books({"available": "false"}),
+            [self.hard_unavailable.id],
+        )
+
+    def test_filter_by_fee_range(self):
+        self.assertEqual(
+            self.filter_books({"min_fee": "0.50", "max_fee": "1.00"}),
+            [self.hard_expensive.id],
+        )
+
+    def test_filter_by_author(self):
+        self.assertEqual(
+            self.filter_books({"author": "Author Two"}),
+            [self.hard_expensive.id],
+        )
+
+    def test_invalid_filter_value(self):
+        response = self.client.get(BOOK_LIST_URL, {"cover": "Paper"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalGetBookApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.book = sample_book()
+
+    def test_list_not_modified_without_serialization(self):
+        response = self.client.get(BOOK_LIST_URL)
+        etag = response["ETag"]
+
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("public", response["Cache-Control"])
+
+        with patch.object(BookSerializer, "to_representation") as mock_data:
+            with self.assertNumQueries(0):
+                response = self.client.get(
+                    BOOK_LIST_URL, HTTP_IF_NONE_MATCH=etag
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        mock_data.assert_not_called()
+
+    def test_not_modified_answered_before_response_cache(self):
+        etag = self.client.get(BOOK_LIST_URL)["ETag"]
+
+        with patch(
+            "library_app.response_cache.get_or_compute"
+        ) as mock_cache, self.assertNumQueries(0):
+            response = self.client.get(
+                BOOK_LIST_URL, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        mock_cache.assert_not_called()
+
+    def test_list_etag_changes_with_catalog(self):
+        etag = self.client.get(BOOK_LIST_URL)["ETag"]
+        sample_book(title="Shantaram two")
+        response = self.client.get(BOOK_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_depends_on_query(self):
+        etag = self.client.get(BOOK_LIST_URL)["ETag"]
+        response = self.client.get(
+            BOOK_LIST_URL, {"cover": "Soft"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_etag_changes_with_inventory(self):
+        url = reverse("books:book-detail", args=[self.book.id])
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Book.objects.decrement_inventory(self.book.id)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["inventory"], BOOK_DATA["inventory"] - 1
+        )
+
+    def test_retrieve_missing_book(self):
+        url = reverse("books:book-detail", args=[self.book.id + 100])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookResponseCacheApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.book = sample_book()
+        self.detail_url = reverse("books:book-detail", args=[self.book.id])
+
+    def test_repeated_list_served_from_cache(self):
+        response = self.client.get(BOOK_LIST_URL)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(BOOK_LIST_URL)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached["ETag"], response["ETag"])
+        self.assertEqual(cached.data, response.data)
+
+    def test_cache_keyed_by_query_string(self):
+        self.client.get(BOOK_LIST_URL)
+        response = self.client.get(BOOK_LIST_URL, {"page": 1})
+
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_book_update_invalidates_cache(self):
+        admin = get_user_model().objects.create_user(
+            "test@admin.com", "PassWoord1", is_staff=True
+        )
+        self.client.get(self.detail_url)
+
+        self.client.force_authenticate(admin)
+        self.client.patch(self.detail_url, {"title": "Shantaram two"})
+        self.client.force_authenticate(None)
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["title"], "Shantaram two")
+
+    def test_book_delete_invalidates_cache(self):
+        self.client.get(BOOK_LIST_URL)
+        self.book.delete()
+        response = self.client.get(BOOK_LIST_URL)
+
+        self.assertEqual(response.data["results"], [])
+
+    def test_inventory_changes_invalidate_cache(self):
+        self.client.get(self.detail_url)
+
+        Book.objects.decrement_inventory(self.book.id)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(
+            response.data["inventory"], BOOK_DATA["inventory"] - 1
+        )
+
+        Book.objects.change_inventory({self.book.id: 1})
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data["inventory"], BOOK_DATA["inventory"])
+
+    def test_missing_book_not_cached(self):
+        url = reverse("books:book-detail", args=[self.book.id + 100])
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_hit_and_miss_metrics(self):
+        for _ in range(3):
+            self.client.get(BOOK_LIST_URL)
+
+        self.assertEqual(
+            get_metrics(BOOKS_CACHE_NAMESPACE),
+            {"hits": 2, "misses": 1, "hit_ratio": 0.6667},
+        )
+
+
+class ResponseCacheStampedeTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_concurrent_misses_computed_once(self):
+        calls = []
+
+        def compute() -> str:
+            calls.append(1)
+            time.sleep(0.2)
+
+            return "page"
+
+        def fetch(_) -> tuple:
+            return get_or_compute(
+                "stampede", compute, timeout=60,
+                lock_timeout=5, wait_timeout=5,
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(fetch, range(8)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({value for value, _ in results}, {"page"})
+        self.assertEqual(sum(not hit for _, hit in results), 1)
+
+    def test_waiters_do_not_wait_out_uncached_results(self):
+        def compute() -> None:
+            time.sleep(0.2)
+
+        def fetch(_) -> float:
+            started = time.monotonic()
+            get_or_compute(
+                "not-found", compute, timeout=60,
+                lock_timeout=5, wait_timeout=5,
+            )
+
+            return time.monotonic() - started
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            elapsed = list(executor.map(fetch, range(3)))
+
+        self.assertLess(max(elapsed), 2)
+
+    def test_waiters_compute_when_lock_holder_is_gone(self):
+        cache.add("stale:lock", 1, timeout=60)
+        value, hit = get_or_compute(
+            "stale", lambda: "page", timeout=60,
+            lock_timeout=5, wait_timeout=0.1,
+        )
+
+        self.assertEqual(value, "page")
+        self.assertFalse(hit)
+
+
 class AdminBookApiTests(TestCase):
     def book_detail_url(self, book_id) -> str:
         return reverse("books:book-detail", args=[book_id])
@@ -143,6 +482,35 @@ class AdminBookApiTests(TestCase):
                 getattr(self.book_1, key),
             )
 
+    def test_admin_edit_keeps_concurrent_inventory_change(self):
+        book = sample_book()
+        Book.objects.decrement_inventory(book.id)
+
+        serializer = BookSerializer(
+            book, data={"daily_fee": "0.30"}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        book.refresh_from_db()
+        self.assertEqual(book.daily_fee, Decimal("0.30"))
+        self.assertEqual(book.inventory, BOOK_DATA["inventory"] - 1)
+
+    def test_admin_inventory_edit_keeps_borrowed_copies(self):
+        book = sample_book()
+        Borrowing.objects.create(
+            book=book,
+            user=self.user,
+            expected_return_date=date.today() + timedelta(days=5),
+        )
+        url = self.book_detail_url(book.id)
+
+        self.client.patch(url, {"inventory": 2})
+
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, 2)
+        self.assertEqual(book.copies, 3)
+
     def test_admin_users_delete_book_allowed(self):
         book = sample_book()
         url = self.book_detail_url(book.id)
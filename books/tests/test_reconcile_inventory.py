@@ -0,0 +1,140 @@
+import datetime
+import threading
+import time
+import unittest
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Shantaram",
+        "author": "Gregory David Roberts",
+        "cover": "Soft",
+        "inventory": 5,
+        "daily_fee": "0.12",
+    }
+    defaults.update(params)
+    return Book.objects.create(**defaults)
+
+
+class ReconcileInventoryCommandTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "test@standard.com", "PassWoorD1"
+        )
+        self.book = sample_book()
+        self.other_book = sample_book(title="Shantaram two")
+
+    def borrow(self, book: Book, returned: bool = False) -> Borrowing:
+        today = datetime.date.today()
+        return Borrowing.objects.create(
+            book=book,
+            user=self.user,
+            expected_return_date=today + datetime.timedelta(days=10),
+            actual_return_date=today if returned else None,
+        )
+
+    def reconcile(self, *args) -> str:
+        out = StringIO()
+        call_command("reconcile_inventory", *args, stdout=out, stderr=out)
+        return out.getvalue()
+
+    def test_copies_default_to_inventory(self):
+        self.assertEqual(self.book.copies, 5)
+
+    def test_drifted_inventory_recomputed_from_open_borrowings(self):
+        self.borrow(self.book)
+        self.borrow(self.book)
+        self.borrow(self.book, returned=True)
+        Book.objects.filter(pk=self.other_book.pk).update(inventory=1)
+
+        output = self.reconcile()
+
+        self.book.refresh_from_db()
+        self.other_book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 3)
+        self.assertEqual(self.other_book.inventory, 5)
+        self.assertIn("2 book(s)", output)
+
+    def test_consistent_inventory_untouched(self):
+        self.borrow(self.book)
+        Book.objects.decrement_inventory(self.book.id)
+
+        with self.assertNumQueries(2):
+            output = self.reconcile()
+
+        self.assertIn("0 book(s)", output)
+
+    def test_dry_run_only_reports(self):
+        self.borrow(self.book)
+
+        output = self.reconcile("--dry-run")
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 5)
+        self.assertIn("1 book(s) with drifted inventory found", output)
+
+    def test_overdrawn_books_reported(self):
+        Book.objects.filter(pk=self.book.pk).update(copies=0)
+        self.borrow(self.book)
+
+        output = self.reconcile()
+
+        self.assertIn(f"Book {self.book.id} has more open borrowings", output)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "Rows changed during the UPDATE are rechecked by PostgreSQL",
+)
+class ConcurrentReconcileInventoryTests(TransactionTestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "test@standard.com", "PassWoorD1"
+        )
+        self.book = sample_book()
+
+    def borrow_slowly(self, counted: threading.Event) -> None:
+        """Borrows a copy and commits after the reconciliation has read"""
+        try:
+            with transaction.atomic():
+                Book.objects.decrement_inventory(self.book.id)
+                Borrowing.objects.create(
+                    book=self.book,
+                    user=self.user,
+                    expected_return_date=(
+                        datetime.date.today() + datetime.timedelta(days=10)
+                    ),
+                )
+                counted.set()
+                time.sleep(0.5)
+        finally:
+            connection.close()
+
+    def test_borrowing_during_reconciliation_not_overwritten(self):
+        Book.objects.filter(pk=self.book.pk).update(inventory=3)
+        counted = threading.Event()
+        borrower = threading.Thread(
+            target=self.borrow_slowly, args=(counted,)
+        )
+        borrower.start()
+        counted.wait()
+
+        call_command("reconcile_inventory", stdout=StringIO())
+        borrower.join()
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 2)
+
+        call_command("reconcile_inventory", stdout=StringIO())
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 4)
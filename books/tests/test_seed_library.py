@@ -0,0 +1,110 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, Q, Sum
+from django.test import TestCase, override_settings
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.models import MAX_TO_PAY, Payment
+from stats.models import DueDateOpenLoans, MonthlyRevenue
+
+
+def seed_library(**options) -> None:
+    call_command(
+        "seed_library",
+        books=20,
+        users=10,
+        borrowings=300,
+        open_share=0.5,
+        stdout=StringIO(),
+        **options,
+    )
+
+
+class SeedLibraryCommandTests(TestCase):
+    def test_rows_generated(self):
+        seed_library()
+
+        self.assertEqual(Book.objects.count(), 20)
+        self.assertEqual(get_user_model().objects.count(), 10)
+        self.assertEqual(Borrowing.objects.count(), 300)
+        self.assertEqual(
+            Payment.objects.filter(type=Payment.TypeChoices.PAYMENT).count(),
+            Borrowing.objects.filter(actual_return_date__isnull=False).count(),
+        )
+
+    def test_inventory_matches_open_borrowings(self):
+        seed_library()
+
+        books = Book.objects.annotate(
+            open=Count(
+                "borrowings",
+                filter=Q(borrowings__actual_return_date__isnull=True),
+            )
+        )
+
+        self.assertTrue(books.filter(open__gt=0).exists())
+        for book in books:
+            self.assertEqual(book.inventory, book.copies - book.open)
+
+    def test_users_share_usable_password(self):
+        seed_library(password="Secret123")
+
+        user = get_user_model().objects.first()
+        self.assertTrue(user.check_password("Secret123"))
+
+    def test_same_seed_generates_same_rows(self):
+        seed_library(seed=7)
+        seed_library(seed=7)
+
+        titles = list(
+            Book.objects.order_by("id").values_list("title", flat=True)
+        )
+        self.assertEqual(titles[:20], titles[20:])
+
+    def test_sequences_continue_after_seeded_ids(self):
+        seed_library()
+
+        book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=1,
+            daily_fee="0.12",
+        )
+
+        self.assertEqual(book.id, 21)
+
+    def test_stats_rebuilt(self):
+        seed_library()
+
+        self.assertEqual(
+            DueDateOpenLoans.objects.aggregate(loans=Sum("loans"))["loans"],
+            Borrowing.objects.filter(actual_return_date__isnull=True).count(),
+        )
+        self.assertEqual(
+            MonthlyRevenue.objects.aggregate(total=Sum("payments"))["total"],
+            Payment.objects.filter(status=Payment.StatusChoices.PAID).count(),
+        )
+
+    @override_settings(FINE_MULTIPLIER=Decimal("3"))
+    def test_fines_follow_fine_multiplier(self):
+        seed_library()
+
+        fines = Payment.objects.filter(
+            type=Payment.TypeChoices.FINE
+        ).select_related("borrowing_id__book")
+
+        self.assertTrue(fines)
+        for fine in fines:
+            borrowing = fine.borrowing_id
+            overdue_days = (
+                borrowing.actual_return_date - borrowing.expected_return_date
+            ).days
+            self.assertEqual(
+                fine.to_pay,
+                min(overdue_days * borrowing.book.daily_fee * 3, MAX_TO_PAY),
+            )
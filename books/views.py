@@ -1,11 +1,23 @@
-from drf_spectacular.utils import extend_schema_view, extend_schema
+from typing import Any
+
+from django.db.models import QuerySet
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter,
+)
 from rest_framework import viewsets
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from books.cache import BOOKS_CACHE_NAMESPACE
 from books.models import Book
 from books.permissions import IsAdminOrIfUserReadOnly
-from books.serializers import BookSerializer
+from books.search import search_books
+from books.serializers import BookFilterSerializer, BookSerializer
 from library_app.pagination import Pagination
+from library_app.response_cache import CachedResponseMixin
+from users.authentication import CachedJWTAuthentication
 
 
 # Only for documentation purposes (Swagger)
@@ -29,9 +41,101 @@ from library_app.pagination import Pagination
         description="Endpoint for deleting book, admin users only"
     ),
 )
-class BookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+class BookViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = Book.objects.defer("search_vector")
+    cache_namespace = BOOKS_CACHE_NAMESPACE
     serializer_class = BookSerializer
     pagination_class = Pagination
     permission_classes = (IsAdminOrIfUserReadOnly,)
-    authentication_classes = (JWTAuthentication,)
+    authentication_classes = (CachedJWTAuthentication,)
+
+    def get_queryset(self) -> QuerySet[Book]:
+        queryset = self.queryset
+
+        if self.action == "list":
+            queryset = self.filter_queryset_by_params(queryset)
+
+        return queryset
+
+    def filter_queryset_by_params(
+            self, queryset: QuerySet[Book]
+    ) -> QuerySet[Book]:
+        filters = BookFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        params = filters.validated_data
+
+        if params.get("available") is not None:
+            if params["available"]:
+                queryset = queryset.filter(inventory__gt=0)
+            else:
+                queryset = queryset.filter(inventory=0)
+
+        if "cover" in params:
+            queryset = queryset.filter(cover=params["cover"])
+
+        if "min_fee" in params:
+            queryset = queryset.filter(daily_fee__gte=params["min_fee"])
+
+        if "max_fee" in params:
+            queryset = queryset.filter(daily_fee__lte=params["max_fee"])
+
+        if "author" in params:
+            queryset = queryset.filter(author=params["author"])
+
+        search = self.request.query_params.get("search")
+
+        if search:
+            queryset = search_books(queryset, search)
+
+        return queryset
+
+    # Only for documentation purposes (Swagger)
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="search",
+                description=(
+                    "Search by title or author, ranked by relevance "
+                    "and tolerant to typos (ex. ?search=harry poter)."
+                ),
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="available",
+                description=(
+                    "Filtering by availability for borrowing "
+                    "(ex. ?available=true)."
+                ),
+                required=False,
+                type=bool,
+            ),
+            OpenApiParameter(
+                name="cover",
+                description="Filtering by cover (ex. ?cover=Hard).",
+                required=False,
+                type=str,
+                enum=Book.CoverChoices.values,
+            ),
+            OpenApiParameter(
+                name="min_fee",
+                description="Minimal daily fee (ex. ?min_fee=0.10).",
+                required=False,
+                type=float,
+            ),
+            OpenApiParameter(
+                name="max_fee",
+                description="Maximal daily fee (ex. ?max_fee=0.50).",
+                required=False,
+                type=float,
+            ),
+            OpenApiParameter(
+                name="author",
+                description="Filtering by author (ex. ?author=J. K. Rowling).",
+                required=False,
+                type=str,
+            ),
+        ],
+    )
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().list(request, *args, **kwargs)
@@ -0,0 +1,68 @@
+import csv
+import json
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+from borrowings.models import Borrowing
+
+EXPORT_FIELDS = (
+    "id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "book_id",
+    "book__title",
+    "user_id",
+    "user__email",
+)
+EXPORT_HEADERS = (
+    "id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "book_id",
+    "book",
+    "user_id",
+    "user",
+)
+
+
+class Echo:
+    """Pseudo-buffer returning written values instead of storing them"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_export_rows(queryset: QuerySet[Borrowing]) -> Iterator[tuple]:
+    """
+    Streams the borrowings through a server-side cursor, so memory
+    stays flat whatever the number of rows
+    """
+    return (
+        queryset
+        .order_by("id")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=settings.BORROWINGS_EXPORT_CHUNK_SIZE)
+    )
+
+
+def iter_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_HEADERS, row)), default=str) + "\n"
+
+
+def iter_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADERS)
+
+    for row in rows:
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "csv": (iter_csv, "text/csv"),
+}
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:38
+
+import borrowings.models
+import datetime
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("borrowings", "0005_borrowing_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="borrowing",
+            name="actual_return_date",
+            field=models.DateField(
+                blank=True,
+                help_text="Actual returning date can not be earlier the borrowing date.",
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(
+                        limit_value=datetime.date.today
+                    )
+                ],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="borrowing",
+            name="expected_return_date",
+            field=models.DateField(
+                help_text="Expected return date must be in range from 1 to 180 days after the borrowing date.",
+                validators=[
+                    django.core.validators.MinValueValidator(
+                        limit_value=borrowings.models.earliest_return_date
+                    ),
+                    django.core.validators.MaxValueValidator(
+                        limit_value=borrowings.models.latest_return_date
+                    ),
+                ],
+            ),
+        ),
+    ]
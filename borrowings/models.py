@@ -8,12 +8,20 @@ from django.utils.translation import gettext_lazy as _
 from books.models import Book
 
 
+def earliest_return_date() -> date:
+    return date.today() + timedelta(days=1)
+
+
+def latest_return_date() -> date:
+    return date.today() + timedelta(days=180)
+
+
 class Borrowing(models.Model):
     borrow_date = models.DateField(auto_now_add=True)
     expected_return_date = models.DateField(
         validators=[
-            MinValueValidator(limit_value=date.today() + timedelta(days=1)),
-            MaxValueValidator(limit_value=date.today() + timedelta(days=180)),
+            MinValueValidator(limit_value=earliest_return_date),
+            MaxValueValidator(limit_value=latest_return_date),
         ],
         help_text=_(
             "Expected return date must be in range from 1 to 180 days "
@@ -24,7 +32,7 @@ class Borrowing(models.Model):
     )
     actual_return_date = models.DateField(
         validators=[
-            MinValueValidator(limit_value=date.today())
+            MinValueValidator(limit_value=date.today)
         ],
         help_text=_(
             "Actual returning date can not be earlier the borrowing date."
@@ -45,6 +53,17 @@ class Borrowing(models.Model):
 
     class Meta:
         ordering = ["expected_return_date"]
+        indexes = [
+            models.Index(
+                fields=["expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_open_due_idx",
+            ),
+            models.Index(
+                fields=["user", "actual_return_date"],
+                name="borrowing_user_returned_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return (
@@ -1,10 +1,18 @@
 import datetime
+from collections import Counter
 
+from django.conf import settings
 from django.db import transaction
 from rest_framework import serializers
 
+from books.models import Book
 from borrowings.models import Borrowing
-from notifications.notifications_bot import send_borrowing_create_notification
+from borrowings.signals import borrowings_created, borrowings_returned
+from notifications.notifications_bot import (
+    send_borrowing_create_notification,
+    send_bulk_borrowing_create_notification,
+    send_bulk_borrowing_return_notification,
+)
 
 
 class BorrowingListSerializer(serializers.ModelSerializer):
@@ -41,6 +49,7 @@ class CreateBorrowingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Borrowing
         fields = (
+            "id",
             "book",
             "user",
             "expected_return_date",
@@ -50,10 +59,14 @@ class CreateBorrowingSerializer(serializers.ModelSerializer):
     @transaction.atomic()
     def create(self, validated_data):
         book = validated_data["book"]
-        book.inventory -= 1
-        book.save()
+
+        if not Book.objects.decrement_inventory(book.id):
+            raise serializers.ValidationError(
+                "This book is not available for borrowing now"
+            )
 
         borrowing = Borrowing.objects.create(**validated_data)
+        borrowings_created.send(sender=Borrowing, borrowings=[borrowing])
 
         send_borrowing_create_notification(
             user=validated_data["user"],
@@ -73,6 +86,82 @@ class CreateBorrowingSerializer(serializers.ModelSerializer):
         return data
 
 
+class BorrowingItemSerializer(serializers.Serializer):
+    book = serializers.IntegerField(min_value=1)
+    expected_return_date = serializers.DateField(
+        validators=Borrowing._meta.get_field("expected_return_date").validators
+    )
+
+
+class BulkCreateBorrowingSerializer(serializers.Serializer):
+    borrowings = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.BULK_BORROWINGS_MAX_ITEMS,
+    )
+
+    @transaction.atomic()
+    def create(self, validated_data):
+        """
+        Creates every valid borrowing of the list at once and returns
+        the created borrowings and the errors by their item index
+        """
+        user = validated_data["user"]
+        errors = {}
+        items = {}
+
+        for index, item in enumerate(validated_data["borrowings"]):
+            item_serializer = BorrowingItemSerializer(data=item)
+
+            if item_serializer.is_valid():
+                items[index] = item_serializer.validated_data
+            else:
+                errors[index] = item_serializer.errors
+
+        # Locked in id order, so overlapping requests do not deadlock
+        books = Book.objects.select_for_update().order_by("pk").in_bulk(
+            {item["book"] for item in items.values()}
+        )
+        taken = Counter()
+        accepted = {}
+
+        for index, item in items.items():
+            book = books.get(item["book"])
+
+            if book is None:
+                errors[index] = {"book": ["This book does not exist"]}
+            elif book.inventory <= taken[book.id]:
+                errors[index] = {
+                    "book": ["This book is not available for borrowing now"]
+                }
+            else:
+                taken[book.id] += 1
+                accepted[index] = Borrowing(
+                    book=book,
+                    user=user,
+                    expected_return_date=item["expected_return_date"],
+                )
+
+        Book.objects.change_inventory(
+            {book_id: -count for book_id, count in taken.items()}
+        )
+        Borrowing.objects.bulk_create(accepted.values())
+        borrowings_created.send(
+            sender=Borrowing, borrowings=list(accepted.values())
+        )
+
+        if accepted:
+            send_bulk_borrowing_create_notification(
+                user=user,
+                borrowings=list(accepted.values()),
+            )
+
+        return {
+            "created": accepted,
+            "errors": dict(sorted(errors.items())),
+        }
+
+
 class BorrowingReturnSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -87,14 +176,99 @@ class BorrowingReturnSerializer(serializers.ModelSerializer):
                 "Actual return date can not be in the past"
             )
 
-        borrowing_to_return = self.instance
-        book = borrowing_to_return.book
-
-        if borrowing_to_return.actual_return_date:
+        if self.instance.actual_return_date:
             raise serializers.ValidationError(
                 "This book already returned"
             )
-        book.inventory += 1
-        book.save()
 
         return data
+
+    @transaction.atomic()
+    def update(self, instance, validated_data):
+        return_date = validated_data["actual_return_date"]
+        is_returned = Borrowing.objects.filter(
+            pk=instance.pk, actual_return_date__isnull=True
+        ).update(actual_return_date=return_date)
+
+        if not is_returned:
+            raise serializers.ValidationError("This book already returned")
+
+        Book.objects.change_inventory({instance.book_id: 1})
+        instance.actual_return_date = return_date
+        borrowings_returned.send(
+            sender=Borrowing, borrowings=[instance], return_date=return_date
+        )
+
+        return instance
+
+
+class BulkReturnBorrowingSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_RETURNS_MAX_ITEMS,
+    )
+    actual_return_date = serializers.DateField(default=datetime.date.today)
+
+    def validate_actual_return_date(self, value):
+        if value < datetime.date.today():
+            raise serializers.ValidationError(
+                "Actual return date can not be in the past"
+            )
+
+        return value
+
+    @transaction.atomic()
+    def create(self, validated_data):
+        """
+        Returns every open borrowing of the list with one UPDATE,
+        restores the inventories of their books with another one
+        and creates their rental payments with one INSERT
+        """
+        ids = list(dict.fromkeys(validated_data["ids"]))
+        returned = list(
+            Borrowing.objects
+            .select_for_update(of=("self",))
+            .select_related("book")
+            .only(
+                "id",
+                "borrow_date",
+                "expected_return_date",
+                "user",
+                "book__id",
+                "book__title",
+                "book__daily_fee",
+            )
+            .filter(id__in=ids, actual_return_date__isnull=True)
+            .order_by("id")
+        )
+        returned_ids = {borrowing.id for borrowing in returned}
+
+        Borrowing.objects.filter(id__in=returned_ids).update(
+            actual_return_date=validated_data["actual_return_date"]
+        )
+        Book.objects.change_inventory(
+            Counter(borrowing.book_id for borrowing in returned)
+        )
+        borrowings_returned.send(
+            sender=Borrowing,
+            borrowings=returned,
+            return_date=validated_data["actual_return_date"],
+        )
+
+        if returned:
+            send_bulk_borrowing_return_notification(borrowings=returned)
+
+        return {
+            "returned": [borrowing.id for borrowing in returned],
+            "errors": [
+                {
+                    "id": borrowing_id,
+                    "errors": [
+                        "This borrowing does not exist or already returned"
+                    ],
+                }
+                for borrowing_id in ids
+                if borrowing_id not in returned_ids
+            ],
+        }
@@ -0,0 +1,9 @@
+from django.dispatch import Signal
+
+# Sent inside the transaction creating borrowings with the list
+# of them as `borrowings`
+borrowings_created = Signal()
+
+# Sent inside the transaction returning borrowings with the list
+# of them as `borrowings` and their `return_date`
+borrowings_returned = Signal()
@@ -1,31 +1,84 @@
 import datetime
+import logging
+from itertools import chain
+from typing import Iterator
 
 from borrowings.models import Borrowing
 from celery import shared_task
+from django.conf import settings
+from django.db.models import QuerySet
 
-from notifications.notifications_bot import send_message
+from notifications.notifications_bot import pack_messages, send_message
 
+logger = logging.getLogger(__name__)
+
+OVERDUE_MODE_DIGEST = "digest"
+OVERDUE_MODE_PER_ITEM = "per_item"
 
-@shared_task
-def check_overdue_borrowings_with_notification() -> None:
 
+def get_overdue_borrowings() -> QuerySet[Borrowing]:
     today = datetime.date.today()
-    overdue_borrowings = Borrowing.objects.filter(
-        actual_return_date__isnull=True,
-        expected_return_date__lte=(today + datetime.timedelta(days=1)),
+
+    return (
+        Borrowing.objects
+        .filter(
+            actual_return_date__isnull=True,
+            expected_return_date__lte=(today + datetime.timedelta(days=1)),
+        )
+        .select_related("user", "book")
+        .only(
+            "id",
+            "expected_return_date",
+            "user__first_name",
+            "user__last_name",
+            "book__title",
+        )
+        .order_by("expected_return_date", "id")
     )
 
-    if overdue_borrowings:
-        send_message("We have next overdue borrowings:")
 
-        for borrowing in overdue_borrowings:
-            message = (
-                f"User {borrowing.user.full_name}\n"
-                f"Book: {borrowing.book.title}, borrowing ID:{borrowing.id}\n"
-                f"Expected return date was: "
-                f"{borrowing.expected_return_date}\n"
-            )
-            send_message(message)
+def format_overdue_borrowing(borrowing: Borrowing) -> str:
+    return (
+        f"User {borrowing.user.full_name}\n"
+        f"Book: {borrowing.book.title}, borrowing ID:{borrowing.id}\n"
+        f"Expected return date was: "
+        f"{borrowing.expected_return_date}\n"
+    )
 
+
+@shared_task
+def check_overdue_borrowings_with_notification(
+        mode: str | None = None
+) -> dict:
+    """
+    Reports overdue borrowings to the admin chat, either packed into
+    as few digest messages as possible or with one message per borrowing
+    """
+    mode = mode or settings.OVERDUE_NOTIFICATION_MODE
+    report = {"mode": mode, "rows": 0, "messages": 0}
+    overdue_borrowings = get_overdue_borrowings().iterator(
+        chunk_size=settings.OVERDUE_NOTIFICATION_CHUNK_SIZE
+    )
+    first_borrowing = next(overdue_borrowings, None)
+
+    def overdue_messages() -> Iterator[str]:
+        yield "We have next overdue borrowings:"
+
+        for borrowing in chain([first_borrowing], overdue_borrowings):
+            report["rows"] += 1
+            yield format_overdue_borrowing(borrowing)
+
+    if first_borrowing is None:
+        messages = iter(["There is no overdue today!"])
+    elif mode == OVERDUE_MODE_DIGEST:
+        messages = pack_messages(overdue_messages())
     else:
-        send_message("There is no overdue today!")
+        messages = overdue_messages()
+
+    for message in messages:
+        send_message(message)
+        report["messages"] += 1
+
+    logger.info("Overdue borrowings report: %s", report)
+
+    return report
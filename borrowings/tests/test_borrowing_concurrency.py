@@ -0,0 +1,75 @@
+import datetime
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+BORROWING_LIST_URL = reverse("borrowings:borrowing-list")
+
+INVENTORY = 50
+REQUESTS = 200
+WORKERS = 32
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "Concurrent writers need row-level locking",
+)
+class ConcurrentBorrowingTests(TransactionTestCase):
+    def setUp(self) -> None:
+        self.book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=INVENTORY,
+            daily_fee=Decimal("0.12"),
+        )
+        self.users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"user{number}@test.com")
+            for number in range(REQUESTS)
+        )
+
+    def borrow(self, user) -> int:
+        client = APIClient()
+        client.force_authenticate(user)
+
+        try:
+            response = client.post(
+                BORROWING_LIST_URL,
+                {
+                    "book": self.book.id,
+                    "expected_return_date": (
+                        datetime.date.today() + datetime.timedelta(days=10)
+                    ),
+                },
+            )
+        finally:
+            connection.close()
+
+        return response.status_code
+
+    @patch("notifications.tasks.deliver_notifications.delay")
+    def test_parallel_borrowings_never_oversell(self, mock_delay):
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            statuses = list(executor.map(self.borrow, self.users))
+
+        self.book.refresh_from_db()
+
+        self.assertEqual(statuses.count(status.HTTP_201_CREATED), INVENTORY)
+        self.assertEqual(
+            statuses.count(status.HTTP_400_BAD_REQUEST), REQUESTS - INVENTORY
+        )
+        self.assertEqual(self.book.inventory, 0)
+        self.assertEqual(
+            Borrowing.objects.filter(book=self.book).count(), INVENTORY
+        )
@@ -0,0 +1,152 @@
+import datetime
+import json
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.tasks import get_overdue_borrowings
+
+SEEDED_ROWS = 1_000_000
+SEEDED_USERS = 1000
+# ANALYZE samples 300 rows per statistics target unit, 10000 reads
+# every seeded row, so the statistics are exact instead of sampled
+STATISTICS_TARGET = 10000
+# PostgreSQL defaults, so the plans do not depend on the server tuning
+PLANNER_SETTINGS = {
+    "seq_page_cost": "1",
+    "random_page_cost": "4",
+    "cpu_tuple_cost": "0.01",
+    "cpu_index_tuple_cost": "0.005",
+    "cpu_operator_cost": "0.0025",
+    "effective_cache_size": "4GB",
+    "max_parallel_workers_per_gather": "0",
+    "jit": "off",
+}
+
+
+def plan_index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+
+    for child in plan.get("Plans", ()):
+        names |= plan_index_names(child)
+
+    return names
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL specific"
+)
+class BorrowingIndexPlanTests(TestCase):
+    """
+    Seeds a million borrowings, 2% of them still open and a twentieth of
+    those overdue, and checks that the planner serves the active and
+    overdue queries from the indexes. The statistics and the cost
+    settings the planner works from are pinned for the class transaction.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover="Soft",
+            inventory=1,
+            daily_fee="0.12",
+        )
+        get_user_model().objects.bulk_create(
+            get_user_model()(email=f"user{number}@library.com")
+            for number in range(SEEDED_USERS)
+        )
+        cls.user = get_user_model().objects.order_by("id").first()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Borrowing._meta.db_table} (
+                    borrow_date,
+                    expected_return_date,
+                    actual_return_date,
+                    book_id,
+                    user_id
+                )
+                SELECT
+                    CURRENT_DATE - 200 + (i %% 200),
+                    CASE WHEN i %% 50 = 0 AND i %% 1000 <> 0
+                        THEN CURRENT_DATE + 2 + (i %% 60)
+                        ELSE CURRENT_DATE - 190 + (i %% 200)
+                    END,
+                    CASE WHEN i %% 50 = 0
+                        THEN NULL
+                        ELSE CURRENT_DATE - 195 + (i %% 200)
+                    END,
+                    %s,
+                    users.ids[1 + i %% array_length(users.ids, 1)]
+                FROM generate_series(1, %s) AS i,
+                    (SELECT array_agg(id) AS ids FROM users_user) AS users
+                """,
+                [cls.book.id, SEEDED_ROWS],
+            )
+            # Checks the deferred foreign keys of the seeded rows once,
+            # instead of at the end of every test
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+            # Autovacuum does not see the uncommitted rows and would
+            # replace the statistics with those of empty tables
+            for model in (Book, get_user_model(), Borrowing):
+                table = model._meta.db_table
+                cursor.execute(
+                    f"ALTER TABLE {table} SET (autovacuum_enabled = false)"
+                )
+
+                for field in model._meta.concrete_fields:
+                    cursor.execute(
+                        f"ALTER TABLE {table} ALTER COLUMN "
+                        f"{connection.ops.quote_name(field.column)} "
+                        f"SET STATISTICS {STATISTICS_TARGET}"
+                    )
+
+                cursor.execute(f"ANALYZE {table}")
+
+            for name, value in PLANNER_SETTINGS.items():
+                cursor.execute(
+                    "SELECT set_config(%s, %s, true)", [name, value]
+                )
+
+    def assertUsesIndex(self, queryset, index_name: str) -> None:  # noqa: N802
+        sql, params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+
+        self.assertIn(
+            index_name,
+            plan_index_names(plan[0]["Plan"]),
+            json.dumps(plan, indent=2),
+        )
+
+    def test_overdue_query_uses_open_due_index(self):
+        self.assertUsesIndex(
+            get_overdue_borrowings(), "borrowing_open_due_idx"
+        )
+
+    def test_active_user_borrowings_use_user_index(self):
+        queryset = Borrowing.objects.filter(
+            user=self.user, actual_return_date__isnull=True
+        )
+
+        self.assertUsesIndex(queryset, "borrowing_user_returned_idx")
+
+    def test_user_history_uses_user_index(self):
+        queryset = Borrowing.objects.filter(
+            user=self.user,
+            actual_return_date__gte=(
+                datetime.date.today() - datetime.timedelta(days=30)
+            ),
+        )
+
+        self.assertUsesIndex(queryset, "borrowing_user_returned_idx")
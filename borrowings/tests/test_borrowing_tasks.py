@@ -0,0 +1,72 @@
+import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.tasks import check_overdue_borrowings_with_notification
+
+
+class OverdueBorrowingsTaskTests(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "TestPassword1",
+            first_name="The",
+            last_name="Test",
+        )
+        self.book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=7,
+            daily_fee=Decimal("0.12"),
+        )
+
+    def create_overdue_borrowings(self, count: int) -> None:
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                book=self.book,
+                user=self.user,
+                expected_return_date=(
+                    datetime.date.today() - datetime.timedelta(days=days)
+                ),
+            )
+            for days in range(count)
+        )
+
+    @patch("borrowings.tasks.send_message")
+    def test_digest_mode_packs_overdue_borrowings(self, mock_send):
+        self.create_overdue_borrowings(100)
+
+        with self.assertNumQueries(1):
+            report = check_overdue_borrowings_with_notification("digest")
+
+        self.assertEqual(report["rows"], 100)
+        self.assertEqual(report["messages"], mock_send.call_count)
+        self.assertLess(report["messages"], 5)
+        self.assertIn(
+            "We have next overdue borrowings:",
+            mock_send.call_args_list[0].args[0],
+        )
+
+    @patch("borrowings.tasks.send_message")
+    def test_per_item_mode_sends_message_per_borrowing(self, mock_send):
+        self.create_overdue_borrowings(3)
+
+        report = check_overdue_borrowings_with_notification("per_item")
+
+        self.assertEqual(
+            report, {"mode": "per_item", "rows": 3, "messages": 4}
+        )
+        self.assertIn("User The Test", mock_send.call_args_list[1].args[0])
+
+    @patch("borrowings.tasks.send_message")
+    def test_no_overdue_borrowings(self, mock_send):
+        report = check_overdue_borrowings_with_notification()
+
+        mock_send.assert_called_once_with("There is no overdue today!")
+        self.assertEqual(report["rows"], 0)
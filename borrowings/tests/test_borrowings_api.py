@@ -1,9 +1,14 @@
+import csv
 import datetime
+import json
+import unittest
 from decimal import Decimal
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -15,6 +20,9 @@ from borrowings.serializers import BorrowingListSerializer
 
 
 BORROWING_LIST_URL = reverse("borrowings:borrowing-list")
+BORROWING_BULK_URL = reverse("borrowings:borrowing-bulk-create")
+BORROWING_BULK_RETURN_URL = reverse("borrowings:borrowing-bulk-return")
+BORROWING_EXPORT_URL = reverse("borrowings:borrowing-export")
 
 
 def detail_url(borrowing_id):
@@ -74,7 +82,7 @@ class AuthenticatedUsersBorrowingApiTests(TestCase):
         borrowed_books = Borrowing.objects.filter(user=self.user_1)
         serializer = BorrowingListSerializer(borrowed_books, many=True)
 
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data["results"], serializer.data)
 
     def test_retrieve_borrowings_for_authenticated_users_allowed(self):
         response = self.client.get(detail_url(self.borrowed_book_1.id))
@@ -111,14 +119,16 @@ class AuthenticatedUsersBorrowingApiTests(TestCase):
     def test_filter_borrowings_by_is_active(self):
         response = self.client.get(BORROWING_LIST_URL, {"is_active": "True"})
 
-        self.assertIn(self.serializer_borrowed_1.data, response.data)
+        self.assertIn(
+            self.serializer_borrowed_1.data, response.data["results"]
+        )
 
     def test_filter_borrowings_by_user_id_for_admin_users(self):
         response = self.client.get(BORROWING_LIST_URL, {"user_id": "2"})
         borrowed_books = Borrowing.objects.filter(user=self.user_2)
         serializer = BorrowingListSerializer(borrowed_books, many=True)
 
-        self.assertEqual(serializer.data, response.data)
+        self.assertEqual(serializer.data, response.data["results"])
 
     def test_return_book(self):
         url = f"/api/borrowings/{self.borrowed_book_1.pk}/return/"
@@ -140,3 +150,320 @@ class AuthenticatedUsersBorrowingApiTests(TestCase):
         ) as mock_overdue:
             mock_overdue()
             mock_overdue.assert_called_once_with()
+
+
+class BulkBorrowingApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@standard.com", "PassWoorD1"
+        )
+        self.client.force_authenticate(self.user)
+        self.book_1 = sample_book(title="Shantaram", inventory=2)
+        self.book_2 = sample_book(title="Shantaram two", inventory=1)
+        self.return_date = datetime.date.today() + datetime.timedelta(days=10)
+
+    def test_bulk_create_borrowings(self):
+        items = [
+            {"book": book.id, "expected_return_date": self.return_date}
+            for book in (self.book_1, self.book_1, self.book_2)
+        ]
+
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                BORROWING_BULK_URL, {"borrowings": items}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["created"]), 3)
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(
+            Borrowing.objects.filter(user=self.user).count(), 3
+        )
+        self.book_1.refresh_from_db()
+        self.book_2.refresh_from_db()
+        self.assertEqual(self.book_1.inventory, 0)
+        self.assertEqual(self.book_2.inventory, 0)
+
+    def test_bulk_create_reports_failed_items(self):
+        items = [
+            {"book": self.book_2.id, "expected_return_date": self.return_date},
+            {"book": self.book_2.id, "expected_return_date": self.return_date},
+            {"book": 0, "expected_return_date": self.return_date},
+            {"book": self.book_1.id, "expected_return_date": "2000-01-01"},
+        ]
+        response = self.client.post(
+            BORROWING_BULK_URL, {"borrowings": items}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [item["index"] for item in response.data["created"]], [0]
+        )
+        self.assertEqual(
+            [item["index"] for item in response.data["errors"]], [1, 2, 3]
+        )
+        self.book_1.refresh_from_db()
+        self.assertEqual(self.book_1.inventory, 2)
+
+    def test_bulk_create_without_valid_items(self):
+        response = self.client.post(
+            BORROWING_BULK_URL,
+            {"borrowings": [{"book": self.book_1.id}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Borrowing.objects.exists())
+
+
+class BulkReturnApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "test@admin.com", "TestPassword1", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.book_1 = sample_book(title="Shantaram", inventory=0)
+        self.book_2 = sample_book(title="Shantaram two", inventory=0)
+        self.borrowings = Borrowing.objects.bulk_create(
+            Borrowing(
+                book=book,
+                user=self.admin,
+                expected_return_date=(
+                    datetime.date.today() + datetime.timedelta(days=5)
+                ),
+            )
+            for book in (self.book_1, self.book_1, self.book_2)
+        )
+
+    def test_bulk_return_restores_inventories(self):
+        ids = [borrowing.id for borrowing in self.borrowings]
+
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                BORROWING_BULK_RETURN_URL, {"ids": ids}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["returned"], ids)
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+        self.book_1.refresh_from_db()
+        self.book_2.refresh_from_db()
+        self.assertEqual(self.book_1.inventory, 2)
+        self.assertEqual(self.book_2.inventory, 1)
+
+    def test_bulk_return_skips_returned_borrowings(self):
+        returned_id = self.borrowings[0].id
+        self.client.post(
+            BORROWING_BULK_RETURN_URL, {"ids": [returned_id]}, format="json"
+        )
+        response = self.client.post(
+            BORROWING_BULK_RETURN_URL,
+            {"ids": [returned_id, self.borrowings[1].id]},
+            format="json",
+        )
+
+        self.assertEqual(response.data["returned"], [self.borrowings[1].id])
+        self.assertEqual(response.data["errors"][0]["id"], returned_id)
+        self.book_1.refresh_from_db()
+        self.assertEqual(self.book_1.inventory, 2)
+
+    def test_bulk_return_for_standard_users_forbidden(self):
+        user = get_user_model().objects.create_user(
+            "test@standard.com", "PassWoorD1"
+        )
+        self.client.force_authenticate(user)
+        response = self.client.post(
+            BORROWING_BULK_RETURN_URL,
+            {"ids": [self.borrowings[0].id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CursorPaginationBorrowingApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@standard.com", "PassWoorD1"
+        )
+        self.client.force_authenticate(self.user)
+        book = sample_book(inventory=30)
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                book=book,
+                user=self.user,
+                expected_return_date=(
+                    datetime.date.today()
+                    + datetime.timedelta(days=number % 4 + 1)
+                ),
+            )
+            for number in range(25)
+        )
+        self.expected_ids = list(
+            Borrowing.objects.order_by(
+                "expected_return_date", "id"
+            ).values_list("id", flat=True)
+        )
+
+    def test_cursor_pages_walk_whole_list_without_count(self):
+        url = f"{BORROWING_LIST_URL}?pagination=cursor"
+        ids = []
+        pages = []
+
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            ids.extend(
+                borrowing["id"] for borrowing in response.data["results"]
+            )
+            pages.append(response.data)
+            url = response.data["next"]
+
+        self.assertEqual(ids, self.expected_ids)
+        self.assertEqual(len(pages), 3)
+
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(
+            [borrowing["id"] for borrowing in response.data["results"]],
+            self.expected_ids[10:20],
+        )
+        self.assertIsNotNone(response.data["previous"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(BORROWING_LIST_URL, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ApproximateCountBorrowingApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "test@admin.com", "TestPassword1", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        book = sample_book(inventory=30)
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                book=book,
+                user=self.admin,
+                expected_return_date=(
+                    datetime.date.today() + datetime.timedelta(days=5)
+                ),
+            )
+            for _ in range(15)
+        )
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql", "Estimates need PostgreSQL"
+    )
+    @override_settings(APPROXIMATE_COUNT_THRESHOLD=1)
+    def test_large_list_uses_estimated_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Borrowing._meta.db_table}")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(BORROWING_LIST_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["count_is_approximate"])
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertIsNotNone(response.data["next"])
+
+    @override_settings(APPROXIMATE_COUNT_THRESHOLD=1)
+    def test_rows_past_low_estimate_are_reachable(self):
+        ids = []
+        url = BORROWING_LIST_URL
+
+        with patch(
+            "library_app.pagination.estimate_count", return_value=10
+        ):
+            while url:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertTrue(response.data["count_is_approximate"])
+                ids += [row["id"] for row in response.data["results"]]
+                url = response.data["next"]
+
+        self.assertEqual(
+            sorted(ids),
+            sorted(Borrowing.objects.values_list("id", flat=True)),
+        )
+
+    def test_small_list_is_counted_exactly(self):
+        response = self.client.get(BORROWING_LIST_URL)
+
+        self.assertFalse(response.data["count_is_approximate"])
+        self.assertEqual(response.data["count"], 15)
+
+
+class BorrowingExportApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "test@admin.com", "TestPassword1", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.book = sample_book(inventory=150)
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                book=self.book,
+                user=self.admin,
+                expected_return_date=(
+                    datetime.date.today() + datetime.timedelta(days=5)
+                ),
+            )
+            for _ in range(120)
+        )
+
+    def test_list_page_size_is_bounded(self):
+        response = self.client.get(BORROWING_LIST_URL, {"page_size": 1000})
+
+        self.assertEqual(len(response.data["results"]), 100)
+
+    def test_export_ndjson(self):
+        response = self.client.get(BORROWING_EXPORT_URL)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(rows), 120)
+        self.assertEqual(rows[0]["book"], self.book.title)
+        self.assertEqual(rows[0]["user"], self.admin.email)
+
+    def test_export_csv(self):
+        response = self.client.get(
+            BORROWING_EXPORT_URL, {"export_format": "csv"}
+        )
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(content.splitlines()))
+
+        self.assertEqual(rows[0][0], "id")
+        self.assertEqual(len(rows), 121)
+
+    def test_export_invalid_format(self):
+        response = self.client.get(
+            BORROWING_EXPORT_URL, {"export_format": "xml"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_for_standard_users_forbidden(self):
+        user = get_user_model().objects.create_user(
+            "test@standard.com", "PassWoorD1"
+        )
+        self.client.force_authenticate(user)
+        response = self.client.get(BORROWING_EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
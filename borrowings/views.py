@@ -2,6 +2,7 @@ from typing import Type, Any
 
 from django.db import transaction
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
@@ -9,21 +10,25 @@ from drf_spectacular.utils import (
 )
 from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from borrowings.export import EXPORT_FORMATS, iter_export_rows
 from borrowings.models import Borrowing
 from borrowings.serializers import (
     BorrowingListSerializer,
     BorrowingDetailSerializer,
     BorrowingReturnSerializer,
+    BulkCreateBorrowingSerializer,
+    BulkReturnBorrowingSerializer,
     CreateBorrowingSerializer,
 )
-from library_app.pagination import Pagination
+from library_app.pagination import ApproximateCountPagination
 from notifications.notifications_bot import send_borrowing_return_notification
+from users.authentication import CachedJWTAuthentication
 
 
 # Only for documentation purposes (Swagger)
@@ -52,9 +57,10 @@ class BorrowingViewSet(
     viewsets.GenericViewSet
 ):
     queryset = Borrowing.objects.select_related("book", "user")
-    authentication_classes = (JWTAuthentication,)
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = CreateBorrowingSerializer
+    pagination_class = ApproximateCountPagination
 
     def get_queryset(self) -> QuerySet[Borrowing]:
         queryset = self.queryset
@@ -86,6 +92,12 @@ class BorrowingViewSet(
         if self.action == "return_book":
             return BorrowingReturnSerializer
 
+        if self.action == "bulk_create":
+            return BulkCreateBorrowingSerializer
+
+        if self.action == "bulk_return":
+            return BulkReturnBorrowingSerializer
+
         return CreateBorrowingSerializer
 
     @action(
@@ -109,6 +121,105 @@ class BorrowingViewSet(
 
             return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="bulk",
+    )
+    def bulk_create(self, request) -> Response:
+        """
+        Endpoint for creating a list of borrowings at once,
+        reports the errors of the items which were not created
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save(user=self.request.user)
+
+        data = {
+            "created": [
+                {"index": index, **BorrowingListSerializer(borrowing).data}
+                for index, borrowing in result["created"].items()
+            ],
+            "errors": [
+                {"index": index, "errors": errors}
+                for index, errors in result["errors"].items()
+            ],
+        }
+        response_status = (
+            status.HTTP_201_CREATED
+            if result["created"]
+            else status.HTTP_400_BAD_REQUEST
+        )
+
+        return Response(data, status=response_status)
+
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="bulk-return",
+        permission_classes=[IsAdminUser],
+    )
+    def bulk_return(self, request) -> Response:
+        """
+        Endpoint for returning a list of borrowings at once,
+        reports the ids which were not returned
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+
+        response_status = (
+            status.HTTP_200_OK
+            if result["returned"]
+            else status.HTTP_400_BAD_REQUEST
+        )
+
+        return Response(result, status=response_status)
+
+    # Only for documentation purposes (Swagger)
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="export_format",
+                description=(
+                    "Format of the exported borrowings, "
+                    "ndjson by default (ex. ?export_format=csv)."
+                ),
+                required=False,
+                type=str,
+                enum=list(EXPORT_FORMATS),
+            ),
+        ],
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="export",
+        permission_classes=[IsAdminUser],
+    )
+    def export(self, request) -> StreamingHttpResponse:
+        """
+        Endpoint streaming all the borrowings matching the list filters,
+        for admin users only
+        """
+        export_format = request.query_params.get("export_format", "ndjson")
+
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({
+                "export_format": f"Choose one of: {', '.join(EXPORT_FORMATS)}"
+            })
+
+        render, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            render(iter_export_rows(self.get_queryset())),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="borrowings.{export_format}"'
+        )
+
+        return response
+
     # Only for documentation purposes (Swagger)
     @extend_schema(
         parameters=[
@@ -133,7 +244,7 @@ class BorrowingViewSet(
         ],
     )
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        return super().list(self, request, *args, **kwargs)
+        return super().list(request, *args, **kwargs)
 
     def perform_create(self, serializer: Serializer) -> None:
         serializer.save(user=self.request.user)
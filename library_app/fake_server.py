@@ -0,0 +1,91 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class FakeJSONServer(ABC):
+    """
+    Local JSON API served from a background thread for tests and
+    benchmarks. Subclasses answer POST requests in `respond`, calls
+    that pass `reject` get the responses queued with `queue_response`
+    first.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.responses = []
+        self.lock = threading.RLock()
+        self.server = ThreadingHTTPServer((host, port), self.handler_class())
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    def queue_response(self, status: int, payload: dict) -> None:
+        """Makes the next call answer with the given response"""
+        with self.lock:
+            self.responses.append((status, payload))
+
+    def reject(self, path: str, headers: Any) -> tuple[int, dict] | None:
+        """Returns the error response of an invalid call"""
+        return None
+
+    @abstractmethod
+    def respond(
+            self, path: str, headers: Any, data: dict
+    ) -> tuple[int, dict]:
+        """Answers a valid call when no response is queued"""
+
+    def answer(self, path: str, headers: Any, data: dict) -> tuple[int, dict]:
+        with self.lock:
+            error = self.reject(path, headers)
+
+            if error:
+                return error
+
+            if self.responses:
+                return self.responses.pop(0)
+
+            return self.respond(path, headers, data)
+
+    def handler_class(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"{}")
+                status, payload = fake.answer(self.path, self.headers, data)
+                body = json.dumps(payload).encode()
+
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except ConnectionError:
+                    # The client gave up waiting
+                    pass
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "FakeJSONServer":
+        self.thread.start()
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,73 @@
+import threading
+import time
+from typing import Any, Callable, Generic, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+T = TypeVar("T")
+
+
+class RetryLater(Exception):
+    """
+    Raised by an attempt that may succeed when repeated, after `delay`
+    seconds or the backoff of the attempt when it is None
+    """
+
+    def __init__(self, delay: float | None = None) -> None:
+        super().__init__(delay)
+        self.delay = delay
+
+
+def pooled_session(pool_size: int = 10) -> requests.Session:
+    """Session reusing up to `pool_size` connections to a single host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+def with_retries(
+        attempt: Callable[[], T],
+        error: Callable[[], Exception],
+        max_retries: int,
+        backoff: float,
+        sleep: Callable[[float], Any] = time.sleep,
+) -> T:
+    """
+    Calls `attempt` until it returns, retrying on RetryLater and network
+    errors with exponential backoff. Raises `error()` once the retries
+    are spent, without sleeping after the last attempt.
+    """
+    for number in range(max_retries + 1):
+        try:
+            return attempt()
+        except (RetryLater, requests.RequestException) as exc:
+            if number == max_retries:
+                break
+
+            sleep(getattr(exc, "delay", None) or backoff * 2 ** number)
+
+    raise error()
+
+
+class ProcessSingleton(Generic[T]):
+    """Builds one instance lazily and shares it by all threads of a process"""
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self.factory = factory
+        self.instance = None
+        self.lock = threading.Lock()
+
+    def get(self) -> T:
+        with self.lock:
+            if self.instance is None:
+                self.instance = self.factory()
+
+            return self.instance
+
+    def reset(self) -> None:
+        with self.lock:
+            self.instance = None
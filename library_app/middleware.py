@@ -0,0 +1,48 @@
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+
+
+class QueryCounter:
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(
+            self,
+            execute: Callable,
+            sql: str,
+            params: Any,
+            many: bool,
+            context: dict,
+    ) -> Any:
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryCountHeaderMiddleware:
+    """
+    Reports the number of SQL queries made while handling a request
+    in the X-Query-Count response header, enabled by QUERY_COUNT_HEADER
+    """
+
+    def __init__(
+            self, get_response: Callable[[HttpRequest], HttpResponse]
+    ) -> None:
+        if not settings.QUERY_COUNT_HEADER:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        counter = QueryCounter()
+
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+
+        response["X-Query-Count"] = str(counter.count)
+
+        return response
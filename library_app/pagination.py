@@ -1,6 +1,348 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination seeking on the queryset ordering completed with
+    the primary key, so every page is an index range scan of a stable
+    position and no count query is made
+    """
+
+    page_size = 10
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    @staticmethod
+    def get_ordering(queryset: QuerySet) -> list[str]:
+        ordering = [
+            field
+            for field in (
+                queryset.query.order_by or queryset.model._meta.ordering
+            )
+            if isinstance(field, str)
+        ]
+        pk_name = queryset.model._meta.pk.name
+
+        if not {pk_name, "pk"} & {field.lstrip("-") for field in ordering}:
+            ordering.append(pk_name)
+
+        return ordering
+
+    @staticmethod
+    def reverse_ordering(ordering: list[str]) -> list[str]:
+        return [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in ordering
+        ]
+
+    @staticmethod
+    def seek_condition(ordering: list[str], values: list) -> Q:
+        """Builds (a > x) OR (a = x AND b > y) ... for the ordering"""
+        condition = Q()
+        equal = Q()
+
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        return condition
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        values = [
+            getattr(instance, field.lstrip("-")) for field in self.ordering
+        ]
+        data = json.dumps({"v": values, "r": reverse}, default=str)
+        cursor = base64.urlsafe_b64encode(data.encode()).decode()
+
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request, queryset: QuerySet) -> tuple | None:
+        cursor = request.query_params.get(self.cursor_query_param)
+
+        if not cursor:
+            return None
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values = data["v"]
+            reverse = bool(data["r"])
+
+            if len(values) != len(self.ordering):
+                raise ValueError
+
+            return [
+                self.to_python(queryset, field, value)
+                for field, value in zip(self.ordering, values)
+            ], reverse
+        except (
+            binascii.Error, KeyError, TypeError, ValueError, ValidationError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def to_python(queryset: QuerySet, field: str, value):
+        name = field.lstrip("-")
+
+        if name == "pk":
+            name = queryset.model._meta.pk.name
+
+        try:
+            model_field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+
+        return model_field.to_python(value)
+
+    def paginate_queryset(self, queryset, request, view=None) -> list:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request, queryset)
+        reverse = bool(cursor and cursor[1])
+        ordering = (
+            self.reverse_ordering(self.ordering) if reverse else self.ordering
+        )
+        queryset = queryset.order_by(*ordering)
+
+        if cursor:
+            queryset = queryset.filter(
+                self.seek_condition(ordering, cursor[0])
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+
+        return results
+
+    def get_next_link(self) -> str | None:
+        if not (self.has_next and self.page):
+            return None
+
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema) -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string", "nullable": True, "format": "uri"
+                },
+                "results": schema,
+            },
+        }
 
 
 class Pagination(PageNumberPagination):
+    """
+    Page number pagination switching to keyset pagination when requested
+    with ?pagination=cursor (or a cursor), or for views setting
+    `pagination_mode = "cursor"`
+    """
+
     page_size = 10
     max_page_size = 100
+    page_size_query_param = "page_size"
+    mode_query_param = "pagination"
+    keyset_pagination_class = KeysetPagination
+
+    def is_keyset(self, request, view) -> bool:
+        mode = request.query_params.get(
+            self.mode_query_param, getattr(view, "pagination_mode", "page")
+        )
+
+        return (
+            mode == "cursor"
+            or self.keyset_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None) -> list | None:
+        self.keyset = None
+
+        if self.is_keyset(request, view):
+            self.keyset = self.keyset_pagination_class()
+
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data) -> Response:
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """
+    Estimates the number of rows from the PostgreSQL statistics:
+    pg_class.reltuples for a whole table, the planner row estimate
+    for a filtered queryset; returns None on other databases
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+
+            if row and row[0] >= 0:
+                return row[0]
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class ApproximatePage(Page):
+    has_more = None
+
+    def has_next(self) -> bool:
+        if self.has_more is not None:
+            return self.has_more
+
+        return super().has_next()
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator estimating the count of large querysets instead of running
+    COUNT(*), small ones below APPROXIMATE_COUNT_THRESHOLD rows
+    are still counted exactly
+    """
+
+    is_approximate = False
+
+    @cached_property
+    def count(self) -> int:
+        estimate = estimate_count(self.object_list)
+
+        if estimate is None or estimate < settings.APPROXIMATE_COUNT_THRESHOLD:
+            return self.object_list.count()
+
+        self.is_approximate = True
+
+        return estimate
+
+    def validate_number(self, number) -> int:
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.is_approximate and int(number) > 0:
+                return int(number)
+
+            raise
+
+    def page(self, number) -> ApproximatePage:
+        """
+        With an estimated count, fetches one row past the page to tell
+        whether another one follows, rows beyond the estimate stay
+        reachable
+        """
+        number = self.validate_number(number)
+
+        if not self.is_approximate:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        page = self._get_page(rows[:self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+
+        return page
+
+    def _get_page(self, *args, **kwargs) -> ApproximatePage:
+        return ApproximatePage(*args, **kwargs)
+
+
+class ApproximateCountPagination(Pagination):
+    """
+    Pagination for large list endpoints, the response tells
+    whether the count is an estimate
+    """
+
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data) -> Response:
+        response = super().get_paginated_response(data)
+
+        if not self.keyset:
+            response.data["count_is_approximate"] = (
+                self.page.paginator.is_approximate
+            )
+
+        return response
+
+    def get_paginated_response_schema(self, schema) -> dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {
+            "type": "boolean",
+        }
+
+        return response_schema
@@ -0,0 +1,159 @@
+import time
+from functools import partial
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from library_app.conditional import ConditionalGetMixin
+from library_app.versions import bump_version, get_version
+
+HIT = "HIT"
+MISS = "MISS"
+
+
+def metrics_key(namespace: str, outcome: str) -> str:
+    return f"{namespace}:metrics:{outcome.lower()}"
+
+
+def invalidate(namespace: str) -> None:
+    """
+    Drops the namespace right away, so the writing transaction stops
+    reading its own stale entries, and once more after commit, so
+    entries cached by other workers in between are dropped as well
+    """
+    bump_version(namespace)
+    transaction.on_commit(lambda: bump_version(namespace))
+
+
+def record(namespace: str, outcome: str) -> None:
+    key = metrics_key(namespace, outcome)
+
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+
+def get_metrics(namespace: str) -> dict:
+    hits = cache.get(metrics_key(namespace, HIT), 0)
+    misses = cache.get(metrics_key(namespace, MISS), 0)
+    total = hits + misses
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
+
+
+def reset_metrics(namespace: str) -> None:
+    cache.delete_many(
+        [metrics_key(namespace, HIT), metrics_key(namespace, MISS)]
+    )
+
+
+def get_or_compute(
+        key: str,
+        compute: Callable[[], Any],
+        timeout: int,
+        lock_timeout: float,
+        wait_timeout: float,
+        poll_interval: float = 0.05,
+) -> tuple[Any, bool]:
+    """
+    Returns the cached value and whether it was a hit.
+    Only the worker that takes the lock recomputes a missing entry,
+    the others poll for its result. When the lock is released without
+    a cached result, one of them takes the lock in turn; they compute
+    on their own only if nothing shows up within `wait_timeout` seconds.
+    `compute` may return None for values that must not be cached.
+    """
+    lock_key = f"{key}:lock"
+    deadline = time.monotonic() + wait_timeout
+
+    while True:
+        value = cache.get(key)
+
+        if value is not None:
+            return value, True
+
+        if cache.add(lock_key, 1, timeout=lock_timeout):
+            try:
+                value = compute()
+
+                if value is not None:
+                    cache.set(key, value, timeout=timeout)
+            finally:
+                cache.delete(lock_key)
+
+            return value, False
+
+        if time.monotonic() >= deadline:
+            return compute(), False
+
+        time.sleep(poll_interval)
+
+
+class CachedResponseMixin(ConditionalGetMixin):
+    """
+    Serves list and retrieve responses from the Django cache.
+    Entries are keyed by the namespace version, host, path with query
+    string and media type, so repeated requests are answered without
+    touching the database, and conditional ones are answered before
+    the cache entry is even read.
+    Writers call `invalidate()` with the same namespace.
+    """
+
+    def get_cache_key(self, request: Request) -> str:
+        return "|".join((
+            f"{self.cache_namespace}:v{get_version(self.cache_namespace)}",
+            request.get_host(),
+            request.get_full_path(),
+            request.accepted_media_type or "",
+        ))
+
+    def cached_response(
+            self,
+            handler: Callable[..., Response],
+            request: Request,
+            *args: Any,
+            **kwargs: Any,
+    ) -> Response:
+        computed = []
+
+        def compute() -> Any:
+            response = handler(request, *args, **kwargs)
+            computed.append(response)
+
+            return response.data if response.status_code == 200 else None
+
+        data, hit = get_or_compute(
+            self.get_cache_key(request),
+            compute,
+            timeout=settings.RESPONSE_CACHE_TIMEOUT,
+            lock_timeout=settings.RESPONSE_CACHE_LOCK_TIMEOUT,
+            wait_timeout=settings.RESPONSE_CACHE_LOCK_TIMEOUT,
+        )
+        outcome = HIT if hit else MISS
+        record(self.cache_namespace, outcome)
+        response = Response(data) if data is not None else computed[-1]
+        response["X-Cache"] = outcome
+
+        return response
+
+    def conditional_response(
+            self,
+            handler: Callable[..., Response],
+            request: Request,
+            *args: Any,
+            **kwargs: Any,
+    ) -> HttpResponse:
+        return super().conditional_response(
+            partial(self.cached_response, handler), request, *args, **kwargs
+        )
@@ -11,8 +11,10 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 import os
 from datetime import timedelta
+from decimal import Decimal
 from pathlib import Path
 
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -46,6 +48,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "debug_toolbar",
@@ -55,9 +58,11 @@ INSTALLED_APPS = [
     "borrowings",
     "notifications",
     "payments",
+    "stats",
 ]
 
 MIDDLEWARE = [
+    "library_app.middleware.QueryCountHeaderMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -149,19 +154,23 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle"
+        "library_app.throttling.AnonGCRAThrottle",
+        "library_app.throttling.UserGCRAThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
-        "anon": "20/minute",
-        "user": "60/minute"
+        "anon": os.getenv("THROTTLE_RATE_ANON", "20/minute"),
+        "user": os.getenv("THROTTLE_RATE_USER", "60/minute"),
+        "token": os.getenv("THROTTLE_RATE_TOKEN", "5/minute"),
     },
 }
 
+THROTTLE_REDIS_URL = os.getenv("THROTTLE_REDIS_URL")
+THROTTLE_REDIS_TIMEOUT = 0.1
+
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Nearby Lib API",
@@ -181,10 +190,102 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "users.serializers.LibraryTokenObtainPairSerializer"
+    ),
+    "TOKEN_REFRESH_SERIALIZER": (
+        "users.serializers.LibraryTokenRefreshSerializer"
+    ),
 }
 
+USER_CACHE_TIMEOUT = 300
+USER_CACHE_LOCAL_TIMEOUT = 5
+JWT_STATELESS_AUTH = os.getenv("JWT_STATELESS_AUTH") == "1"
+
+if os.getenv("REDIS_CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_CACHE_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300))
+RESPONSE_CACHE_LOCK_TIMEOUT = 5
+
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
 CELERY_TIMEZONE = "Europe/Kyiv"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+CELERY_BEAT_SCHEDULE = {
+    "deliver-notifications": {
+        "task": "notifications.tasks.deliver_notifications",
+        "schedule": 60.0,
+    },
+    "accrue-overdue-fines": {
+        "task": "payments.tasks.accrue_overdue_fines",
+        "schedule": crontab(hour=1, minute=0),
+    },
+    "create-missing-payment-sessions": {
+        "task": "payments.tasks.create_missing_payment_sessions",
+        "schedule": 10 * 60.0,
+    },
+    "process-payment-events": {
+        "task": "payments.tasks.process_payment_events",
+        "schedule": 60.0,
+    },
+}
+
+NOTIFICATIONS_BATCH_SIZE = int(os.getenv("NOTIFICATIONS_BATCH_SIZE", 500))
+NOTIFICATIONS_MAX_ATTEMPTS = int(os.getenv("NOTIFICATIONS_MAX_ATTEMPTS", 5))
+# Seconds a worker owns the notifications it is sending
+NOTIFICATIONS_CLAIM_TIMEOUT = 5 * 60
+
+TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+TELEGRAM_TRANSPORT = "notifications.telegram.RequestsTransport"
+TELEGRAM_TIMEOUT = 10
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_CHAT_RATE = 1
+TELEGRAM_GROUP_CHAT_RATE = 20 / 60
+TELEGRAM_MAX_RETRIES = 5
+
+OVERDUE_NOTIFICATION_MODE = os.getenv("OVERDUE_NOTIFICATION_MODE", "digest")
+OVERDUE_NOTIFICATION_CHUNK_SIZE = 2000
+
+FINE_MULTIPLIER = Decimal(os.getenv("FINE_MULTIPLIER", "2"))
+FINE_ACCRUAL_BATCH_SIZE = 10000
+
+PAYMENT_PROVIDER_URL = os.getenv(
+    "PAYMENT_PROVIDER_URL", "http://127.0.0.1:8001"
+)
+PAYMENT_PROVIDER_API_KEY = os.getenv("PAYMENT_PROVIDER_API_KEY")
+PAYMENT_PROVIDER_TIMEOUT = 10
+PAYMENT_PROVIDER_MAX_RETRIES = 3
+PAYMENT_CURRENCY = "usd"
+PAYMENT_SESSIONS_BATCH_SIZE = 500
+PAYMENT_WEBHOOK_SECRET = os.getenv("PAYMENT_WEBHOOK_SECRET")
+PAYMENT_WEBHOOK_MAX_EVENTS = 1000
+PAYMENT_EVENTS_BATCH_SIZE = 5000
+
+BULK_BORROWINGS_MAX_ITEMS = 100
+BULK_RETURNS_MAX_ITEMS = 1000
+BORROWINGS_EXPORT_CHUNK_SIZE = 2000
+
+BOOK_SEARCH_TRIGRAM = True
+
+CONDITIONAL_GET_MAX_AGE = int(os.getenv("CONDITIONAL_GET_MAX_AGE", 60))
+
+QUERY_COUNT_HEADER = os.getenv("QUERY_COUNT_HEADER") == "1"
+
+APPROXIMATE_COUNT_THRESHOLD = int(
+    os.getenv("APPROXIMATE_COUNT_THRESHOLD", 100000)
+)
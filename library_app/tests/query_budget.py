@@ -0,0 +1,85 @@
+import re
+from collections import Counter
+from typing import Callable, Iterable
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.response import Response
+
+DATASET_SIZES = (1, 5, 25)
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(sql: str) -> str:
+    """Replaces literals, so queries differing only by ids group together"""
+    return LITERALS.sub("?", sql)
+
+
+class QueryBudgetMixin:
+    """
+    Runs an endpoint against growing datasets and checks that the number
+    of SQL queries does not grow with the number of rows.
+    `seed(count)` adds `count` more rows to the dataset and `request()`
+    calls the endpoint, the response must be successful.
+    """
+
+    dataset_sizes: Iterable[int] = DATASET_SIZES
+
+    def capture(
+            self, request: Callable[[], Response]
+    ) -> list[str]:
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = request()
+
+        self.assertLess(response.status_code, 400, response.data)
+
+        return [query["sql"] for query in context.captured_queries]
+
+    def assertQueryBudget(  # noqa: N802
+            self,
+            request: Callable[[], Response],
+            seed: Callable[[int], None],
+            budget: int | None = None,
+    ) -> None:
+        seeded = 0
+        baseline = None
+
+        for size in sorted(self.dataset_sizes):
+            seed(size - seeded)
+            seeded = size
+            queries = self.capture(request)
+
+            if baseline is None:
+                baseline = queries
+
+                if budget is not None and len(queries) > budget:
+                    self.fail(
+                        f"{len(queries)} queries exceed the budget of "
+                        f"{budget}:\n" + "\n".join(queries)
+                    )
+
+                continue
+
+            if len(queries) != len(baseline):
+                self.fail(self.growth_message(baseline, queries, size))
+
+    def growth_message(
+            self, baseline: list[str], queries: list[str], size: int
+    ) -> str:
+        expected = Counter(map(normalize_sql, baseline))
+        actual = Counter(map(normalize_sql, queries))
+        repeated = [
+            f"{count - expected[sql]} extra x {sql}"
+            for sql, count in actual.items()
+            if count > expected[sql]
+        ]
+
+        return (
+            f"Query count grew from {len(baseline)} "
+            f"to {len(queries)} with {size} rows, extra queries:\n"
+            + "\n".join(repeated)
+        )
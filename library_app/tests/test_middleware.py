@@ -0,0 +1,32 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from books.models import Book
+
+BOOK_LIST_URL = reverse("books:book-list")
+
+
+class QueryCountHeaderMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=7,
+            daily_fee="0.12",
+        )
+
+    @override_settings(QUERY_COUNT_HEADER=True)
+    def test_query_count_reported_when_enabled(self):
+        response = APIClient().get(BOOK_LIST_URL)
+
+        self.assertEqual(response["X-Query-Count"], "2")
+
+    @override_settings(QUERY_COUNT_HEADER=False)
+    def test_header_absent_when_disabled(self):
+        response = APIClient().get(BOOK_LIST_URL)
+
+        self.assertNotIn("X-Query-Count", response)
@@ -0,0 +1,200 @@
+import datetime
+from decimal import Decimal
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from library_app.tests.query_budget import QueryBudgetMixin
+from payments.models import Payment
+
+LIST_PARAMS = {"page_size": 100}
+
+
+class EndpointQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.sequence = count()
+        self.admin = get_user_model().objects.create_user(
+            "admin@library.com", "PassWoord1", is_staff=True
+        )
+        self.user = get_user_model().objects.create_user(
+            "user@library.com", "PassWoord1"
+        )
+
+    def seed_books(self, number: int) -> list[Book]:
+        return Book.objects.bulk_create(
+            Book(
+                title=f"Book {next(self.sequence)}",
+                author="Author",
+                cover=Book.CoverChoices.SOFT,
+                inventory=3,
+                copies=3,
+                daily_fee=Decimal("0.10"),
+            )
+            for _ in range(number)
+        )
+
+    def seed_borrowings(self, number: int, user=None) -> list[Borrowing]:
+        users = [user] * number if user else (
+            get_user_model().objects.bulk_create(
+                get_user_model()(
+                    email=f"reader{next(self.sequence)}@library.com",
+                    first_name="Reader",
+                )
+                for _ in range(number)
+            )
+        )
+
+        return Borrowing.objects.bulk_create(
+            Borrowing(
+                book=book,
+                user=borrower,
+                expected_return_date=(
+                    datetime.date.today() + datetime.timedelta(days=7)
+                ),
+            )
+            for book, borrower in zip(self.seed_books(number), users)
+        )
+
+    def seed_payments(self, number: int, user=None) -> list[Payment]:
+        return Payment.objects.bulk_create(
+            Payment(
+                status=Payment.StatusChoices.PENDING,
+                type=Payment.TypeChoices.PAYMENT,
+                borrowing_id=borrowing,
+                to_pay=Decimal("1.00"),
+            )
+            for borrowing in self.seed_borrowings(number, user)
+        )
+
+    def get(self, url: str, user=None, params=None) -> Response:
+        if user:
+            self.client.force_authenticate(user)
+
+        return self.client.get(url, params)
+
+    def test_book_list(self):
+        self.assertQueryBudget(
+            lambda: self.get(reverse("books:book-list"), params=LIST_PARAMS),
+            self.seed_books,
+            budget=3,
+        )
+
+    def test_book_detail(self):
+        book = self.seed_books(1)[0]
+
+        self.assertQueryBudget(
+            lambda: self.get(reverse("books:book-detail", args=[book.id])),
+            self.seed_books,
+            budget=2,
+        )
+
+    def test_borrowing_list_for_admin(self):
+        self.assertQueryBudget(
+            lambda: self.get(
+                reverse("borrowings:borrowing-list"), self.admin, LIST_PARAMS
+            ),
+            self.seed_borrowings,
+            budget=4,
+        )
+
+    def test_borrowing_list_for_user(self):
+        self.assertQueryBudget(
+            lambda: self.get(
+                reverse("borrowings:borrowing-list"), self.user, LIST_PARAMS
+            ),
+            lambda number: self.seed_borrowings(number, self.user),
+            budget=3,
+        )
+
+    def test_borrowing_detail(self):
+        borrowing = self.seed_borrowings(1, self.user)[0]
+        url = reverse("borrowings:borrowing-detail", args=[borrowing.id])
+
+        self.assertQueryBudget(
+            lambda: self.get(url, self.user),
+            self.seed_borrowings,
+            budget=1,
+        )
+
+    def test_payment_list(self):
+        self.assertQueryBudget(
+            lambda: self.get(
+                reverse("payments:payment-list"), self.admin, LIST_PARAMS
+            ),
+            self.seed_payments,
+            budget=4,
+        )
+
+    def test_payment_detail(self):
+        payment = self.seed_payments(1)[0]
+        url = reverse("payments:payment-detail", args=[payment.id])
+
+        self.assertQueryBudget(
+            lambda: self.get(url, self.admin),
+            self.seed_payments,
+            budget=1,
+        )
+
+    def test_current_user(self):
+        self.assertQueryBudget(
+            lambda: self.get(reverse("users:manage"), self.user),
+            lambda number: self.seed_borrowings(number, self.user),
+            budget=1,
+        )
+
+
+class QueryBudgetHarnessTests(QueryBudgetMixin, TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            "user@library.com", "PassWoord1"
+        )
+        self.book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=7,
+            daily_fee=Decimal("0.12"),
+        )
+
+    def seed(self, number: int) -> None:
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                book=self.book,
+                user=self.user,
+                expected_return_date=(
+                    datetime.date.today() + datetime.timedelta(days=7)
+                ),
+            )
+            for _ in range(number)
+        )
+
+    def test_growing_query_count_reported_with_sql(self):
+        def request() -> Response:
+            titles = [
+                borrowing.book.title for borrowing in Borrowing.objects.all()
+            ]
+            return Response(titles)
+
+        with self.assertRaises(AssertionError) as context:
+            self.assertQueryBudget(request, self.seed)
+
+        message = str(context.exception)
+        self.assertIn("Query count grew from 2 to 6", message)
+        self.assertIn('4 extra x SELECT "books_book"', message)
+
+    def test_budget_exceeded(self):
+        with self.assertRaises(AssertionError) as context:
+            self.assertQueryBudget(
+                lambda: Response(list(Borrowing.objects.all())),
+                self.seed,
+                budget=0,
+            )
+
+        self.assertIn("exceed the budget of 0", str(context.exception))
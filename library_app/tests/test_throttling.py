@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from library_app.throttling import AnonGCRAThrottle, ScopedGCRAThrottle
+
+TOKEN_URL = reverse("users:token_obtain_pair")
+
+
+class ThreePerMinuteThrottle(AnonGCRAThrottle):
+    rate = "3/minute"
+
+
+def anonymous_request(address: str = "10.0.0.1"):
+    request = APIRequestFactory().get("/", REMOTE_ADDR=address)
+    request.user = AnonymousUser()
+
+    return request
+
+
+class GCRAThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 1000.0
+        timer = patch.object(
+            ThreePerMinuteThrottle, "timer", lambda throttle: self.now
+        )
+        timer.start()
+        self.addCleanup(timer.stop)
+
+    def allow(self, address: str = "10.0.0.1") -> ThreePerMinuteThrottle:
+        throttle = ThreePerMinuteThrottle()
+        throttle.allowed = throttle.allow_request(
+            anonymous_request(address), None
+        )
+
+        return throttle
+
+    def test_allows_burst_up_to_the_limit(self):
+        self.assertTrue(all(self.allow().allowed for _ in range(3)))
+
+        throttle = self.allow()
+
+        self.assertFalse(throttle.allowed)
+        self.assertEqual(throttle.wait(), 20)
+
+    def test_frees_one_request_per_emission_interval(self):
+        for _ in range(3):
+            self.allow()
+
+        self.now += 19.9
+        self.assertFalse(self.allow().allowed)
+
+        self.now += 0.1
+        self.assertTrue(self.allow().allowed)
+        self.assertFalse(self.allow().allowed)
+
+    def test_clients_are_limited_separately(self):
+        for _ in range(3):
+            self.allow()
+
+        self.assertTrue(self.allow("10.0.0.2").allowed)
+
+    @override_settings(THROTTLE_REDIS_URL="redis://127.0.0.1:1/0")
+    def test_unreachable_redis_falls_back_to_cache(self):
+        with self.assertLogs("library_app.throttling", "WARNING"):
+            results = [self.allow().allowed for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+
+@unittest.skipUnless(settings.THROTTLE_REDIS_URL, "THROTTLE_REDIS_URL unset")
+class RedisGCRAThrottleTests(SimpleTestCase):
+    def test_limit_is_shared_by_throttle_instances(self):
+        address = "10.1.0.1"
+        results = [
+            ThreePerMinuteThrottle().allow_request(
+                anonymous_request(address), None
+            )
+            for _ in range(4)
+        ]
+
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(cache.get(f"throttle_anon_{address}"), None)
+
+
+class TokenThrottleApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    @patch.dict(ScopedGCRAThrottle.THROTTLE_RATES, {"token": "2/minute"})
+    def test_token_endpoint_has_its_own_tighter_limit(self):
+        payload = {"email": "nobody@library.com", "password": "wrong"}
+        responses = [
+            self.client.post(TOKEN_URL, payload) for _ in range(3)
+        ]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [
+                status.HTTP_401_UNAUTHORIZED,
+                status.HTTP_401_UNAUTHORIZED,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+        self.assertEqual(responses[-1]["Retry-After"], "30")
@@ -0,0 +1,125 @@
+import logging
+import math
+import threading
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+logger = logging.getLogger(__name__)
+
+# GCRA: the key holds the theoretical arrival time (TAT) of the next
+# request in milliseconds of the Redis clock. A request is allowed while
+# TAT - now stays within the period minus one emission interval, which
+# lets `num_requests` through per period with bursts up to the limit.
+# Returns 0 when allowed, otherwise milliseconds to wait.
+GCRA_SCRIPT = """
+redis.replicate_commands()
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call("GET", KEYS[1]) or now)
+
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + emission
+local wait = new_tat - period - now
+
+if wait > 0 then
+    return wait
+end
+
+redis.call("SET", KEYS[1], new_tat, "PX", new_tat - now)
+
+return 0
+"""
+
+local_lock = threading.Lock()
+
+
+@lru_cache
+def get_gcra_script(url: str) -> redis.commands.core.Script:
+    """One pooled client per URL, the script runs through EVALSHA"""
+    client = redis.Redis.from_url(
+        url,
+        socket_connect_timeout=settings.THROTTLE_REDIS_TIMEOUT,
+        socket_timeout=settings.THROTTLE_REDIS_TIMEOUT,
+    )
+
+    return client.register_script(GCRA_SCRIPT)
+
+
+class GCRARateThrottle(SimpleRateThrottle):
+    """
+    Replaces the request history of `SimpleRateThrottle` with a single
+    timestamp checked by the generic cell rate algorithm.
+    With THROTTLE_REDIS_URL every check is one atomic script call,
+    so all workers and nodes share the limit. Without it, or while
+    Redis is unreachable, the timestamp is kept in the Django cache.
+    """
+
+    def allow_request(self, request, view) -> bool:
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+
+        if self.key is None:
+            return True
+
+        period = self.duration * 1000
+        emission = max(round(period / self.num_requests), 1)
+        self.wait_ms = None
+
+        if settings.THROTTLE_REDIS_URL:
+            try:
+                self.wait_ms = get_gcra_script(settings.THROTTLE_REDIS_URL)(
+                    keys=[self.key], args=[emission, period]
+                )
+            except redis.RedisError as error:
+                logger.warning("Throttling falls back to the cache: %s", error)
+
+        if self.wait_ms is None:
+            self.wait_ms = self.acquire_from_cache(emission, period)
+
+        return self.wait_ms == 0
+
+    def acquire_from_cache(self, emission: int, period: int) -> int:
+        """Same algorithm, atomic only within the process"""
+        with local_lock:
+            now = math.floor(self.timer() * 1000)
+            new_tat = max(self.cache.get(self.key, now), now) + emission
+            wait = new_tat - period - now
+
+            if wait > 0:
+                return wait
+
+            self.cache.set(
+                self.key, new_tat, math.ceil((new_tat - now) / 1000)
+            )
+
+        return 0
+
+    def wait(self) -> float:
+        return self.wait_ms / 1000
+
+
+class AnonGCRAThrottle(AnonRateThrottle, GCRARateThrottle):
+    pass
+
+
+class UserGCRAThrottle(UserRateThrottle, GCRARateThrottle):
+    pass
+
+
+class ScopedGCRAThrottle(ScopedRateThrottle, GCRARateThrottle):
+    """Limits views by their `throttle_scope`, like tighter `token`"""
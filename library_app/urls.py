@@ -34,6 +34,7 @@ urlpatterns = [
         "api/payments/",
         include("payments.urls", namespace="payments"),
     ),
+    path("api/stats/", include("stats.urls", namespace="stats")),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def modified_key(namespace: str) -> str:
+    return f"{namespace}:modified"
+
+
+def get_version(namespace: str) -> int:
+    key = version_key(namespace)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+
+    return version
+
+
+def get_last_modified(namespace: str) -> datetime:
+    """
+    Time of the last write to the namespace, a namespace without one
+    in the cache counts as modified now
+    """
+    key = modified_key(namespace)
+    modified = cache.get(key)
+
+    if modified is None:
+        modified = timezone.now().replace(microsecond=0)
+        cache.add(key, modified, timeout=None)
+        modified = cache.get(key, modified)
+
+    return modified
+
+
+def bump_version(namespace: str) -> None:
+    """
+    Invalidates every cached entry and validator of the namespace at once,
+    old entries are never read again and just expire
+    """
+    key = version_key(namespace)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 2, timeout=None)
+
+    cache.set(
+        modified_key(namespace),
+        timezone.now().replace(microsecond=0),
+        timeout=None,
+    )
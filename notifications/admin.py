@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from notifications.models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("id", "chat_id", "status", "attempts", "created_at")
+    list_filter = ("status",)
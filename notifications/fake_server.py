@@ -0,0 +1,35 @@
+import re
+from typing import Any
+
+from library_app.fake_server import FakeJSONServer
+
+
+class FakeTelegramServer(FakeJSONServer):
+    """
+    Telegram Bot API stand-in, point TELEGRAM_API_URL (or a notifier's
+    api_url) to its `url`
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__(host, port)
+        self.messages = []
+
+    def reject(self, path: str, headers: Any) -> tuple[int, dict] | None:
+        if not re.match(r"^/bot[^/]+/\w+$", path):
+            return 404, {"ok": False}
+
+        return None
+
+    def respond(
+            self, path: str, headers: Any, data: dict
+    ) -> tuple[int, dict]:
+        self.messages.append(data)
+
+        return 200, {
+            "ok": True,
+            "result": {
+                "message_id": len(self.messages),
+                "chat": {"id": data.get("chat_id")},
+                "text": data.get("text"),
+            },
+        }
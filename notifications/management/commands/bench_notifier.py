@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.fake_server import FakeTelegramServer
+from notifications.telegram import TelegramNotifier
+
+
+class Command(BaseCommand):
+    """Measures notifier throughput against a local fake Telegram server"""
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--messages", type=int, default=300)
+        parser.add_argument("--chats", type=int, default=100)
+        parser.add_argument("--global-rate", type=float, default=30)
+
+    def handle(self, *args, **options) -> None:
+        with FakeTelegramServer() as server:
+            notifier = TelegramNotifier(
+                token="bench",
+                api_url=server.url,
+                global_rate=options["global_rate"],
+            )
+            started = time.perf_counter()
+
+            for number in range(options["messages"]):
+                notifier.send_message(
+                    f"Message {number}",
+                    chat_id=str(number % options["chats"]),
+                )
+
+            elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"Sent {options['messages']} messages in {elapsed:.2f}s "
+            f"({options['messages'] / elapsed:.1f} msg/s)"
+        )
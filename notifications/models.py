@@ -1,3 +1,37 @@
 from django.db import models
 
-# Create your models here.
+
+class Notification(models.Model):
+    """
+    Outbox row for a Telegram message, written in the same transaction
+    as the change it reports and delivered after commit by Celery
+    """
+
+    class StatusChoices(models.TextChoices):
+        PENDING = "Pending"
+        SENT = "Sent"
+
+    chat_id = models.CharField(max_length=64)
+    message = models.TextField()
+    status = models.CharField(
+        max_length=7,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["chat_id", "id"],
+                condition=models.Q(status="Pending"),
+                name="notification_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Notification to chat {self.chat_id}: {self.status}"
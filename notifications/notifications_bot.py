@@ -1,21 +1,98 @@
-import os
-import telebot
+import logging
 
-from dotenv import load_dotenv
-from typing import Any
+from django.conf import settings
+from django.db import transaction
+from typing import Any, Iterable, Iterator
 
 from borrowings.models import Borrowing
+from notifications.models import Notification
+from notifications.telegram import get_notifier
 from users.models import User
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
+TELEGRAM_MESSAGE_LIMIT = 4096
 
-def send_message(message: str) -> Any:
-    token = os.getenv("TELEGRAM_BOT_TOKEN")
-    bot = telebot.TeleBot(token=token)
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
 
-    return bot.send_message(chat_id, message)
+def send_message(message: str, chat_id: str | None = None) -> Any:
+    return get_notifier().send_message(message, chat_id=chat_id)
+
+
+def pack_messages(
+        messages: Iterable[str],
+        limit: int = TELEGRAM_MESSAGE_LIMIT,
+        separator: str = "\n\n",
+) -> Iterator[str]:
+    """
+    Lazily joins messages into as few texts as the Telegram message limit
+    allows, splitting a single message only when it does not fit on its own
+    """
+    for text, _ in pack_notifications(
+            enumerate(messages), limit=limit, separator=separator
+    ):
+        yield text
+
+
+def pack_notifications(
+        notifications: Iterable[tuple[int, str]],
+        limit: int = TELEGRAM_MESSAGE_LIMIT,
+        separator: str = "\n\n",
+) -> Iterator[tuple[str, list[int]]]:
+    """
+    Packs `(id, message)` pairs like `pack_messages` and yields every text
+    with the ids of the messages it completes, a split message belongs
+    to the text with its last part
+    """
+    current = ""
+    ids = []
+
+    for notification_id, message in notifications:
+        while len(message) > limit:
+            if current:
+                yield current, ids
+                current, ids = "", []
+            yield message[:limit], []
+            message = message[limit:]
+
+        if not current:
+            current = message
+        elif len(current) + len(separator) + len(message) <= limit:
+            current = f"{current}{separator}{message}"
+        else:
+            yield current, ids
+            current, ids = message, []
+
+        ids.append(notification_id)
+
+    if current:
+        yield current, ids
+
+
+def schedule_delivery() -> None:
+    """
+    Asks a Celery worker to deliver pending notifications; a broker outage
+    only delays delivery until the periodic sweep picks the rows up
+    """
+    from notifications.tasks import deliver_notifications
+
+    try:
+        deliver_notifications.delay()
+    except Exception:
+        logger.exception("Could not schedule notifications delivery")
+
+
+def enqueue_message(message: str) -> Notification:
+    """
+    Stores the message in the notifications outbox as part of the current
+    transaction, its delivery is scheduled only after the commit
+    """
+    notification = Notification.objects.create(
+        chat_id=settings.TELEGRAM_CHAT_ID or "",
+        message=message,
+    )
+    transaction.on_commit(schedule_delivery)
+
+    return notification
 
 
 def send_borrowing_create_notification(
@@ -23,7 +100,7 @@ def send_borrowing_create_notification(
         borrowing: Borrowing
 ) -> None:
     """
-    Sends a message via Telegram bot to admin user
+    Queues a message via Telegram bot to admin user
     about creating a new borrowing
     """
 
@@ -33,18 +110,55 @@ def send_borrowing_create_notification(
         f"Book: {borrowing.book.title}, "
         f"with expected return date: {borrowing.expected_return_date}."
     )
-    send_message(message)
+    enqueue_message(message)
+
+
+def send_bulk_borrowing_create_notification(
+        user: User,
+        borrowings: list[Borrowing]
+) -> None:
+    """
+    Queues one message via Telegram bot to admin user
+    about a list of borrowings created at once
+    """
+
+    books = "\n".join(
+        f"- {borrowing.book.title}, "
+        f"with expected return date: {borrowing.expected_return_date}"
+        for borrowing in borrowings
+    )
+    message = (
+        f"{len(borrowings)} new borrowings are created by user:"
+        f"{user.full_name}. \n"
+        f"{books}"
+    )
+    enqueue_message(message)
 
 
 def send_borrowing_return_notification(
         borrowing: Borrowing
 ) -> None:
     """
-    Sends a message via Telegram bot to admin user
+    Queues a message via Telegram bot to admin user
     about borrowing return
     """
 
     message = (
         f"Book with title: {borrowing.book.title}, is returned"
     )
-    send_message(message)
+    enqueue_message(message)
+
+
+def send_bulk_borrowing_return_notification(
+        borrowings: list[Borrowing]
+) -> None:
+    """
+    Queues one message via Telegram bot to admin user
+    about a list of borrowings returned at once
+    """
+
+    books = "\n".join(
+        f"- {borrowing.book.title}" for borrowing in borrowings
+    )
+    message = f"{len(borrowings)} books are returned:\n{books}"
+    enqueue_message(message)
@@ -0,0 +1,86 @@
+import datetime
+import logging
+from collections import defaultdict
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from notifications.models import Notification
+from notifications.notifications_bot import pack_notifications, send_message
+
+logger = logging.getLogger(__name__)
+
+
+def claim_notifications() -> list[Notification]:
+    """
+    Takes a batch of pending notifications for this worker until the claim
+    times out, so they are sent outside of any transaction and other
+    workers skip them meanwhile
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        pending = list(
+            Notification.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+                status=Notification.StatusChoices.PENDING,
+                attempts__lt=settings.NOTIFICATIONS_MAX_ATTEMPTS,
+            )
+            .only("id", "chat_id", "message")
+            [:settings.NOTIFICATIONS_BATCH_SIZE]
+        )
+        Notification.objects.filter(
+            id__in=[notification.id for notification in pending]
+        ).update(
+            attempts=F("attempts") + 1,
+            claimed_until=now + datetime.timedelta(
+                seconds=settings.NOTIFICATIONS_CLAIM_TIMEOUT
+            ),
+        )
+
+    return pending
+
+
+@shared_task
+def deliver_notifications() -> int:
+    """
+    Sends pending outbox notifications, coalescing the messages queued
+    for the same chat into as few Telegram messages as possible.
+    Every sent message marks its notifications as sent right away,
+    so a later failure does not send them again.
+    Returns the number of delivered notifications.
+    """
+    delivered = 0
+    notifications_by_chat = defaultdict(list)
+
+    for notification in claim_notifications():
+        notifications_by_chat[notification.chat_id].append(
+            (notification.id, notification.message)
+        )
+
+    for chat_id, notifications in notifications_by_chat.items():
+        unsent = {notification_id for notification_id, _ in notifications}
+
+        try:
+            for message, ids in pack_notifications(notifications):
+                send_message(message, chat_id=chat_id)
+                delivered += Notification.objects.filter(id__in=ids).update(
+                    status=Notification.StatusChoices.SENT,
+                    claimed_until=None,
+                    sent_at=timezone.now(),
+                )
+                unsent.difference_update(ids)
+        except Exception:
+            logger.exception(
+                "Could not deliver notifications to chat %s", chat_id
+            )
+            Notification.objects.filter(id__in=unsent).update(
+                claimed_until=None
+            )
+
+    return delivered
@@ -0,0 +1,189 @@
+import threading
+import time
+from typing import Any, Callable, Protocol
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from library_app.http_client import (
+    ProcessSingleton,
+    RetryLater,
+    pooled_session,
+    with_retries,
+)
+
+
+class TelegramError(Exception):
+    pass
+
+
+class Transport(Protocol):
+
+    def post(self, url: str, data: dict) -> tuple[int, dict]:
+        """Sends a Bot API call and returns the status code and JSON body"""
+
+
+class RequestsTransport:
+    """Bot API transport over a pooled requests session"""
+
+    def __init__(self, pool_size: int = 10, timeout: float = 10) -> None:
+        self.timeout = timeout
+        self.session = pooled_session(pool_size)
+
+    def post(self, url: str, data: dict) -> tuple[int, dict]:
+        response = self.session.post(url, json=data, timeout=self.timeout)
+
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {"ok": False, "description": response.text}
+
+        return response.status_code, payload
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled with `rate` tokens per second"""
+
+    def __init__(
+            self,
+            rate: float,
+            capacity: float = 1,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long to wait before using it"""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated_at) * self.rate,
+            )
+            self.updated_at = now
+            self.tokens -= 1
+
+            if self.tokens >= 0:
+                return 0
+
+            return -self.tokens / self.rate
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+
+        if delay:
+            self.sleep(delay)
+
+
+class TelegramNotifier:
+    """
+    Telegram Bot API client respecting the global and per-chat rate limits
+    and retrying with backoff on 429, 5xx responses and network errors
+    """
+
+    def __init__(
+            self,
+            token: str,
+            default_chat_id: str | None = None,
+            transport: Transport | None = None,
+            api_url: str = "https://api.telegram.org",
+            global_rate: float = 30,
+            chat_rate: float = 1,
+            group_chat_rate: float = 20 / 60,
+            max_retries: int = 5,
+            backoff: float = 1,
+            sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        self.token = token
+        self.default_chat_id = default_chat_id
+        self.transport = transport or RequestsTransport()
+        self.api_url = api_url.rstrip("/")
+        self.chat_rate = chat_rate
+        self.group_chat_rate = group_chat_rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.global_bucket = TokenBucket(global_rate, global_rate, sleep=sleep)
+        self.chat_buckets = {}
+        self.lock = threading.Lock()
+
+    def chat_bucket(self, chat_id: str) -> TokenBucket:
+        with self.lock:
+            if chat_id not in self.chat_buckets:
+                is_group = str(chat_id).startswith("-")
+                self.chat_buckets[chat_id] = TokenBucket(
+                    self.group_chat_rate if is_group else self.chat_rate,
+                    sleep=self.sleep,
+                )
+
+            return self.chat_buckets[chat_id]
+
+    def send_message(self, text: str, chat_id: str | None = None) -> dict:
+        chat_id = chat_id or self.default_chat_id
+
+        return self.call("sendMessage", {"chat_id": chat_id, "text": text})
+
+    def call(self, method: str, data: dict) -> dict:
+        url = f"{self.api_url}/bot{self.token}/{method}"
+        chat_bucket = self.chat_bucket(data["chat_id"])
+
+        def attempt() -> dict:
+            self.global_bucket.acquire()
+            chat_bucket.acquire()
+            status, payload = self.transport.post(url, data)
+
+            if status == 429:
+                parameters = payload.get("parameters") or {}
+                raise RetryLater(parameters.get("retry_after"))
+
+            if status >= 500:
+                raise RetryLater
+
+            if not payload.get("ok"):
+                raise TelegramError(payload.get("description", status))
+
+            return payload["result"]
+
+        return with_retries(
+            attempt,
+            lambda: TelegramError(
+                f"{method} failed after {self.max_retries} retries"
+            ),
+            self.max_retries,
+            self.backoff,
+            self.sleep,
+        )
+
+
+def build_notifier() -> TelegramNotifier:
+    transport_class = import_string(settings.TELEGRAM_TRANSPORT)
+
+    return TelegramNotifier(
+        token=settings.TELEGRAM_BOT_TOKEN,
+        default_chat_id=settings.TELEGRAM_CHAT_ID,
+        transport=transport_class(timeout=settings.TELEGRAM_TIMEOUT),
+        api_url=settings.TELEGRAM_API_URL,
+        global_rate=settings.TELEGRAM_GLOBAL_RATE,
+        chat_rate=settings.TELEGRAM_CHAT_RATE,
+        group_chat_rate=settings.TELEGRAM_GROUP_CHAT_RATE,
+        max_retries=settings.TELEGRAM_MAX_RETRIES,
+    )
+
+
+shared_notifier = ProcessSingleton(build_notifier)
+
+
+def get_notifier() -> TelegramNotifier:
+    """Returns the notifier shared by all the threads of this process"""
+    return shared_notifier.get()
+
+
+def reset_notifier() -> None:
+    shared_notifier.reset()
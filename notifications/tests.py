@@ -1,3 +1,215 @@
-from django.test import TestCase
+import datetime
+from unittest.mock import patch
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from notifications.fake_server import FakeTelegramServer
+from notifications.models import Notification
+from notifications.notifications_bot import (
+    TELEGRAM_MESSAGE_LIMIT,
+    enqueue_message,
+    pack_messages,
+)
+from notifications.tasks import deliver_notifications
+from notifications.telegram import (
+    TelegramError,
+    TelegramNotifier,
+    TokenBucket,
+)
+
+
+class PackMessagesTest(TestCase):
+
+    def test_messages_are_joined_up_to_the_limit(self):
+        messages = ["a" * 1000] * 9
+        packed = list(pack_messages(messages))
+
+        self.assertEqual(len(packed), 3)
+        for text in packed:
+            self.assertLessEqual(len(text), TELEGRAM_MESSAGE_LIMIT)
+        self.assertEqual(
+            "".join(packed).replace("\n", ""), "".join(messages)
+        )
+
+    def test_oversized_message_is_split(self):
+        packed = list(
+            pack_messages(["short", "b" * (TELEGRAM_MESSAGE_LIMIT + 10)])
+        )
+
+        self.assertEqual(
+            packed, ["short", "b" * TELEGRAM_MESSAGE_LIMIT, "b" * 10]
+        )
+
+
+class NotificationOutboxTest(TestCase):
+
+    def test_enqueue_schedules_delivery_after_commit(self):
+        with patch(
+            "notifications.tasks.deliver_notifications.delay"
+        ) as mock_delay:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                enqueue_message("Hello")
+
+            mock_delay.assert_not_called()
+            self.assertEqual(Notification.objects.count(), 1)
+
+            for callback in callbacks:
+                callback()
+
+            mock_delay.assert_called_once_with()
+
+    def test_broker_failure_does_not_propagate(self):
+        with patch(
+            "notifications.tasks.deliver_notifications.delay",
+            side_effect=ConnectionError,
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue_message("Hello")
+
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_delivery_coalesces_messages_per_chat(self):
+        Notification.objects.bulk_create(
+            [Notification(chat_id="1", message=f"m{i}") for i in range(3)]
+            + [Notification(chat_id="2", message="other")]
+        )
+
+        with patch("notifications.tasks.send_message") as mock_send:
+            delivered = deliver_notifications()
+
+        self.assertEqual(delivered, 4)
+        self.assertEqual(mock_send.call_count, 2)
+        mock_send.assert_any_call("m0\n\nm1\n\nm2", chat_id="1")
+        self.assertFalse(
+            Notification.objects.filter(
+                status=Notification.StatusChoices.PENDING
+            ).exists()
+        )
+
+    def test_sent_messages_are_not_repeated_after_failure(self):
+        Notification.objects.bulk_create(
+            Notification(chat_id="1", message=letter * 3000)
+            for letter in "abc"
+        )
+
+        with patch(
+            "notifications.tasks.send_message",
+            side_effect=[None, ConnectionError],
+        ):
+            self.assertEqual(deliver_notifications(), 1)
+
+        with patch("notifications.tasks.send_message") as mock_send:
+            self.assertEqual(deliver_notifications(), 2)
+
+        self.assertEqual(mock_send.call_count, 2)
+        mock_send.assert_any_call("b" * 3000, chat_id="1")
+        self.assertEqual(
+            list(
+                Notification.objects.values_list("status", "attempts")
+            ),
+            [("Sent", 1), ("Sent", 2), ("Sent", 2)],
+        )
+
+    def test_claimed_notifications_are_skipped(self):
+        Notification.objects.create(
+            chat_id="1",
+            message="m",
+            claimed_until=timezone.now() + datetime.timedelta(minutes=1),
+        )
+
+        with patch("notifications.tasks.send_message") as mock_send:
+            self.assertEqual(deliver_notifications(), 0)
+
+        mock_send.assert_not_called()
+
+    @override_settings(NOTIFICATIONS_MAX_ATTEMPTS=2)
+    def test_failed_delivery_is_retried_up_to_max_attempts(self):
+        notification = Notification.objects.create(chat_id="1", message="m")
+
+        with patch(
+            "notifications.tasks.send_message", side_effect=ConnectionError
+        ) as mock_send:
+            deliver_notifications()
+            deliver_notifications()
+            deliver_notifications()
+
+        notification.refresh_from_db()
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(notification.attempts, 2)
+        self.assertEqual(
+            notification.status, Notification.StatusChoices.PENDING
+        )
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(TestCase):
+
+    def test_bucket_waits_once_capacity_is_spent(self):
+        clock = FakeClock()
+        bucket = TokenBucket(
+            rate=2, capacity=2, clock=clock, sleep=clock.sleep
+        )
+
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertEqual(clock.sleeps, [0.5, 0.5])
+
+
+class TelegramNotifierTest(TestCase):
+
+    def test_messages_go_through_one_pooled_session(self):
+        with FakeTelegramServer() as server:
+            notifier = TelegramNotifier(
+                token="test", api_url=server.url, chat_rate=1000
+            )
+            session = notifier.transport.session
+
+            for number in range(3):
+                notifier.send_message(f"m{number}", chat_id="1")
+
+        self.assertIs(notifier.transport.session, session)
+        self.assertEqual(
+            [message["text"] for message in server.messages],
+            ["m0", "m1", "m2"],
+        )
+
+    def test_too_many_requests_are_retried_after_delay(self):
+        clock = FakeClock()
+
+        with FakeTelegramServer() as server:
+            server.queue_response(
+                429,
+                {"ok": False, "parameters": {"retry_after": 3}},
+            )
+            notifier = TelegramNotifier(
+                token="test", api_url=server.url, sleep=clock.sleep
+            )
+            result = notifier.send_message("Hello", chat_id="1")
+
+        self.assertEqual(result["text"], "Hello")
+        self.assertIn(3, clock.sleeps)
+        self.assertEqual(len(server.messages), 1)
+
+    def test_rejected_message_raises_error(self):
+        with FakeTelegramServer() as server:
+            server.queue_response(
+                400, {"ok": False, "description": "chat not found"}
+            )
+            notifier = TelegramNotifier(token="test", api_url=server.url)
+
+            with self.assertRaisesMessage(TelegramError, "chat not found"):
+                notifier.send_message("Hello", chat_id="1")
@@ -0,0 +1,55 @@
+import time
+from typing import Any
+
+from library_app.fake_server import FakeJSONServer
+
+
+class FakePaymentProviderServer(FakeJSONServer):
+    """
+    Checkout API stand-in, point PAYMENT_PROVIDER_URL (or a provider's
+    api_url) to its `url`. Answers repeated idempotency keys with the
+    session created for the first request and waits `delay` seconds
+    before every answer to play a slow provider.
+    """
+
+    def __init__(
+            self, host: str = "127.0.0.1", port: int = 0, delay: float = 0
+    ) -> None:
+        super().__init__(host, port)
+        self.delay = delay
+        self.requests = []
+        self.sessions = {}
+
+    def answer(self, path: str, headers: Any, data: dict) -> tuple[int, dict]:
+        time.sleep(self.delay)
+
+        with self.lock:
+            self.requests.append(
+                {"key": headers.get("Idempotency-Key"), **data}
+            )
+
+            return super().answer(path, headers, data)
+
+    def reject(self, path: str, headers: Any) -> tuple[int, dict] | None:
+        if path != "/v1/checkout/sessions":
+            return 404, {"error": "Not found"}
+
+        if not headers.get("Idempotency-Key"):
+            return 400, {"error": "Idempotency-Key is required"}
+
+        return None
+
+    def respond(
+            self, path: str, headers: Any, data: dict
+    ) -> tuple[int, dict]:
+        key = headers["Idempotency-Key"]
+
+        if key not in self.sessions:
+            session_id = f"cs_test_{len(self.sessions) + 1}"
+            self.sessions[key] = {
+                "id": session_id,
+                "url": f"{self.url}/pay/{session_id}",
+                **data,
+            }
+
+        return 200, self.sessions[key]
@@ -0,0 +1,137 @@
+import datetime
+import json
+import random
+import time
+from decimal import Decimal
+from typing import Iterator
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.models import Payment, PaymentEvent
+from payments.tasks import process_payment_events
+from payments.webhooks import SIGNATURE_HEADER, sign
+
+SECRET = "bench-secret"
+
+
+class Command(BaseCommand):
+    """
+    Measures webhook ingestion and event processing throughput with
+    a local generator of completed session events, some of them sent
+    twice as providers do. Everything it writes is rolled back.
+    """
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--events", type=int, default=10000)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Events per webhook request",
+        )
+        parser.add_argument(
+            "--duplicates",
+            type=float,
+            default=0.1,
+            help="Share of events delivered a second time",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def seed_payments(self, number: int) -> None:
+        book = Book.objects.create(
+            title="Webhook benchmark",
+            author="Benchmark",
+            cover=Book.CoverChoices.SOFT,
+            inventory=0,
+            daily_fee=Decimal("0.10"),
+        )
+        user = get_user_model().objects.create_user(
+            f"webhook-bench-{time.time_ns()}@library.com"
+        )
+        borrowings = Borrowing.objects.bulk_create(
+            Borrowing(book=book, user=user, expected_return_date=self.today)
+            for _ in range(number)
+        )
+        Payment.objects.bulk_create(
+            Payment(
+                status=Payment.StatusChoices.PENDING,
+                type=Payment.TypeChoices.PAYMENT,
+                borrowing_id=borrowing,
+                to_pay=Decimal("1.00"),
+                session_id=f"{self.prefix}_cs_{number}",
+            )
+            for number, borrowing in enumerate(borrowings)
+        )
+
+    def generate_events(self, options: dict) -> Iterator[dict]:
+        generator = random.Random(options["seed"])
+
+        for number in range(options["events"]):
+            event = {
+                "id": f"{self.prefix}_evt_{number}",
+                "type": PaymentEvent.SESSION_COMPLETED,
+                "session_id": f"{self.prefix}_cs_{number}",
+            }
+            yield event
+
+            if generator.random() < options["duplicates"]:
+                yield event
+
+    def post_events(self, client: Client, options: dict) -> int:
+        url = reverse("payments:webhook")
+        events = list(self.generate_events(options))
+
+        for start in range(0, len(events), options["batch_size"]):
+            body = json.dumps(
+                events[start:start + options["batch_size"]]
+            ).encode()
+            response = client.post(
+                url,
+                body,
+                content_type="application/json",
+                headers={SIGNATURE_HEADER: sign(body, SECRET)},
+            )
+
+            if response.status_code != 202:
+                raise CommandError(f"Webhook failed: {response.content}")
+
+        return len(events)
+
+    def handle(self, *args, **options) -> None:
+        setup_test_environment()
+        self.prefix = f"bench{time.time_ns()}"
+        self.today = datetime.date.today()
+
+        # DEBUG would add the debug toolbar to every request
+        with override_settings(DEBUG=False, PAYMENT_WEBHOOK_SECRET=SECRET), \
+                transaction.atomic():
+            self.seed_payments(options["events"])
+
+            started = time.perf_counter()
+            delivered = self.post_events(Client(), options)
+            ingestion = time.perf_counter() - started
+
+            started = time.perf_counter()
+
+            with CaptureQueriesContext(connection) as queries:
+                report = process_payment_events()
+
+            processing = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"Ingested {delivered} deliveries in {ingestion:.2f}s "
+            f"({delivered / ingestion:.0f} events/s)"
+        )
+        self.stdout.write(
+            f"Processed {report['events']} events in {processing:.2f}s "
+            f"({report['events'] / processing:.0f} events/s) with "
+            f"{len(queries)} queries, {report['paid']} payments paid"
+        )
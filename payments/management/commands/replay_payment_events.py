@@ -0,0 +1,75 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from payments.models import PaymentEvent
+from payments.tasks import process_payment_events
+from payments.webhooks import store_events
+
+
+class Command(BaseCommand):
+    """
+    Applies provider events again: stored ones selected by id or
+    receive time, and missed ones backfilled from a file of events
+    exported from the provider, one JSON object per line.
+    Applying an event twice is harmless, paid payments stay paid.
+    """
+
+    help = "Replay stored payment events or backfill them from a file"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--event-id", action="append", default=[], dest="event_ids"
+        )
+        parser.add_argument(
+            "--since", help="Replay the events received since this time"
+        )
+        parser.add_argument("--file", help="NDJSON file of events to add")
+
+    def read_events(self, path: str) -> list[dict]:
+        with open(path) as file:
+            events = [json.loads(line) for line in file if line.strip()]
+
+        for number, event in enumerate(events, start=1):
+            if not {"id", "type", "session_id"} <= event.keys():
+                raise CommandError(
+                    f"Event on line {number} needs id, type and session_id"
+                )
+
+        return events
+
+    def handle(self, *args, **options) -> None:
+        if not (options["event_ids"] or options["since"] or options["file"]):
+            raise CommandError("Pass --event-id, --since or --file")
+
+        if options["since"]:
+            since = parse_datetime(options["since"])
+
+            if since is None:
+                raise CommandError(f"Invalid --since: {options['since']}")
+
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+            replayed = PaymentEvent.objects.filter(
+                created_at__gte=since
+            ).update(status=PaymentEvent.StatusChoices.PENDING)
+            self.stdout.write(f"Replaying {replayed} events since {since}")
+
+        if options["event_ids"]:
+            replayed = PaymentEvent.objects.filter(
+                event_id__in=options["event_ids"]
+            ).update(status=PaymentEvent.StatusChoices.PENDING)
+            self.stdout.write(f"Replaying {replayed} events by id")
+
+        if options["file"]:
+            received = store_events(self.read_events(options["file"]))
+            self.stdout.write(f"Backfilled {received} events")
+
+        report = process_payment_events()
+        self.stdout.write(
+            f"Processed {report['events']} events, "
+            f"{report['paid']} payments paid"
+        )
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.3 on 2026-10-18 07:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="payment",
+            options={"ordering": ["-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["borrowing_id", "status", "type"],
+                name="payment_borrowing_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["status", "type", "-id"], name="payment_status_type_idx"
+            ),
+        ),
+    ]
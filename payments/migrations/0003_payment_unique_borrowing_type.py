@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payments", "0002_payment_indexes"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="payment",
+            constraint=models.UniqueConstraint(
+                fields=("borrowing_id", "type"), name="payment_unique_borrowing_type"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:15
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Cast, Coalesce, Now
+
+
+def backfill_paid_at(apps, schema_editor) -> None:
+    """Paid payments count as paid when their book was returned"""
+    Payment = apps.get_model("payments", "Payment")
+    Borrowing = apps.get_model("borrowings", "Borrowing")
+    returned_at = Borrowing.objects.filter(
+        pk=OuterRef("borrowing_id")
+    ).values("actual_return_date")
+    Payment.objects.filter(status="Paid", paid_at__isnull=True).update(
+        paid_at=Coalesce(
+            Cast(Subquery(returned_at), models.DateTimeField()), Now()
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payments", "0004_payment_events"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payment",
+            name="paid_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_paid_at, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,39 @@
+import datetime
+from decimal import Decimal
+from typing import Iterable
+
 from django.db import models
 
 from borrowings.models import Borrowing
 
+MAX_TO_PAY = Decimal("9999.99")
+
+
+def rental_fee(borrowing: Borrowing, return_date: datetime.date) -> Decimal:
+    """Daily fee of the book for every borrowed day, at least one"""
+    days = max((return_date - borrowing.borrow_date).days, 1)
+
+    return min(days * borrowing.book.daily_fee, MAX_TO_PAY)
+
+
+class PaymentQuerySet(models.QuerySet):
+
+    def create_for_returns(
+            self,
+            borrowings: Iterable[Borrowing],
+            return_date: datetime.date,
+    ) -> list["Payment"]:
+        """Creates the pending rental payments with a single INSERT"""
+        return self.bulk_create(
+            self.model(
+                status=self.model.StatusChoices.PENDING,
+                type=self.model.TypeChoices.PAYMENT,
+                borrowing_id=borrowing,
+                to_pay=rental_fee(borrowing, return_date),
+            )
+            for borrowing in borrowings
+        )
+
 
 class Payment(models.Model):
 
@@ -23,9 +55,70 @@ class Payment(models.Model):
     session_url = models.CharField(max_length=1000, null=True, blank=True)
     session_id = models.CharField(max_length=1000, null=True, blank=True)
     to_pay = models.DecimalField(max_digits=6, decimal_places=2)
+    paid_at = models.DateTimeField(null=True, blank=True)
+
+    objects = PaymentQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            models.Index(
+                fields=["borrowing_id", "status", "type"],
+                name="payment_borrowing_status_idx",
+            ),
+            models.Index(
+                fields=["status", "type", "-id"],
+                name="payment_status_type_idx",
+            ),
+            models.Index(fields=["session_id"], name="payment_session_id_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["borrowing_id", "type"],
+                name="payment_unique_borrowing_type",
+            ),
+        ]
 
     def __str__(self) -> str:
         return (
             f"Borrowing ID: {self.borrowing_id}, "
             f"payment status: {self.status}"
         )
+
+
+class PaymentEvent(models.Model):
+    """
+    Provider webhook event stored once per event id and applied
+    to the payments of its checkout session by Celery
+    """
+
+    SESSION_COMPLETED = "checkout.session.completed"
+
+    class StatusChoices(models.TextChoices):
+        PENDING = "Pending"
+        PROCESSED = "Processed"
+
+    event_id = models.CharField(max_length=255, unique=True)
+    type = models.CharField(max_length=64)
+    session_id = models.CharField(max_length=1000)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=9,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status="Pending"),
+                name="payment_event_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Payment event {self.event_id}: {self.type}"
@@ -0,0 +1,112 @@
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+
+from library_app.http_client import (
+    ProcessSingleton,
+    RetryLater,
+    pooled_session,
+    with_retries,
+)
+from payments.models import Payment
+
+
+class PaymentProviderError(Exception):
+    pass
+
+
+class PaymentProvider:
+    """
+    Checkout API client retrying with backoff on 429, 5xx responses and
+    network errors. Every call for a payment carries the same idempotency
+    key, so retries and repeated tasks never open a second session for it.
+    """
+
+    def __init__(
+            self,
+            api_url: str,
+            api_key: str | None = None,
+            currency: str = "usd",
+            pool_size: int = 10,
+            timeout: float = 10,
+            max_retries: int = 3,
+            backoff: float = 0.5,
+            sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        self.api_url = api_url.rstrip("/")
+        self.currency = currency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.session = pooled_session(pool_size)
+
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    @staticmethod
+    def idempotency_key(payment: Payment) -> str:
+        return f"payment-{payment.id}"
+
+    def create_checkout_session(self, payment: Payment) -> dict:
+        """Returns the `id` and `url` of the checkout session"""
+        return self.post(
+            "/v1/checkout/sessions",
+            {
+                "amount": int(payment.to_pay * 100),
+                "currency": self.currency,
+                "reference": str(payment.id),
+            },
+            self.idempotency_key(payment),
+        )
+
+    def post(self, path: str, data: dict, idempotency_key: str) -> dict:
+        def attempt() -> dict:
+            response = self.session.post(
+                f"{self.api_url}{path}",
+                json=data,
+                headers={"Idempotency-Key": idempotency_key},
+                timeout=self.timeout,
+            )
+
+            if response.status_code == 429 or response.status_code >= 500:
+                raise RetryLater
+
+            if not response.ok:
+                raise PaymentProviderError(
+                    f"{path} failed with {response.status_code}: "
+                    f"{response.text}"
+                )
+
+            return response.json()
+
+        return with_retries(
+            attempt,
+            lambda: PaymentProviderError(
+                f"{path} failed after {self.max_retries} retries"
+            ),
+            self.max_retries,
+            self.backoff,
+            self.sleep,
+        )
+
+
+shared_provider = ProcessSingleton(
+    lambda: PaymentProvider(
+        api_url=settings.PAYMENT_PROVIDER_URL,
+        api_key=settings.PAYMENT_PROVIDER_API_KEY,
+        currency=settings.PAYMENT_CURRENCY,
+        timeout=settings.PAYMENT_PROVIDER_TIMEOUT,
+        max_retries=settings.PAYMENT_PROVIDER_MAX_RETRIES,
+    )
+)
+
+
+def get_provider() -> PaymentProvider:
+    """Returns the client shared by all the threads of this process"""
+    return shared_provider.get()
+
+
+def reset_provider() -> None:
+    shared_provider.reset()
@@ -0,0 +1,16 @@
+import datetime
+
+from django.dispatch import receiver
+
+from borrowings.signals import borrowings_returned
+from payments.models import Payment
+from payments.tasks import enqueue_payment_sessions
+
+
+@receiver(borrowings_returned)
+def charge_returned_borrowings(
+        borrowings: list, return_date: datetime.date, **kwargs
+) -> None:
+    """Creates the rental payments and opens their checkout sessions"""
+    payments = Payment.objects.create_for_returns(borrowings, return_date)
+    enqueue_payment_sessions([payment.id for payment in payments])
@@ -33,3 +33,18 @@ class PaymentDetailSerializer(PaymentSerializer):
             "session_id",
             "to_pay",
         )
+
+
+class PaymentFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(
+        choices=Payment.StatusChoices.choices, required=False
+    )
+    type = serializers.ChoiceField(
+        choices=Payment.TypeChoices.choices, required=False
+    )
+
+
+class PaymentEventSerializer(serializers.Serializer):
+    id = serializers.CharField(max_length=255)
+    type = serializers.CharField(max_length=64)
+    session_id = serializers.CharField(max_length=1000)
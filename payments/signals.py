@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent inside the transaction marking payments as paid with the type
+# and amount of each one as `payments`
+payments_paid = Signal()
@@ -0,0 +1,277 @@
+import datetime
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    DateField,
+    DecimalField,
+    Exists,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Value,
+)
+from django.db.models.functions import Cast, Least
+from django.utils import timezone
+
+from borrowings.models import Borrowing
+from payments.models import MAX_TO_PAY, Payment, PaymentEvent
+from payments.provider import PaymentProviderError, get_provider
+from payments.signals import payments_paid
+
+logger = logging.getLogger(__name__)
+
+
+class DaysBetween(Func):
+    """Whole days from the second date to the first one"""
+
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="CAST(julianday(%(expressions)s) AS integer)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function="DATEDIFF",
+            template="%(function)s(%(expressions)s)",
+            arg_joiner=", ",
+            **extra_context,
+        )
+
+
+def get_fines(today: datetime.date):
+    """
+    Open overdue borrowings without a paid fine, with the fine accrued
+    by today computed in the database
+    """
+    to_pay = Payment._meta.get_field("to_pay")
+
+    return (
+        Borrowing.objects
+        .filter(
+            actual_return_date__isnull=True,
+            expected_return_date__lt=today,
+        )
+        .filter(
+            ~Exists(
+                Payment.objects.filter(
+                    borrowing_id=OuterRef("pk"),
+                    type=Payment.TypeChoices.FINE,
+                    status=Payment.StatusChoices.PAID,
+                )
+            )
+        )
+        .annotate(
+            fine=Cast(
+                Least(
+                    DaysBetween(
+                        Value(today, output_field=DateField()),
+                        F("expected_return_date"),
+                    )
+                    * F("book__daily_fee")
+                    * Value(settings.FINE_MULTIPLIER),
+                    Value(MAX_TO_PAY),
+                    output_field=to_pay,
+                ),
+                DecimalField(
+                    max_digits=to_pay.max_digits,
+                    decimal_places=to_pay.decimal_places,
+                ),
+            )
+        )
+        .order_by("pk")
+        .values_list("pk", "fine")
+    )
+
+
+@shared_task
+def accrue_overdue_fines() -> dict:
+    """
+    Sets the pending fine of every open overdue borrowing to the days
+    overdue times the book daily fee and FINE_MULTIPLIER, capped to fit
+    the payment. Walks the borrowings by primary key in batches, each
+    one read with a single query and upserted with a single insert.
+    """
+    fines = get_fines(datetime.date.today())
+    report = {"fines": 0, "batches": 0}
+    last_id = 0
+
+    while batch := list(
+            fines.filter(pk__gt=last_id)[:settings.FINE_ACCRUAL_BATCH_SIZE]
+    ):
+        with transaction.atomic():
+            Payment.objects.bulk_create(
+                [
+                    Payment(
+                        borrowing_id_id=borrowing_id,
+                        type=Payment.TypeChoices.FINE,
+                        status=Payment.StatusChoices.PENDING,
+                        to_pay=fine,
+                    )
+                    for borrowing_id, fine in batch
+                ],
+                update_conflicts=True,
+                unique_fields=["borrowing_id", "type"],
+                update_fields=["to_pay"],
+            )
+
+        last_id = batch[-1][0]
+        report["fines"] += len(batch)
+        report["batches"] += 1
+
+    logger.info("Overdue fines accrued: %s", report)
+
+    return report
+
+
+@shared_task
+def create_payment_sessions(payment_ids: list[int]) -> dict:
+    """
+    Opens a checkout session for every pending rental payment of the list
+    which has none yet. A failed payment is left without a session
+    for create_missing_payment_sessions to retry.
+    """
+    provider = get_provider()
+    report = {"created": 0, "failed": 0}
+    payments = Payment.objects.filter(
+        id__in=payment_ids,
+        type=Payment.TypeChoices.PAYMENT,
+        status=Payment.StatusChoices.PENDING,
+        session_id__isnull=True,
+    ).only("id", "to_pay")
+
+    for payment in payments:
+        try:
+            session = provider.create_checkout_session(payment)
+        except PaymentProviderError:
+            logger.exception(
+                "Could not create a session for payment %s", payment.id
+            )
+            report["failed"] += 1
+            continue
+
+        report["created"] += Payment.objects.filter(
+            pk=payment.pk, session_id__isnull=True
+        ).update(session_id=session["id"], session_url=session["url"])
+
+    return report
+
+
+@shared_task
+def create_missing_payment_sessions() -> dict:
+    """Retries the pending rental payments which still have no session"""
+    payment_ids = list(
+        Payment.objects.filter(
+            type=Payment.TypeChoices.PAYMENT,
+            status=Payment.StatusChoices.PENDING,
+            session_id__isnull=True,
+        )
+        .order_by("id")
+        .values_list("id", flat=True)
+        [:settings.PAYMENT_SESSIONS_BATCH_SIZE]
+    )
+
+    return create_payment_sessions(payment_ids)
+
+
+def enqueue_payment_sessions(payment_ids: list[int]) -> None:
+    """
+    Queues the session creation once the payments are committed,
+    the request does not wait for the provider
+    """
+
+    def enqueue() -> None:
+        try:
+            create_payment_sessions.delay(payment_ids)
+        except Exception:
+            logger.exception("Could not queue payment sessions")
+
+    if payment_ids:
+        transaction.on_commit(enqueue)
+
+
+@shared_task
+def process_payment_events() -> dict:
+    """
+    Applies the pending webhook events in batches, each one marking
+    the payments of all its completed sessions as paid with a single
+    UPDATE and adding them to the monthly revenue. Workers running
+    at the same time take different events.
+    """
+    report = {"events": 0, "paid": 0}
+
+    while True:
+        with transaction.atomic():
+            events = list(
+                PaymentEvent.objects
+                .select_for_update(skip_locked=True)
+                .filter(status=PaymentEvent.StatusChoices.PENDING)
+                .values_list("id", "type", "session_id")
+                [:settings.PAYMENT_EVENTS_BATCH_SIZE]
+            )
+
+            if not events:
+                break
+
+            paid = list(
+                Payment.objects
+                .select_for_update()
+                .filter(
+                    session_id__in={
+                        session_id
+                        for _, event_type, session_id in events
+                        if event_type == PaymentEvent.SESSION_COMPLETED
+                    },
+                    status=Payment.StatusChoices.PENDING,
+                )
+                .values_list("id", "type", "to_pay")
+            )
+            Payment.objects.filter(
+                id__in=[payment_id for payment_id, _, _ in paid]
+            ).update(
+                status=Payment.StatusChoices.PAID, paid_at=timezone.now()
+            )
+            payments_paid.send(
+                sender=Payment,
+                payments=[
+                    (payment_type, to_pay) for _, payment_type, to_pay in paid
+                ],
+            )
+            PaymentEvent.objects.filter(
+                id__in=[event_id for event_id, _, _ in events]
+            ).update(
+                status=PaymentEvent.StatusChoices.PROCESSED,
+                processed_at=timezone.now(),
+            )
+
+        report["events"] += len(events)
+        report["paid"] += len(paid)
+
+    logger.info("Payment events processed: %s", report)
+
+    return report
+
+
+def enqueue_payment_events() -> None:
+    """Queues the processing of the stored events once they are committed"""
+
+    def enqueue() -> None:
+        try:
+            process_payment_events.delay()
+        except Exception:
+            logger.exception("Could not queue payment events processing")
+
+    transaction.on_commit(enqueue)
@@ -0,0 +1,105 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.models import Payment
+from payments.tasks import accrue_overdue_fines
+
+
+def days_ago(days: int) -> datetime.date:
+    return datetime.date.today() - datetime.timedelta(days=days)
+
+
+@override_settings(FINE_MULTIPLIER=Decimal("2"))
+class AccrueOverdueFinesTests(TestCase):
+    def setUp(self) -> None:
+        self.book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=7,
+            daily_fee=Decimal("0.12"),
+        )
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "TestPassword1"
+        )
+
+    def sample_borrowing(self, expected_return_date, **params) -> Borrowing:
+        return Borrowing.objects.create(
+            expected_return_date=expected_return_date,
+            book=self.book,
+            user=self.user,
+            **params,
+        )
+
+    def fines(self) -> dict[int, Decimal]:
+        return dict(
+            Payment.objects.filter(
+                type=Payment.TypeChoices.FINE,
+                status=Payment.StatusChoices.PENDING,
+            ).values_list("borrowing_id", "to_pay")
+        )
+
+    def test_fine_is_days_overdue_times_fee_and_multiplier(self):
+        borrowing = self.sample_borrowing(days_ago(10))
+
+        report = accrue_overdue_fines()
+
+        self.assertEqual(report, {"fines": 1, "batches": 1})
+        self.assertEqual(self.fines(), {borrowing.id: Decimal("2.40")})
+
+    def test_existing_pending_fine_is_updated(self):
+        borrowing = self.sample_borrowing(days_ago(3))
+        Payment.objects.create(
+            borrowing_id=borrowing,
+            type=Payment.TypeChoices.FINE,
+            status=Payment.StatusChoices.PENDING,
+            to_pay=Decimal("0.24"),
+        )
+
+        accrue_overdue_fines()
+        accrue_overdue_fines()
+
+        self.assertEqual(self.fines(), {borrowing.id: Decimal("0.72")})
+
+    def test_skips_returned_not_yet_due_and_paid_borrowings(self):
+        self.sample_borrowing(days_ago(5), actual_return_date=days_ago(1))
+        self.sample_borrowing(datetime.date.today())
+        paid = self.sample_borrowing(days_ago(5))
+        Payment.objects.create(
+            borrowing_id=paid,
+            type=Payment.TypeChoices.FINE,
+            status=Payment.StatusChoices.PAID,
+            to_pay=Decimal("1.00"),
+        )
+
+        self.assertEqual(accrue_overdue_fines()["fines"], 0)
+        self.assertEqual(
+            Payment.objects.get(borrowing_id=paid).to_pay, Decimal("1.00")
+        )
+
+    def test_fine_is_capped(self):
+        self.book.daily_fee = Decimal("999.99")
+        self.book.save()
+        borrowing = self.sample_borrowing(days_ago(100))
+
+        accrue_overdue_fines()
+
+        self.assertEqual(self.fines(), {borrowing.id: Decimal("9999.99")})
+
+    @override_settings(FINE_ACCRUAL_BATCH_SIZE=2)
+    def test_processes_borrowings_in_batches(self):
+        borrowings = [self.sample_borrowing(days_ago(1)) for _ in range(5)]
+
+        with self.assertNumQueries(3 * 4 + 1):
+            report = accrue_overdue_fines()
+
+        self.assertEqual(report, {"fines": 5, "batches": 3})
+        self.assertEqual(
+            self.fines(),
+            {borrowing.id: Decimal("0.24") for borrowing in borrowings},
+        )
@@ -0,0 +1,124 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from library_app.tests.query_budget import QueryBudgetMixin
+from payments.models import Payment
+
+PAYMENT_LIST_URL = reverse("payments:payment-list")
+
+
+def detail_url(payment_id: int) -> str:
+    return reverse("payments:payment-detail", args=[payment_id])
+
+
+class PaymentApiTests(QueryBudgetMixin, TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@standard.com", "PassWoorD1"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@standard.com", "PassWoorD1"
+        )
+        self.admin = get_user_model().objects.create_user(
+            "test@admin.com", "PassWoorD1", is_staff=True
+        )
+        self.book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=100,
+            daily_fee=Decimal("0.12"),
+        )
+        self.payment = self.sample_payment(self.user)
+        self.fine = self.sample_payment(
+            self.user, type=Payment.TypeChoices.FINE
+        )
+        self.other_payment = self.sample_payment(
+            self.other_user, status=Payment.StatusChoices.PAID
+        )
+
+    def sample_payment(self, user, **params) -> Payment:
+        borrowing = Borrowing.objects.create(
+            book=self.book,
+            user=user,
+            expected_return_date=(
+                datetime.date.today() + datetime.timedelta(days=7)
+            ),
+        )
+        defaults = {
+            "status": Payment.StatusChoices.PENDING,
+            "type": Payment.TypeChoices.PAYMENT,
+            "borrowing_id": borrowing,
+            "to_pay": Decimal("0.84"),
+        }
+        defaults.update(params)
+        return Payment.objects.create(**defaults)
+
+    def list_ids(self, user, params=None) -> list[int]:
+        self.client.force_authenticate(user)
+        response = self.client.get(PAYMENT_LIST_URL, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return [payment["id"] for payment in response.data["results"]]
+
+    def test_users_see_only_their_payments(self):
+        self.assertEqual(
+            self.list_ids(self.user), [self.fine.id, self.payment.id]
+        )
+
+    def test_admin_sees_all_payments(self):
+        self.assertEqual(
+            self.list_ids(self.admin),
+            [self.other_payment.id, self.fine.id, self.payment.id],
+        )
+
+    def test_filter_by_status_and_type(self):
+        self.assertEqual(
+            self.list_ids(self.admin, {"status": "Paid"}),
+            [self.other_payment.id],
+        )
+        self.assertEqual(
+            self.list_ids(self.user, {"type": "Fine", "status": "Pending"}),
+            [self.fine.id],
+        )
+
+    def test_invalid_filter_value(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(PAYMENT_LIST_URL, {"status": "Lost"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_users_payment_not_found(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(detail_url(self.other_payment.id))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_detail_loads_borrowing_in_one_query(self):
+        self.client.force_authenticate(self.user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(detail_url(self.payment.id))
+
+        self.assertEqual(response.data["borrowing_id"]["book"], "Shantaram")
+
+    def test_constant_queries_per_page(self):
+        self.client.force_authenticate(self.user)
+
+        self.assertQueryBudget(
+            lambda: self.client.get(PAYMENT_LIST_URL, {"page_size": 100}),
+            lambda number: [
+                self.sample_payment(self.user) for _ in range(number)
+            ],
+            budget=3,
+        )
@@ -0,0 +1,258 @@
+import datetime
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.fake_server import FakePaymentProviderServer
+from payments.models import Payment
+from payments.provider import (
+    PaymentProvider,
+    PaymentProviderError,
+    reset_provider,
+)
+from payments.tasks import create_missing_payment_sessions
+
+BORROWING_BULK_RETURN_URL = reverse("borrowings:borrowing-bulk-return")
+
+
+def return_url(borrowing_id: int) -> str:
+    return reverse("borrowings:borrowing-return-book", args=[borrowing_id])
+
+
+class ReturnPaymentTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "test@admin.com", "TestPassword1", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=5,
+            daily_fee=Decimal("0.12"),
+        )
+
+    def sample_borrowing(self, days_ago: int = 0) -> Borrowing:
+        borrowing = Borrowing.objects.create(
+            book=self.book,
+            user=self.admin,
+            expected_return_date=(
+                datetime.date.today() + datetime.timedelta(days=5)
+            ),
+        )
+        Borrowing.objects.filter(pk=borrowing.pk).update(
+            borrow_date=(
+                datetime.date.today() - datetime.timedelta(days=days_ago)
+            )
+        )
+
+        return borrowing
+
+    def test_return_creates_payment_for_borrowed_days(self):
+        borrowing = self.sample_borrowing(days_ago=5)
+
+        with patch(
+            "payments.tasks.create_payment_sessions.delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                return_url(borrowing.id),
+                {"actual_return_date": datetime.date.today()},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payment = Payment.objects.get(borrowing_id=borrowing)
+        self.assertEqual(payment.type, Payment.TypeChoices.PAYMENT)
+        self.assertEqual(payment.status, Payment.StatusChoices.PENDING)
+        self.assertEqual(payment.to_pay, Decimal("0.60"))
+        delay.assert_called_once_with([payment.id])
+
+    def test_same_day_return_pays_one_day(self):
+        borrowing = self.sample_borrowing()
+
+        self.client.post(
+            return_url(borrowing.id),
+            {"actual_return_date": datetime.date.today()},
+            format="json",
+        )
+
+        self.assertEqual(
+            Payment.objects.get(borrowing_id=borrowing).to_pay,
+            Decimal("0.12"),
+        )
+
+    def test_bulk_return_creates_payments_at_once(self):
+        borrowings = [self.sample_borrowing(days_ago=2) for _ in range(3)]
+
+        with patch(
+            "payments.tasks.create_payment_sessions.delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                BORROWING_BULK_RETURN_URL,
+                {"ids": [borrowing.id for borrowing in borrowings]},
+                format="json",
+            )
+
+        payments = Payment.objects.order_by("id")
+        self.assertEqual(
+            [payment.to_pay for payment in payments], [Decimal("0.24")] * 3
+        )
+        delay.assert_called_once_with([payment.id for payment in payments])
+
+    def test_return_does_not_wait_for_slow_provider(self):
+        borrowing = self.sample_borrowing()
+
+        with FakePaymentProviderServer(delay=1) as server, override_settings(
+            PAYMENT_PROVIDER_URL=server.url
+        ), patch(
+            "payments.tasks.create_payment_sessions.delay"
+        ), self.captureOnCommitCallbacks(execute=True):
+            started = time.monotonic()
+            response = self.client.post(
+                return_url(borrowing.id),
+                {"actual_return_date": datetime.date.today()},
+                format="json",
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLess(time.monotonic() - started, 0.5)
+            self.assertEqual(server.requests, [])
+
+
+class PaymentSessionTaskTests(TestCase):
+    def setUp(self) -> None:
+        reset_provider()
+        self.addCleanup(reset_provider)
+        book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=5,
+            daily_fee=Decimal("0.12"),
+        )
+        user = get_user_model().objects.create_user(
+            "test@test.com", "TestPassword1"
+        )
+        borrowing = Borrowing.objects.create(
+            book=book,
+            user=user,
+            expected_return_date=(
+                datetime.date.today() + datetime.timedelta(days=5)
+            ),
+        )
+        self.payment = Payment.objects.create(
+            status=Payment.StatusChoices.PENDING,
+            type=Payment.TypeChoices.PAYMENT,
+            borrowing_id=borrowing,
+            to_pay=Decimal("1.20"),
+        )
+        self.fine = Payment.objects.create(
+            status=Payment.StatusChoices.PENDING,
+            type=Payment.TypeChoices.FINE,
+            borrowing_id=borrowing,
+            to_pay=Decimal("0.24"),
+        )
+
+    def run_task(self, server: FakePaymentProviderServer) -> dict:
+        with override_settings(PAYMENT_PROVIDER_URL=server.url):
+            return create_missing_payment_sessions()
+
+    def test_creates_session_for_pending_payments(self):
+        with FakePaymentProviderServer() as server:
+            report = self.run_task(server)
+
+        self.payment.refresh_from_db()
+        self.assertEqual(report, {"created": 1, "failed": 0})
+        self.assertEqual(self.payment.session_id, "cs_test_1")
+        self.assertEqual(
+            self.payment.session_url, f"{server.url}/pay/cs_test_1"
+        )
+        self.assertEqual(
+            server.requests,
+            [
+                {
+                    "key": f"payment-{self.payment.id}",
+                    "amount": 120,
+                    "currency": "usd",
+                    "reference": str(self.payment.id),
+                }
+            ],
+        )
+
+    def test_payment_with_session_is_skipped(self):
+        with FakePaymentProviderServer() as server:
+            self.run_task(server)
+            report = self.run_task(server)
+
+        self.assertEqual(report, {"created": 0, "failed": 0})
+        self.assertEqual(len(server.requests), 1)
+
+    def test_failed_payment_is_left_for_retry(self):
+        with FakePaymentProviderServer() as server:
+            server.queue_response(400, {"error": "Invalid amount"})
+
+            with self.assertLogs("payments.tasks", "ERROR"):
+                report = self.run_task(server)
+
+        self.payment.refresh_from_db()
+        self.assertEqual(report, {"created": 0, "failed": 1})
+        self.assertIsNone(self.payment.session_id)
+
+
+class PaymentProviderTests(SimpleTestCase):
+    def test_retries_reuse_idempotency_key(self):
+        payment = Payment(id=7, to_pay=Decimal("0.60"))
+
+        with FakePaymentProviderServer() as server:
+            server.queue_response(500, {"error": "Unavailable"})
+            server.queue_response(429, {"error": "Slow down"})
+            provider = PaymentProvider(server.url, sleep=lambda delay: None)
+            session = provider.create_checkout_session(payment)
+            repeated = provider.create_checkout_session(payment)
+
+        self.assertEqual(session, repeated)
+        self.assertEqual(
+            {request["key"] for request in server.requests}, {"payment-7"}
+        )
+        self.assertEqual(len(server.sessions), 1)
+
+    def test_gives_up_on_timeouts(self):
+        with FakePaymentProviderServer(delay=0.3) as server:
+            provider = PaymentProvider(
+                server.url,
+                timeout=0.05,
+                max_retries=1,
+                sleep=lambda delay: None,
+            )
+
+            with self.assertRaises(PaymentProviderError):
+                provider.create_checkout_session(
+                    Payment(id=1, to_pay=Decimal("0.12"))
+                )
+
+    def test_no_sleep_after_last_attempt(self):
+        sleeps = []
+
+        with FakePaymentProviderServer() as server:
+            server.queue_response(500, {"error": "Unavailable"})
+            server.queue_response(500, {"error": "Unavailable"})
+            provider = PaymentProvider(
+                server.url, max_retries=1, sleep=sleeps.append
+            )
+
+            with self.assertRaises(PaymentProviderError):
+                provider.create_checkout_session(
+                    Payment(id=1, to_pay=Decimal("0.12"))
+                )
+
+        self.assertEqual(sleeps, [0.5])
@@ -0,0 +1,205 @@
+import datetime
+import json
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.models import Payment, PaymentEvent
+from payments.tasks import process_payment_events
+from payments.webhooks import SIGNATURE_HEADER, sign
+
+WEBHOOK_URL = reverse("payments:webhook")
+SECRET = "test-secret"
+
+
+def completed(event_id: str, session_id: str) -> dict:
+    return {
+        "id": event_id,
+        "type": PaymentEvent.SESSION_COMPLETED,
+        "session_id": session_id,
+    }
+
+
+@override_settings(PAYMENT_WEBHOOK_SECRET=SECRET)
+class PaymentWebhookApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def post(self, events, secret: str = SECRET):
+        body = json.dumps(events).encode()
+
+        return self.client.post(
+            WEBHOOK_URL,
+            body,
+            content_type="application/json",
+            headers={SIGNATURE_HEADER: sign(body, secret)},
+        )
+
+    def test_invalid_signature_rejected(self):
+        response = self.post(completed("evt_1", "cs_1"), secret="wrong")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(PaymentEvent.objects.exists())
+
+    @override_settings(PAYMENT_WEBHOOK_SECRET=None)
+    def test_rejected_without_configured_secret(self):
+        response = self.post(completed("evt_1", "cs_1"), secret="")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_single_event_stored_and_queued(self):
+        with patch(
+            "payments.tasks.process_payment_events.delay"
+        ) as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.post(completed("evt_1", "cs_1"))
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data, {"received": 1})
+        event = PaymentEvent.objects.get()
+        self.assertEqual(event.session_id, "cs_1")
+        self.assertEqual(event.status, PaymentEvent.StatusChoices.PENDING)
+        delay.assert_called_once_with()
+
+    def test_batch_deduplicated_by_event_id(self):
+        self.post(completed("evt_1", "cs_1"))
+
+        with self.assertNumQueries(1):
+            response = self.post(
+                [
+                    completed("evt_1", "cs_1"),
+                    completed("evt_2", "cs_2"),
+                    completed("evt_2", "cs_2"),
+                ]
+            )
+
+        self.assertEqual(response.data, {"received": 2})
+        self.assertEqual(
+            list(PaymentEvent.objects.values_list("event_id", flat=True)),
+            ["evt_1", "evt_2"],
+        )
+
+    @override_settings(PAYMENT_WEBHOOK_MAX_EVENTS=2)
+    def test_too_many_events_rejected(self):
+        response = self.post(
+            [completed(f"evt_{number}", "cs_1") for number in range(3)]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_event_rejects_batch(self):
+        response = self.post(
+            [completed("evt_1", "cs_1"), {"id": "evt_2", "type": "unknown"}]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PaymentEvent.objects.exists())
+
+
+class ProcessPaymentEventsTests(TestCase):
+    def setUp(self) -> None:
+        book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=5,
+            daily_fee=Decimal("0.12"),
+        )
+        user = get_user_model().objects.create_user(
+            "test@test.com", "TestPassword1"
+        )
+        self.payments = [
+            Payment.objects.create(
+                status=Payment.StatusChoices.PENDING,
+                type=Payment.TypeChoices.PAYMENT,
+                borrowing_id=Borrowing.objects.create(
+                    book=book,
+                    user=user,
+                    expected_return_date=(
+                        datetime.date.today() + datetime.timedelta(days=5)
+                    ),
+                ),
+                to_pay=Decimal("0.60"),
+                session_id=f"cs_{number}",
+            )
+            for number in range(3)
+        ]
+
+    def store(self, *events: dict) -> None:
+        PaymentEvent.objects.bulk_create(
+            PaymentEvent(
+                event_id=event["id"],
+                type=event["type"],
+                session_id=event["session_id"],
+                payload=event,
+            )
+            for event in events
+        )
+
+    def statuses(self) -> list[str]:
+        return list(
+            Payment.objects.order_by("id").values_list("status", flat=True)
+        )
+
+    def test_completed_sessions_paid_with_one_update(self):
+        self.store(
+            completed("evt_0", "cs_0"),
+            completed("evt_1", "cs_1"),
+            {
+                "id": "evt_2",
+                "type": "checkout.session.expired",
+                "session_id": "cs_2",
+            },
+        )
+
+        with self.assertNumQueries(9):
+            report = process_payment_events()
+
+        self.assertEqual(report, {"events": 3, "paid": 2})
+        self.assertEqual(self.statuses(), ["Paid", "Paid", "Pending"])
+        self.assertFalse(
+            PaymentEvent.objects.filter(
+                status=PaymentEvent.StatusChoices.PENDING
+            ).exists()
+        )
+
+    @override_settings(PAYMENT_EVENTS_BATCH_SIZE=2)
+    def test_events_processed_in_batches(self):
+        self.store(
+            *(
+                completed(f"evt_{number}", f"cs_{number}")
+                for number in range(3)
+            )
+        )
+
+        self.assertEqual(process_payment_events(), {"events": 3, "paid": 3})
+
+    def test_replay_by_event_id(self):
+        self.store(completed("evt_0", "cs_0"))
+        process_payment_events()
+        Payment.objects.update(status=Payment.StatusChoices.PENDING)
+
+        call_command(
+            "replay_payment_events", event_ids=["evt_0"], stdout=StringIO()
+        )
+
+        self.assertEqual(self.statuses(), ["Paid", "Pending", "Pending"])
+
+    def test_backfill_from_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as file:
+            file.write(json.dumps(completed("evt_1", "cs_1")) + "\n")
+            file.flush()
+            call_command(
+                "replay_payment_events", file=file.name, stdout=StringIO()
+            )
+
+        self.assertEqual(self.statuses(), ["Pending", "Paid", "Pending"])
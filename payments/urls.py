@@ -1,10 +1,13 @@
+from django.urls import path
 from rest_framework import routers
 
-from payments.views import PaymentViewSet
+from payments.views import PaymentViewSet, PaymentWebhookView
 
 app_name = "payments"
 
 router = routers.DefaultRouter()
 router.register("", PaymentViewSet, basename="payment")
 
-urlpatterns = [] + router.urls
+urlpatterns = [
+    path("webhook/", PaymentWebhookView.as_view(), name="webhook"),
+] + router.urls
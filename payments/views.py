@@ -1,16 +1,32 @@
-from typing import Type
+from typing import Any, Type
 
+from django.conf import settings
 from django.db.models import QuerySet
-from drf_spectacular.utils import extend_schema_view, extend_schema
-from rest_framework import mixins
-from rest_framework.permissions import IsAuthenticated
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter,
+)
+from rest_framework import mixins, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from library_app.pagination import Pagination
+from library_app.pagination import ApproximateCountPagination
 from payments.models import Payment
-from payments.serializers import PaymentSerializer, PaymentDetailSerializer
+from payments.serializers import (
+    PaymentDetailSerializer,
+    PaymentEventSerializer,
+    PaymentFilterSerializer,
+    PaymentSerializer,
+)
+from payments.tasks import enqueue_payment_events
+from payments.webhooks import SIGNATURE_HEADER, store_events, verify_signature
+from users.authentication import CachedJWTAuthentication
 
 
 # Only for documentation purposes (Swagger)
@@ -31,10 +47,10 @@ class PaymentViewSet(
     mixins.ListModelMixin,
     GenericViewSet
 ):
-    queryset = Payment.objects.select_related("borrowing_id")
+    queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
-    pagination_class = Pagination
-    authentication_classes = (JWTAuthentication,)
+    pagination_class = ApproximateCountPagination
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_serializer_class(self) -> Type[Serializer]:
@@ -49,6 +65,93 @@ class PaymentViewSet(
         queryset = self.queryset
 
         if not user.is_staff:
-            queryset.filter(borrowing_id__user=user)
+            queryset = queryset.filter(borrowing_id__user=user)
+
+        if self.action == "list":
+            queryset = self.filter_queryset_by_params(queryset)
+
+        if self.action == "retrieve":
+            queryset = queryset.select_related(
+                "borrowing_id__book", "borrowing_id__user"
+            )
 
         return queryset
+
+    def filter_queryset_by_params(
+            self, queryset: QuerySet[Payment]
+    ) -> QuerySet[Payment]:
+        filters = PaymentFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+
+        return queryset.filter(**filters.validated_data)
+
+    # Only for documentation purposes (Swagger)
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="status",
+                description="Filtering by status (ex. ?status=Pending).",
+                required=False,
+                type=str,
+                enum=Payment.StatusChoices.values,
+            ),
+            OpenApiParameter(
+                name="type",
+                description="Filtering by type (ex. ?type=Fine).",
+                required=False,
+                type=str,
+                enum=Payment.TypeChoices.values,
+            ),
+        ],
+    )
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().list(request, *args, **kwargs)
+
+
+# Only for documentation purposes (Swagger)
+@extend_schema(
+    description=(
+        "Endpoint for payment provider events, a single event or a list "
+        f"of them, signed with HMAC-SHA256 in the {SIGNATURE_HEADER} "
+        "header. Events are stored once per id and applied asynchronously."
+    ),
+    request=PaymentEventSerializer(many=True),
+    responses={202: None},
+)
+class PaymentWebhookView(APIView):
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+    throttle_classes = ()
+
+    def post(self, request: Request) -> Response:
+        if not verify_signature(
+                request.body,
+                request.headers.get(SIGNATURE_HEADER, ""),
+                settings.PAYMENT_WEBHOOK_SECRET,
+        ):
+            raise PermissionDenied("Invalid signature")
+
+        events = request.data
+
+        if not isinstance(events, list):
+            events = [events]
+
+        if len(events) > settings.PAYMENT_WEBHOOK_MAX_EVENTS:
+            raise ValidationError(
+                f"At most {settings.PAYMENT_WEBHOOK_MAX_EVENTS} events "
+                f"are accepted at once"
+            )
+
+        serializer = PaymentEventSerializer(data=events, many=True)
+        serializer.is_valid(raise_exception=True)
+        received = store_events(
+            [
+                {**event, **validated}
+                for event, validated in zip(events, serializer.validated_data)
+            ]
+        )
+        enqueue_payment_events()
+
+        return Response(
+            {"received": received}, status=status.HTTP_202_ACCEPTED
+        )
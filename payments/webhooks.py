@@ -0,0 +1,42 @@
+import hashlib
+import hmac
+
+from payments.models import PaymentEvent
+
+SIGNATURE_HEADER = "X-Payment-Signature"
+
+
+def sign(body: bytes, secret: str) -> str:
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+    return f"sha256={digest}"
+
+
+def verify_signature(body: bytes, signature: str, secret: str | None) -> bool:
+    """Without a configured secret no request is trusted"""
+    if not secret or not signature:
+        return False
+
+    return hmac.compare_digest(sign(body, secret), signature)
+
+
+def store_events(events: list[dict]) -> int:
+    """
+    Inserts the events with one INSERT, skipping the event ids already
+    stored, and returns the number of distinct events received
+    """
+    events = {event["id"]: event for event in events}
+    PaymentEvent.objects.bulk_create(
+        [
+            PaymentEvent(
+                event_id=event_id,
+                type=event["type"],
+                session_id=event["session_id"],
+                payload=event,
+            )
+            for event_id, event in events.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+    return len(events)
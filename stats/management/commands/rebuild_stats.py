@@ -0,0 +1,116 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.db.models import Count, QuerySet, Sum
+from django.db.models.functions import TruncMonth
+
+from borrowings.models import Borrowing
+from payments.models import Payment
+from stats.models import (
+    DailyBookBorrows,
+    DueDateOpenLoans,
+    MonthlyRevenue,
+    UserActiveLoans,
+)
+
+
+class Command(BaseCommand):
+    """
+    Recomputes every rollup table from the borrowings and payments
+    with one INSERT ... SELECT per table. On PostgreSQL the rollups
+    stay locked until the new rows are committed, so the deltas
+    applied meanwhile wait for them. A change committed just before
+    the rebuild whose delta is still pending is counted twice, so
+    rebuild while the library is quiet.
+    """
+
+    help = "Rebuild the stats rollup tables from scratch"
+
+    def rebuild(
+            self,
+            model: type[models.Model],
+            fields: tuple[str, ...],
+            queryset: QuerySet,
+    ) -> None:
+        """
+        `queryset` selects the values of `fields` in the same order,
+        model fields before annotations as Django emits them
+        """
+        started = time.perf_counter()
+        quote = connection.ops.quote_name
+        columns = ", ".join(
+            quote(model._meta.get_field(name).column) for name in fields
+        )
+        sql, params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {quote(model._meta.db_table)}")
+            cursor.execute(
+                f"INSERT INTO {quote(model._meta.db_table)} ({columns}) "
+                f"{sql}",
+                params,
+            )
+            rows = cursor.rowcount
+
+        self.stdout.write(
+            f"{model._meta.db_table}: {rows} rows in "
+            f"{time.perf_counter() - started:.1f}s"
+        )
+
+    def handle(self, *args, **options) -> None:
+        open_borrowings = Borrowing.objects.filter(
+            actual_return_date__isnull=True
+        ).order_by()
+        rollups = (
+            (
+                DailyBookBorrows,
+                ("book", "date", "borrowings"),
+                Borrowing.objects.order_by()
+                .values("book", "borrow_date")
+                .annotate(borrowings=Count("id")),
+            ),
+            (
+                UserActiveLoans,
+                ("user", "loans"),
+                open_borrowings.values("user").annotate(loans=Count("id")),
+            ),
+            (
+                DueDateOpenLoans,
+                ("due_date", "loans"),
+                open_borrowings.values("expected_return_date").annotate(
+                    loans=Count("id")
+                ),
+            ),
+            (
+                MonthlyRevenue,
+                ("type", "month", "payments", "amount"),
+                Payment.objects.filter(
+                    status=Payment.StatusChoices.PAID,
+                    paid_at__isnull=False,
+                )
+                .order_by()
+                .annotate(
+                    month=TruncMonth(
+                        "paid_at", output_field=models.DateField()
+                    )
+                )
+                .values("type", "month")
+                .annotate(payments=Count("id"), amount=Sum("to_pay")),
+            ),
+        )
+
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "LOCK TABLE "
+                        + ", ".join(
+                            connection.ops.quote_name(model._meta.db_table)
+                            for model, _, _ in rollups
+                        )
+                        + " IN EXCLUSIVE MODE"
+                    )
+
+            for model, fields, queryset in rollups:
+                self.rebuild(model, fields, queryset)
@@ -0,0 +1,112 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("books", "0005_book_copies"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyBookBorrows",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("borrowings", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DueDateOpenLoans",
+            fields=[
+                ("due_date", models.DateField(primary_key=True, serialize=False)),
+                ("loans", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="MonthlyRevenue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[("Payment", "Payment"), ("Fine", "Fine")], max_length=7
+                    ),
+                ),
+                ("payments", models.IntegerField(default=0)),
+                (
+                    "amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="UserActiveLoans",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("loans", models.IntegerField(default=0)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["-loans"], name="user_active_loans_idx")
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="monthlyrevenue",
+            constraint=models.UniqueConstraint(
+                fields=("month", "type"), name="monthly_revenue_unique"
+            ),
+        ),
+        migrations.AddField(
+            model_name="dailybookborrows",
+            name="book",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="books.book",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dailybookborrows",
+            index=models.Index(fields=["date"], name="daily_book_borrows_date_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="dailybookborrows",
+            constraint=models.UniqueConstraint(
+                fields=("book", "date"), name="daily_book_borrows_unique"
+            ),
+        ),
+    ]
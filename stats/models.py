@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.db import models
+
+from books.models import Book
+from payments.models import Payment
+
+
+class DailyBookBorrows(models.Model):
+    """Borrowings of a book made on a day"""
+
+    book = models.ForeignKey(
+        to=Book, on_delete=models.CASCADE, related_name="+"
+    )
+    date = models.DateField()
+    borrowings = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["book", "date"], name="daily_book_borrows_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="daily_book_borrows_date_idx"),
+        ]
+
+
+class UserActiveLoans(models.Model):
+    """Borrowings of a user which are not returned yet"""
+
+    user = models.OneToOneField(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    loans = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-loans"], name="user_active_loans_idx"),
+        ]
+
+
+class DueDateOpenLoans(models.Model):
+    """Borrowings expected back on a day which are not returned yet"""
+
+    due_date = models.DateField(primary_key=True)
+    loans = models.IntegerField(default=0)
+
+
+class MonthlyRevenue(models.Model):
+    """Payments of a type paid within a month"""
+
+    month = models.DateField()
+    type = models.CharField(
+        max_length=7, choices=Payment.TypeChoices.choices
+    )
+    payments = models.IntegerField(default=0)
+    amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "type"], name="monthly_revenue_unique"
+            ),
+        ]
@@ -0,0 +1,113 @@
+import datetime
+from collections import Counter
+from decimal import Decimal
+from typing import Iterable
+
+from django.db import connection, models
+from django.utils import timezone
+
+from stats.models import (
+    DailyBookBorrows,
+    DueDateOpenLoans,
+    MonthlyRevenue,
+    UserActiveLoans,
+)
+
+
+def increment(
+        model: type[models.Model],
+        key_fields: tuple[str, ...],
+        value_fields: tuple[str, ...],
+        rows: dict[tuple, tuple],
+) -> None:
+    """
+    Adds the values to the rollup rows of their keys with a single
+    INSERT ... ON CONFLICT DO UPDATE, creating the missing rows.
+    Rows are written in key order, so concurrent writers lock them
+    in the same order and do not deadlock.
+    """
+    if not rows:
+        return
+
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    keys = [quote(model._meta.get_field(name).column) for name in key_fields]
+    values = [
+        quote(model._meta.get_field(name).column) for name in value_fields
+    ]
+    placeholders = "(" + ", ".join(["%s"] * (len(keys) + len(values))) + ")"
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(keys + values)}) "
+            f"VALUES {', '.join([placeholders] * len(rows))} "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+            + ", ".join(
+                f"{column} = {table}.{column} + EXCLUDED.{column}"
+                for column in values
+            ),
+            [
+                param
+                for key in sorted(rows)
+                for param in (*key, *rows[key])
+            ],
+        )
+
+
+def counts(keys: Iterable[tuple], sign: int = 1) -> dict[tuple, tuple]:
+    return {key: (sign * count,) for key, count in Counter(keys).items()}
+
+
+def record_borrowings(borrowings: list) -> None:
+    """Counts new borrowings in the daily, user and due date rollups"""
+    increment(
+        DailyBookBorrows,
+        ("book", "date"),
+        ("borrowings",),
+        counts(
+            (borrowing.book_id, borrowing.borrow_date)
+            for borrowing in borrowings
+        ),
+    )
+    record_open_loans(borrowings, 1)
+
+
+def record_returns(borrowings: list) -> None:
+    """Removes returned borrowings from the open loan rollups"""
+    record_open_loans(borrowings, -1)
+
+
+def record_open_loans(borrowings: list, sign: int) -> None:
+    increment(
+        UserActiveLoans,
+        ("user",),
+        ("loans",),
+        counts(((borrowing.user_id,) for borrowing in borrowings), sign),
+    )
+    increment(
+        DueDateOpenLoans,
+        ("due_date",),
+        ("loans",),
+        counts(
+            ((borrowing.expected_return_date,) for borrowing in borrowings),
+            sign,
+        ),
+    )
+
+
+def record_paid(payments: Iterable[tuple[str, Decimal]]) -> None:
+    """Adds payments paid now, given by type and amount, to the revenue"""
+    month = timezone.localdate().replace(day=1)
+    rows = {}
+
+    for payment_type, amount in payments:
+        number, total = rows.get((month, payment_type), (0, Decimal(0)))
+        rows[(month, payment_type)] = (number + 1, total + amount)
+
+    increment(MonthlyRevenue, ("month", "type"), ("payments", "amount"), rows)
+
+
+def month_start(date: datetime.date, months_back: int = 0) -> datetime.date:
+    month = date.year * 12 + date.month - 1 - months_back
+
+    return datetime.date(month // 12, month % 12 + 1, 1)
@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class StatsFilterSerializer(serializers.Serializer):
+    days = serializers.IntegerField(min_value=1, max_value=365, default=30)
+    months = serializers.IntegerField(min_value=1, max_value=36, default=12)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
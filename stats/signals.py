@@ -0,0 +1,44 @@
+import logging
+from typing import Any, Callable
+
+from django.db import transaction
+from django.dispatch import receiver
+
+from borrowings.signals import borrowings_created, borrowings_returned
+from payments.signals import payments_paid
+from stats.rollups import record_borrowings, record_paid, record_returns
+
+logger = logging.getLogger(__name__)
+
+
+def after_commit(record: Callable[[list], Any], rows: list) -> None:
+    """
+    Applies the deltas once the change is committed, so the shared
+    rollup rows are locked for a single statement instead of the whole
+    request. Deltas lost to a crash in between are restored by
+    the rebuild_stats command.
+    """
+
+    def apply() -> None:
+        try:
+            record(rows)
+        except Exception:
+            logger.exception("Could not update the stats rollups")
+
+    if rows:
+        transaction.on_commit(apply)
+
+
+@receiver(borrowings_created)
+def count_borrowings(borrowings: list, **kwargs) -> None:
+    after_commit(record_borrowings, borrowings)
+
+
+@receiver(borrowings_returned)
+def close_loans(borrowings: list, **kwargs) -> None:
+    after_commit(record_returns, borrowings)
+
+
+@receiver(payments_paid)
+def add_revenue(payments: list, **kwargs) -> None:
+    after_commit(record_paid, payments)
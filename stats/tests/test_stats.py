@@ -0,0 +1,400 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from library_app.tests.query_budget import QueryBudgetMixin
+from payments.models import Payment, PaymentEvent
+from payments.tasks import process_payment_events
+from stats.models import (
+    DailyBookBorrows,
+    DueDateOpenLoans,
+    MonthlyRevenue,
+    UserActiveLoans,
+)
+
+BORROWING_LIST_URL = reverse("borrowings:borrowing-list")
+BORROWING_BULK_URL = reverse("borrowings:borrowing-bulk-create")
+BORROWING_BULK_RETURN_URL = reverse("borrowings:borrowing-bulk-return")
+STATS_BOOKS_URL = reverse("stats:stats-books")
+STATS_LOANS_URL = reverse("stats:stats-loans")
+STATS_REVENUE_URL = reverse("stats:stats-revenue")
+
+TODAY = datetime.date.today()
+
+
+def return_url(borrowing_id: int) -> str:
+    return reverse("borrowings:borrowing-return-book", args=[borrowing_id])
+
+
+def sample_book(**params) -> Book:
+    defaults = {
+        "title": "Shantaram",
+        "author": "Gregory David Roberts",
+        "cover": Book.CoverChoices.SOFT,
+        "inventory": 5,
+        "copies": 5,
+        "daily_fee": Decimal("0.10"),
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+def rollups() -> dict:
+    return {
+        "books": sorted(
+            DailyBookBorrows.objects.filter(borrowings__gt=0).values_list(
+                "book_id", "date", "borrowings"
+            )
+        ),
+        "users": sorted(
+            UserActiveLoans.objects.filter(loans__gt=0).values_list(
+                "user_id", "loans"
+            )
+        ),
+        "due_dates": sorted(
+            DueDateOpenLoans.objects.filter(loans__gt=0).values_list(
+                "due_date", "loans"
+            )
+        ),
+        "revenue": sorted(
+            MonthlyRevenue.objects.values_list(
+                "month", "type", "payments", "amount"
+            )
+        ),
+    }
+
+
+class StatsRollupTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@library.com", "PassWoord1", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.book_1 = sample_book(title="Shantaram")
+        self.book_2 = sample_book(title="The Mountain Shadow")
+        self.due_date = TODAY + datetime.timedelta(days=7)
+
+    def post(self, url: str, data: dict) -> Response:
+        """Posts and applies the rollup deltas queued after commit"""
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, data, format="json")
+
+    def borrow(self, *books: Book) -> list[int]:
+        response = self.post(
+            BORROWING_BULK_URL,
+            {
+                "borrowings": [
+                    {"book": book.id, "expected_return_date": self.due_date}
+                    for book in books
+                ]
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        return [item["id"] for item in response.data["created"]]
+
+    def test_borrowings_counted(self):
+        self.borrow(self.book_1, self.book_1, self.book_2)
+        response = self.post(
+            BORROWING_LIST_URL,
+            {"book": self.book_2.id, "expected_return_date": self.due_date},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            rollups(),
+            {
+                "books": [
+                    (self.book_1.id, TODAY, 2),
+                    (self.book_2.id, TODAY, 2),
+                ],
+                "users": [(self.admin.id, 4)],
+                "due_dates": [(self.due_date, 4)],
+                "revenue": [],
+            },
+        )
+
+    def test_rollups_updated_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(
+                BORROWING_LIST_URL,
+                {
+                    "book": self.book_1.id,
+                    "expected_return_date": self.due_date,
+                },
+            )
+
+        self.assertEqual(rollups()["users"], [])
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(rollups()["users"], [(self.admin.id, 1)])
+
+    def test_returns_close_loans(self):
+        ids = self.borrow(self.book_1, self.book_1, self.book_2)
+
+        self.post(return_url(ids[0]), {"actual_return_date": TODAY})
+        self.post(BORROWING_BULK_RETURN_URL, {"ids": ids[1:]})
+
+        self.assertEqual(rollups()["users"], [])
+        self.assertEqual(rollups()["due_dates"], [])
+        self.assertEqual(len(rollups()["books"]), 2)
+
+    def test_paid_payments_added_to_revenue(self):
+        ids = self.borrow(self.book_1, self.book_2)
+        self.post(BORROWING_BULK_RETURN_URL, {"ids": ids})
+        Payment.objects.update(
+            session_id=Concat(Value("cs_"), "id", output_field=CharField())
+        )
+        PaymentEvent.objects.bulk_create(
+            PaymentEvent(
+                event_id=f"evt_{payment.id}",
+                type=PaymentEvent.SESSION_COMPLETED,
+                session_id=payment.session_id,
+                payload={},
+            )
+            for payment in Payment.objects.all()
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            process_payment_events()
+            process_payment_events()
+
+        self.assertEqual(
+            rollups()["revenue"],
+            [
+                (
+                    timezone.localdate().replace(day=1),
+                    Payment.TypeChoices.PAYMENT,
+                    2,
+                    Decimal("0.20"),
+                )
+            ],
+        )
+
+    def test_rebuild_matches_incremental_rollups(self):
+        ids = self.borrow(self.book_1, self.book_2, self.book_2)
+        self.post(return_url(ids[1]), {"actual_return_date": TODAY})
+        Payment.objects.update(
+            status=Payment.StatusChoices.PAID, paid_at=timezone.now()
+        )
+        MonthlyRevenue.objects.create(
+            month=timezone.localdate().replace(day=1),
+            type=Payment.TypeChoices.PAYMENT,
+            payments=1,
+            amount=Decimal("0.10"),
+        )
+        incremental = rollups()
+        DailyBookBorrows.objects.update(borrowings=100)
+        UserActiveLoans.objects.all().delete()
+
+        call_command("rebuild_stats", stdout=StringIO())
+
+        self.assertEqual(rollups(), incremental)
+
+
+class StatsApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@library.com", "PassWoord1", is_staff=True
+        )
+        self.user = get_user_model().objects.create_user(
+            "user@library.com", "PassWoord1"
+        )
+        self.client.force_authenticate(self.admin)
+        self.book_1 = sample_book(title="Shantaram")
+        self.book_2 = sample_book(title="The Mountain Shadow")
+
+    def test_stats_for_standard_users_forbidden(self):
+        self.client.force_authenticate(self.user)
+
+        for url in (STATS_BOOKS_URL, STATS_LOANS_URL, STATS_REVENUE_URL):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_most_borrowed_books_within_days(self):
+        DailyBookBorrows.objects.bulk_create(
+            [
+                DailyBookBorrows(book=self.book_1, date=TODAY, borrowings=2),
+                DailyBookBorrows(
+                    book=self.book_2,
+                    date=TODAY - datetime.timedelta(days=1),
+                    borrowings=3,
+                ),
+                DailyBookBorrows(
+                    book=self.book_1,
+                    date=TODAY - datetime.timedelta(days=7),
+                    borrowings=5,
+                ),
+            ]
+        )
+
+        response = self.client.get(STATS_BOOKS_URL, {"days": 7})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["books"],
+            [
+                {
+                    "book_id": self.book_2.id,
+                    "borrowings": 3,
+                    "title": "The Mountain Shadow",
+                },
+                {
+                    "book_id": self.book_1.id,
+                    "borrowings": 2,
+                    "title": "Shantaram",
+                },
+            ],
+        )
+        self.assertEqual(
+            self.client.get(STATS_BOOKS_URL, {"limit": 1}).data["books"],
+            [
+                {
+                    "book_id": self.book_1.id,
+                    "borrowings": 7,
+                    "title": "Shantaram",
+                }
+            ],
+        )
+
+    def test_invalid_filters(self):
+        for params in ({"days": 0}, {"limit": 101}, {"months": "all"}):
+            response = self.client.get(STATS_BOOKS_URL, params)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_active_loans_and_overdue_rate(self):
+        DueDateOpenLoans.objects.bulk_create(
+            [
+                DueDateOpenLoans(
+                    due_date=TODAY - datetime.timedelta(days=1), loans=1
+                ),
+                DueDateOpenLoans(due_date=TODAY, loans=3),
+                DueDateOpenLoans(
+                    due_date=TODAY - datetime.timedelta(days=2), loans=0
+                ),
+            ]
+        )
+        UserActiveLoans.objects.bulk_create(
+            [
+                UserActiveLoans(user=self.user, loans=3),
+                UserActiveLoans(user=self.admin, loans=1),
+            ]
+        )
+
+        response = self.client.get(STATS_LOANS_URL, {"limit": 1})
+
+        self.assertEqual(
+            response.data,
+            {
+                "active": 4,
+                "overdue": 1,
+                "overdue_rate": 0.25,
+                "users": [
+                    {
+                        "user_id": self.user.id,
+                        "email": "user@library.com",
+                        "loans": 3,
+                    }
+                ],
+            },
+        )
+
+    def test_loans_without_borrowings(self):
+        response = self.client.get(STATS_LOANS_URL)
+
+        self.assertEqual(
+            response.data,
+            {"active": 0, "overdue": 0, "overdue_rate": 0, "users": []},
+        )
+
+    def test_revenue_by_month(self):
+        month = TODAY.replace(day=1)
+        MonthlyRevenue.objects.bulk_create(
+            MonthlyRevenue(
+                month=date,
+                type=Payment.TypeChoices.PAYMENT,
+                payments=1,
+                amount=Decimal("1.50"),
+            )
+            for date in (
+                month,
+                (month - datetime.timedelta(days=1)).replace(day=1),
+                month.replace(year=month.year - 1),
+            )
+        )
+
+        response = self.client.get(STATS_REVENUE_URL, {"months": 2})
+
+        self.assertEqual(
+            [row["month"] for row in response.data["months"]],
+            [(month - datetime.timedelta(days=1)).replace(day=1), month],
+        )
+
+
+class StatsQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.sequence = count()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@library.com", "PassWoord1", is_staff=True
+            )
+        )
+
+    def seed(self, number: int) -> None:
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Book {next(self.sequence)}",
+                author="Author",
+                cover=Book.CoverChoices.SOFT,
+                inventory=3,
+                copies=3,
+                daily_fee=Decimal("0.10"),
+            )
+            for _ in range(number)
+        )
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"reader{next(self.sequence)}@library.com")
+            for _ in range(number)
+        )
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                book=book,
+                user=user,
+                expected_return_date=TODAY + datetime.timedelta(days=7),
+            )
+            for book, user in zip(books, users)
+        )
+        call_command("rebuild_stats", stdout=StringIO())
+
+    def test_stats_endpoints(self):
+        for url, budget in (
+                (STATS_BOOKS_URL, 2),
+                (STATS_LOANS_URL, 2),
+                (STATS_REVENUE_URL, 1),
+        ):
+            with self.subTest(url=url):
+                self.assertQueryBudget(
+                    lambda: self.client.get(url), self.seed, budget=budget
+                )
@@ -0,0 +1,10 @@
+from rest_framework import routers
+
+from stats.views import StatsViewSet
+
+app_name = "stats"
+
+router = routers.DefaultRouter()
+router.register("", StatsViewSet, basename="stats")
+
+urlpatterns = router.urls
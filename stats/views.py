@@ -0,0 +1,140 @@
+import datetime
+
+from django.db.models import F, Q, Sum
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from books.models import Book
+from stats.models import (
+    DailyBookBorrows,
+    DueDateOpenLoans,
+    MonthlyRevenue,
+    UserActiveLoans,
+)
+from stats.rollups import month_start
+from stats.serializers import StatsFilterSerializer
+from users.authentication import CachedJWTAuthentication
+
+
+def filter_parameter(name: str, description: str) -> OpenApiParameter:
+    return OpenApiParameter(
+        name=name, description=description, required=False, type=int
+    )
+
+
+class StatsViewSet(viewsets.ViewSet):
+    """
+    Library statistics for admin users. Every endpoint reads the stats
+    rollup tables, which are updated along with the borrowings and
+    payments, so the response time does not depend on the history size.
+    """
+
+    authentication_classes = (CachedJWTAuthentication,)
+    permission_classes = (IsAdminUser,)
+
+    def get_filters(self) -> dict:
+        filters = StatsFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+
+        return filters.validated_data
+
+    # Only for documentation purposes (Swagger)
+    @extend_schema(
+        description="Most borrowed books within the last days",
+        parameters=[
+            filter_parameter("days", "Days to count, 30 by default"),
+            filter_parameter("limit", "Number of books, 10 by default"),
+        ],
+    )
+    @action(detail=False)
+    def books(self, request: Request) -> Response:
+        filters = self.get_filters()
+        since = datetime.date.today() - datetime.timedelta(
+            days=filters["days"] - 1
+        )
+        books = list(
+            DailyBookBorrows.objects.filter(date__gte=since)
+            .values("book_id")
+            .annotate(borrowings=Sum("borrowings"))
+            .order_by("-borrowings", "book_id")[:filters["limit"]]
+        )
+        # Joined after ranking, so only the top books are looked up
+        titles = dict(
+            Book.objects.filter(
+                id__in=[book["book_id"] for book in books]
+            ).values_list("id", "title")
+        )
+
+        return Response(
+            {
+                "since": since,
+                "days": filters["days"],
+                "books": [
+                    {**book, "title": titles.get(book["book_id"])}
+                    for book in books
+                ],
+            }
+        )
+
+    # Only for documentation purposes (Swagger)
+    @extend_schema(
+        description=(
+            "Borrowings not returned yet, the share of them which is "
+            "overdue and the users with the most of them"
+        ),
+        parameters=[
+            filter_parameter("limit", "Number of users, 10 by default"),
+        ],
+    )
+    @action(detail=False)
+    def loans(self, request: Request) -> Response:
+        filters = self.get_filters()
+        loans = DueDateOpenLoans.objects.aggregate(
+            active=Sum("loans", default=0),
+            overdue=Sum(
+                "loans",
+                filter=Q(due_date__lt=datetime.date.today()),
+                default=0,
+            ),
+        )
+        users = (
+            UserActiveLoans.objects.filter(loans__gt=0)
+            .annotate(email=F("user__email"))
+            .values("user_id", "email", "loans")
+            .order_by("-loans", "user_id")[:filters["limit"]]
+        )
+
+        return Response(
+            {
+                **loans,
+                "overdue_rate": (
+                    round(loans["overdue"] / loans["active"], 4)
+                    if loans["active"] else 0
+                ),
+                "users": list(users),
+            }
+        )
+
+    # Only for documentation purposes (Swagger)
+    @extend_schema(
+        description="Paid payments and fines by month",
+        parameters=[
+            filter_parameter("months", "Months to show, 12 by default"),
+        ],
+    )
+    @action(detail=False)
+    def revenue(self, request: Request) -> Response:
+        filters = self.get_filters()
+        months = MonthlyRevenue.objects.filter(
+            month__gte=month_start(
+                datetime.date.today(), filters["months"] - 1
+            )
+        ).values("month", "type", "payments", "amount").order_by(
+            "month", "type"
+        )
+
+        return Response({"months": list(months)})
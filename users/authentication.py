@@ -0,0 +1,80 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from users.cache import TOKEN_USER_CLAIMS, local_users, user_cache_key
+
+
+def user_claims(user: Any) -> dict:
+    """Claims of the user carried by tokens and kept in the user cache"""
+    return {claim: getattr(user, claim) for claim in TOKEN_USER_CLAIMS}
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Resolves the user of a JWT from a short-lived process-local cache,
+    then from the Django cache and only then from the database.
+    Only the fields in TOKEN_USER_CLAIMS are cached, never the password
+    hash. With JWT_STATELESS_AUTH the user is built from the token claims
+    without any lookup: refreshing re-reads the user, so a deactivated
+    or demoted user keeps its old access for at most ACCESS_TOKEN_LIFETIME.
+    """
+
+    def get_user(self, validated_token: Token) -> Any:
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            )
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+
+        if settings.JWT_STATELESS_AUTH:
+            claims = {
+                claim: validated_token.get(claim)
+                for claim in TOKEN_USER_CLAIMS
+            }
+        else:
+            claims = self.get_cached_claims(validated_token)
+
+        if not claims["is_active"]:
+            raise AuthenticationFailed(
+                "User is inactive", code="user_inactive"
+            )
+
+        user = self.user_model(
+            **{api_settings.USER_ID_FIELD: user_id}, **claims
+        )
+        user._state.adding = False
+        user._state.db = DEFAULT_DB_ALIAS
+
+        return user
+
+    def get_cached_claims(self, validated_token: Token) -> dict:
+        user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        claims = local_users.get(user_id)
+
+        if claims is None:
+            claims = cache.get(user_cache_key(user_id))
+
+            if claims is None:
+                claims = user_claims(super().get_user(validated_token))
+                cache.set(
+                    user_cache_key(user_id),
+                    claims,
+                    timeout=settings.USER_CACHE_TIMEOUT,
+                )
+
+            local_users.set(
+                user_id, claims, timeout=settings.USER_CACHE_LOCAL_TIMEOUT
+            )
+
+        return claims
@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import Any, Iterable
+
+from django.core.cache import cache
+
+# Fields of the user carried by tokens and kept in the user cache
+TOKEN_USER_CLAIMS = (
+    "email",
+    "first_name",
+    "last_name",
+    "is_staff",
+    "is_active",
+)
+
+
+class LocalTTLCache:
+    """Thread-safe process-local cache with expiring entries"""
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+
+            return entry[1]
+
+    def set(self, key: Any, value: Any, timeout: float) -> None:
+        with self.lock:
+            if len(self.entries) >= self.max_size:
+                self.entries.clear()
+
+            self.entries[key] = (time.monotonic() + timeout, value)
+
+    def delete(self, key: Any) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+local_users = LocalTTLCache()
+
+
+def user_cache_key(user_id: Any) -> str:
+    return f"users:auth:{user_id}"
+
+
+def invalidate_users(user_ids: Iterable[Any]) -> None:
+    """
+    Drops the users from the shared cache and this process, other
+    processes keep their copy for at most USER_CACHE_LOCAL_TIMEOUT
+    """
+    keys = []
+
+    for user_id in user_ids:
+        local_users.delete(str(user_id))
+        keys.append(user_cache_key(user_id))
+
+    cache.delete_many(keys)
+
+
+def invalidate_user(user_id: Any) -> None:
+    invalidate_users([user_id])
@@ -2,11 +2,32 @@ from django.contrib.auth.models import (
     AbstractUser,
     BaseUserManager,
 )
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext as _
 
+from users.cache import TOKEN_USER_CLAIMS, invalidate_users
 
-class UserManager(BaseUserManager):
+
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs) -> int:
+        """
+        Drops the updated users from the authentication cache, which
+        the save signals can't do for a bulk update. Updates of fields
+        that are not cached skip the lookup of the users.
+        """
+        if not set(kwargs) & set(TOKEN_USER_CLAIMS):
+            return super().update(**kwargs)
+
+        user_ids = list(self.values_list("pk", flat=True))
+        updated = super().update(**kwargs)
+        invalidate_users(user_ids)
+        transaction.on_commit(lambda: invalidate_users(user_ids))
+
+        return updated
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """Define a model manager for User model with no username field."""
 
     use_in_migrations = True
@@ -1,5 +1,14 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, Token
+
+from users.authentication import user_claims
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -31,3 +40,47 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class LibraryTokenObtainPairSerializer(TokenObtainPairSerializer):
+
+    @classmethod
+    def get_token(cls, user) -> Token:
+        """Adds the user claims used by the stateless authentication"""
+        token = super().get_token(user)
+        token.payload.update(user_claims(user))
+
+        return token
+
+
+class LibraryTokenRefreshSerializer(TokenRefreshSerializer):
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Re-reads the user, so the new access token carries its current
+        claims and inactive or deleted users can't refresh at all
+        """
+        data = super().validate(attrs)
+        refresh = self.token_class(attrs["refresh"])
+        user = (
+            get_user_model()
+            .objects.filter(
+                **{
+                    api_settings.USER_ID_FIELD: (
+                        refresh[api_settings.USER_ID_CLAIM]
+                    )
+                }
+            )
+            .first()
+        )
+
+        if user is None or not user.is_active:
+            raise AuthenticationFailed(
+                "User is inactive", code="user_inactive"
+            )
+
+        access = AccessToken(data["access"])
+        access.payload.update(user_claims(user))
+        data["access"] = str(access)
+
+        return data
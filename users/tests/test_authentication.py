@@ -0,0 +1,223 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from users.cache import local_users, user_cache_key
+
+BOOK_LIST_URL = reverse("books:book-list")
+BORROWING_LIST_URL = reverse("borrowings:borrowing-list")
+ME_URL = reverse("users:manage")
+TOKEN_URL = reverse("users:token_obtain_pair")
+TOKEN_REFRESH_URL = reverse("users:token_refresh")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        local_users.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@standard.com",
+            "PassWoorD1",
+            first_name="Gregory",
+            last_name="Roberts",
+        )
+        response = self.client.post(
+            TOKEN_URL, {"email": "test@standard.com", "password": "PassWoorD1"}
+        )
+        self.access = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def user_queried(self, url: str) -> bool:
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+
+        return any(
+            'FROM "users_user"' in query["sql"]
+            for query in context.captured_queries
+        )
+
+    def test_token_carries_user_claims(self):
+        token = AccessToken(self.access)
+
+        self.assertEqual(token["email"], "test@standard.com")
+        self.assertEqual(token["first_name"], "Gregory")
+        self.assertFalse(token["is_staff"])
+
+    def test_catalog_browsing_without_auth_queries(self):
+        self.client.get(BOOK_LIST_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(BOOK_LIST_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_served_from_shared_cache(self):
+        self.client.get(BOOK_LIST_URL)
+        local_users.clear()
+
+        self.assertFalse(self.user_queried(BOOK_LIST_URL))
+
+    def test_deactivation_applies_immediately(self):
+        self.client.get(BOOK_LIST_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(BOOK_LIST_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_deactivation_applies_immediately(self):
+        self.client.get(BOOK_LIST_URL)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False
+        )
+        response = self.client.get(BOOK_LIST_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_update_of_uncached_fields_skips_user_lookup(self):
+        with self.assertNumQueries(1):
+            get_user_model().objects.filter(pk=self.user.pk).update(
+                last_login=timezone.now()
+            )
+
+    def test_cache_holds_no_password_hash(self):
+        self.client.get(BOOK_LIST_URL)
+
+        cached = cache.get(user_cache_key(self.user.pk))
+
+        self.assertEqual(cached["email"], "test@standard.com")
+        self.assertNotIn("password", cached)
+
+    def test_user_changes_invalidate_cache(self):
+        self.client.get(ME_URL)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(BORROWING_LIST_URL, {"user_id": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.wsgi_request.user.is_staff)
+
+    def test_password_change_invalidates_cache(self):
+        self.client.get(BOOK_LIST_URL)
+
+        self.client.patch(ME_URL, {"password": "NewPassWoorD1"})
+
+        self.assertTrue(self.user_queried(BOOK_LIST_URL))
+
+    def test_me_reads_current_user_from_database(self):
+        self.client.get(ME_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            first_name="Lin"
+        )
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.data["first_name"], "Lin")
+
+
+@override_settings(JWT_STATELESS_AUTH=True)
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "test@admin.com", "PassWoorD1", is_staff=True, first_name="Lin"
+        )
+        response = self.client.post(
+            TOKEN_URL, {"email": "test@admin.com", "password": "PassWoorD1"}
+        )
+        self.refresh = response.data["refresh"]
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access']}"
+        )
+
+    def refresh_access(self) -> Response:
+        response = self.client.post(
+            TOKEN_REFRESH_URL, {"refresh": self.refresh}
+        )
+
+        if response.status_code == status.HTTP_200_OK:
+            self.client.credentials(
+                HTTP_AUTHORIZATION=f"Bearer {response.data['access']}"
+            )
+
+        return response
+
+    def test_claims_used_without_user_query(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(BORROWING_LIST_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any(
+                'FROM "users_user"' in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+        self.assertTrue(response.wsgi_request.user.is_staff)
+        self.assertEqual(response.wsgi_request.user.full_name, "Lin ")
+
+    def test_stateless_user_can_borrow(self):
+        book = Book.objects.create(
+            title="Shantaram",
+            author="Gregory David Roberts",
+            cover=Book.CoverChoices.SOFT,
+            inventory=1,
+            daily_fee="0.12",
+        )
+
+        response = self.client.post(
+            BORROWING_LIST_URL,
+            {
+                "book": book.id,
+                "expected_return_date": (
+                    datetime.date.today() + datetime.timedelta(days=5)
+                ),
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            self.admin.borrowings.get().id, response.data["id"]
+        )
+
+    def test_inactive_claim_is_rejected(self):
+        token = AccessToken.for_user(self.admin)
+        token["is_active"] = False
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get(BORROWING_LIST_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_carries_current_claims(self):
+        self.admin.is_staff = False
+        self.admin.save()
+
+        self.assertEqual(self.refresh_access().status_code, status.HTTP_200_OK)
+        response = self.client.get(BORROWING_LIST_URL)
+
+        self.assertFalse(response.wsgi_request.user.is_staff)
+
+    def test_inactive_user_cannot_refresh(self):
+        self.admin.is_active = False
+        self.admin.save()
+
+        response = self.refresh_access()
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,8 +1,11 @@
+from django.contrib.auth import get_user_model
 from drf_spectacular.utils import extend_schema_view, extend_schema
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.views import TokenObtainPairView
 
+from library_app.throttling import ScopedGCRAThrottle
+from users.authentication import CachedJWTAuthentication
 from users.serializers import UserSerializer
 
 
@@ -31,8 +34,22 @@ class CreateUserView(generics.CreateAPIView):
 )
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        """
+        Reads the user from the database, the authenticated one may come
+        from the cache or the token claims and must not be saved back
+        """
+        return get_user_model().objects.get(pk=self.request.user.pk)
+
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """Tighter `token` limit against password guessing"""
+
+    throttle_classes = (
+        *TokenObtainPairView.throttle_classes,
+        ScopedGCRAThrottle,
+    )
+    throttle_scope = "token"